@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark dashboard chart refreshes
+
+    python benchmarks/chart_refresh.py [--refreshes N] [--tk]
+
+Renders the dashboard's two charts (six months of income vs expense bars
+and an expense-by-category pie) with random data N times, two ways:
+
+    rebuild  a new Figure and canvas every refresh (the old dashboard code)
+    live     GroupedBarChart / PieChart created once and updated in place
+
+and reports the render time per refresh, plus the number of live Python
+objects and the process RSS (where /proc is available) after every tenth
+of the run. Charts render offscreen with Agg by default; --tk draws
+them into a real (withdrawn) Tk window instead, which needs a display.
+
+Run it from the finance_tracker directory.
+"""
+
+import argparse
+import gc
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add the finance_tracker directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from utils.charts import GroupedBarChart, PieChart
+
+MONTHS = ['May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct']
+CATEGORIES = ['Food', 'Transportation', 'Entertainment', 'Shopping', 'Bills', 'Rent']
+COLORS = ['#ef4444', '#3b82f6', '#22c55e', '#f39c12', '#9b59b6', '#1abc9c']
+
+
+def random_data():
+    """One refresh worth of chart data"""
+    income = [random.uniform(2000, 6000) for _ in MONTHS]
+    expense = [random.uniform(1000, 5000) for _ in MONTHS]
+    # The number of categories with spending varies from month to month
+    categories = CATEGORIES[:random.choice((5, 6, 6, 6))]
+    amounts = [random.uniform(50, 1500) for _ in categories]
+    return income, expense, categories, amounts
+
+
+class RebuildCharts:
+    """The old approach: build both figures and canvases from scratch"""
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.canvases = []
+
+    def refresh(self, income, expense, categories, amounts):
+        for canvas in self.canvases:
+            if self.parent is not None:
+                canvas.get_tk_widget().destroy()
+        self.canvases = []
+
+        bar_figure = Figure(figsize=(6, 4), dpi=100)
+        ax = bar_figure.add_subplot(111)
+        x = range(len(MONTHS))
+        ax.bar([i - 0.175 for i in x], income, 0.35, label='Income', color=COLORS[2])
+        ax.bar([i + 0.175 for i in x], expense, 0.35, label='Expense', color=COLORS[0])
+        ax.set_xticks(x)
+        ax.set_xticklabels(MONTHS)
+        ax.legend(loc='upper right')
+        bar_figure.tight_layout()
+
+        pie_figure = Figure(figsize=(6, 4), dpi=100)
+        ax = pie_figure.add_subplot(111)
+        ax.pie(amounts, labels=categories, autopct='%1.1f%%', colors=COLORS[:len(categories)],
+               startangle=90)
+        ax.axis('equal')
+        pie_figure.tight_layout()
+
+        for figure in (bar_figure, pie_figure):
+            if self.parent is not None:
+                from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+                canvas = FigureCanvasTkAgg(figure, self.parent)
+                canvas.get_tk_widget().pack()
+            else:
+                canvas = FigureCanvasAgg(figure)
+            canvas.draw()
+            self.canvases.append(canvas)
+
+
+class LiveCharts:
+    """The new approach: persistent charts updated in place"""
+
+    def __init__(self, parent):
+        self.bars = GroupedBarChart(['Income', 'Expense'], [COLORS[2], COLORS[0]],
+                                    parent=parent, figsize=(6, 4), dpi=100)
+        self.pie = PieChart(COLORS, startangle=90, parent=parent, figsize=(6, 4), dpi=100)
+        if parent is not None:
+            self.bars.widget.pack()
+            self.pie.widget.pack()
+
+    def refresh(self, income, expense, categories, amounts):
+        self.bars.update(MONTHS, [income, expense])
+        if not self.bars.ax.get_legend():
+            self.bars.ax.legend(loc='upper right')
+        self.pie.update(categories, amounts)
+
+
+def resident_memory():
+    """Resident set size in bytes, or None without /proc (e.g. on Windows)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def run(charts, refreshes, root=None):
+    """Time every refresh, sampling memory after each tenth of the run
+
+    tracemalloc would slow matplotlib down several times over, so memory is
+    sampled as live objects (after a full collection) and RSS instead.
+    """
+    random.seed(42)
+    timings = []
+    samples = []
+    for i in range(1, refreshes + 1):
+        data = random_data()
+        start = time.perf_counter()
+        charts.refresh(*data)
+        if root is not None:
+            # Let Tk run the pending draw_idle and repaint
+            root.update()
+        timings.append(time.perf_counter() - start)
+        if i % max(refreshes // 10, 1) == 0:
+            gc.collect()
+            samples.append((i, len(gc.get_objects()), resident_memory()))
+    return timings, samples
+
+
+def report(name, timings, samples):
+    """Print latency percentiles and the memory samples for one approach"""
+    ordered = sorted(timings)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{name}: {len(timings)} refreshes")
+    print(f"  render   mean {statistics.mean(timings) * 1000:7.2f} ms   "
+          f"p50 {statistics.median(timings) * 1000:7.2f} ms   p95 {p95 * 1000:7.2f} ms")
+    print("  objects  " + "  ".join(f"{i}:{objects}" for i, objects, _ in samples))
+    if samples[0][2] is not None:
+        print("  RSS MB   " + "  ".join(f"{i}:{rss / 1024 / 1024:.1f}" for i, _, rss in samples))
+
+
+def main():
+    """Run both approaches and print their numbers"""
+    parser = argparse.ArgumentParser(description="Benchmark dashboard chart refreshes")
+    parser.add_argument('--refreshes', type=int, default=1000, help="refreshes per approach")
+    parser.add_argument('--tk', action='store_true', help="render into a Tk window (needs a display)")
+    args = parser.parse_args()
+
+    root = parent = None
+    if args.tk:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        parent = tk.Frame(root)
+        parent.pack()
+
+    try:
+        for name, charts in (('rebuild', RebuildCharts(parent)), ('live', LiveCharts(parent))):
+            timings, memory = run(charts, args.refreshes, root)
+            report(name, timings, memory)
+    finally:
+        if root is not None:
+            root.destroy()
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
@@ -0,0 +1,285 @@
+import os
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+
+# "%%" not followed by "s" (collapsing "%%s" would create a placeholder)
+_ESCAPED_PERCENT = re.compile(r"%%(?!s)")
+
+
+class MySQLBackend:
+    """MySQL server through mysql-connector-python"""
+
+    name = 'mysql'
+    display_name = 'MySQL'
+    supports_prepared = True
+    schema_script = None  # Extra schema run after setup.sql
+    max_params = 65535  # Placeholders allowed in one statement
+
+    # Client error codes for a dropped server connection:
+    # CR_SERVER_GONE_ERROR, CR_SERVER_LOST, CR_CONNECTION_ERROR, CR_CONN_HOST_ERROR,
+    # CR_SERVER_LOST_EXTENDED
+    LOST_CONNECTION_ERRORS = frozenset((2006, 2013, 2002, 2003, 2055))
+    # ER_UNSUPPORTED_PS: "This command is not supported in the prepared
+    # statement protocol yet"
+    PREPARE_REJECTED_ERRORS = frozenset((1295,))
+
+    def __init__(self, host: str, user: str, password: str, database: str):
+        # Imported lazily so SQLite-only installs do not need the connector
+        import mysql.connector
+        from mysql.connector import Error
+
+        self._connector = mysql.connector
+        self.Error = Error
+        # Connector 9.2 dropped execute(multi=True) in favour of nextset()
+        self._nextset_api = tuple(mysql.connector.__version_info__[:2]) >= (9, 2)
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+
+    def connect(self):
+        """Open a new MySQL connection"""
+        return self._connector.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            autocommit=True
+        )
+
+    def translate(self, query: str, params=None) -> Optional[str]:
+        """MySQL is the reference dialect; only ``%%`` escapes are collapsed
+
+        mysql.connector substitutes ``%s`` but passes ``%%`` through as-is,
+        so without this DATE_FORMAT(date, '%%Y-%%m') would format to the
+        literal text '%Y-%m'. The prepared statement path already unescapes.
+        """
+        if params is None or '%%' not in query:
+            return query
+        return _ESCAPED_PERCENT.sub('%', query)
+
+    def cursor(self, connection, buffered: bool = True):
+        """Create a cursor; unbuffered cursors stream rows from the server"""
+        return connection.cursor(buffered=buffered)
+
+    def begin(self, connection):
+        """Start an explicit transaction on an autocommit connection"""
+        connection.start_transaction()
+
+    def execute_multi(self, connection, statements: Sequence[Tuple[str, Optional[tuple]]]) -> List[list]:
+        """Send several SELECTs as one multi-statement query; one row list per statement"""
+        parts = []
+        values = []
+        for sql, params in statements:
+            if params is None and '%s' in sql:
+                # A literal "%s" would swallow another statement's parameter
+                return [self._fetch_all(connection, sql, params) for sql, params in statements]
+            parts.append(sql.strip().rstrip(';'))
+            values.extend(params or ())
+
+        cursor = connection.cursor()
+        try:
+            results = []
+            if self._nextset_api:
+                cursor.execute(';\n'.join(parts), tuple(values) or None)
+                while True:
+                    results.append(cursor.fetchall() if cursor.with_rows else [])
+                    if not cursor.nextset():
+                        break
+            else:
+                for result in cursor.execute(';\n'.join(parts), tuple(values) or None, multi=True):
+                    if result.with_rows:
+                        results.append(result.fetchall())
+            return results
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _fetch_all(connection, sql: str, params) -> list:
+        """Run one SELECT on its own and return its rows"""
+        cursor = connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def is_connected(self, connection) -> bool:
+        """Check that the server connection is still usable"""
+        return connection.is_connected()
+
+    def reset_session(self, connection):
+        """Reset session state with COM_RESET_CONNECTION"""
+        connection.reset_session()
+
+    def is_connection_lost(self, error: Exception) -> bool:
+        """Whether ``error`` means the server connection dropped"""
+        return getattr(error, 'errno', None) in self.LOST_CONNECTION_ERRORS
+
+    def is_prepare_rejected(self, error: Exception) -> bool:
+        """Whether ``error`` means the statement cannot use the prepared protocol"""
+        return getattr(error, 'errno', None) in self.PREPARE_REJECTED_ERRORS
+
+
+# --- SQLite dialect translation ---------------------------------------------
+
+_PYFORMAT_TOKEN = re.compile(r"%%|%s")
+_BACKTICK = re.compile(r"`(\w+)`")
+_TRANSACTION_TABLE = re.compile(r"(?<![\w.'\"])transaction(?![\w'\"])")
+_DATE_FORMAT = re.compile(r"DATE_FORMAT\(\s*([\w.]+)\s*,\s*('[^']*')\s*\)", re.IGNORECASE)
+_CAST_SIGNED = re.compile(r"\bAS\s+SIGNED\b", re.IGNORECASE)
+_COALESCE_SUM = re.compile(r"COALESCE\(\s*SUM\(([^()]*)\)\s*,\s*0\s*\)", re.IGNORECASE)
+_AUTO_INCREMENT_PK = re.compile(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.IGNORECASE)
+_ENUM_COLUMN = re.compile(r"\b(\w+)\s+ENUM\s*\(([^)]*)\)", re.IGNORECASE)
+_DECIMAL_TYPE = re.compile(r"\bDECIMAL\s*\(\s*\d+\s*,\s*\d+\s*\)", re.IGNORECASE)
+_VARCHAR_TYPE = re.compile(r"\bVARCHAR\s*\(\s*\d+\s*\)", re.IGNORECASE)
+_UNIQUE_KEY = re.compile(r"\bUNIQUE\s+KEY\s+\w+\s*\(", re.IGNORECASE)
+_INSERT_IGNORE = re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE)
+_CREATE_INDEX = re.compile(r"\bCREATE\s+(UNIQUE\s+)?INDEX\s+(?!IF\s+NOT\s+EXISTS)", re.IGNORECASE)
+_CREATE_TRIGGER = re.compile(
+    r"^\s*CREATE\s+TRIGGER\s+(.*?\bFOR\s+EACH\s+ROW)\s+(.*?)\s*$",
+    re.IGNORECASE | re.DOTALL)
+_ON_DUPLICATE_KEY = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE)
+_VALUES_FUNCTION = re.compile(r"\bVALUES\(\s*(\w+)\s*\)", re.IGNORECASE)
+_SKIPPED_STATEMENT = re.compile(r"^\s*(CREATE\s+DATABASE|USE|CREATE\s+FULLTEXT)\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def translate_to_sqlite(query: str, has_params: bool) -> Optional[str]:
+    """Rewrite a MySQL statement for SQLite; None means skip the statement"""
+    if _SKIPPED_STATEMENT.match(query):
+        return None
+
+    sql = query
+    if has_params:
+        # Placeholders and %% escapes only mean something when parameters are passed
+        sql = _PYFORMAT_TOKEN.sub(lambda m: '?' if m.group(0) == '%s' else '%', sql)
+
+    sql = _BACKTICK.sub(r'"\1"', sql)
+    sql = _TRANSACTION_TABLE.sub('"transaction"', sql)
+    sql = _DATE_FORMAT.sub(r"strftime(\2, \1)", sql)
+    # TOTAL() is SUM() that returns 0.0 for empty input, like DECIMAL SUMs in MySQL
+    sql = _COALESCE_SUM.sub(r"TOTAL(\1)", sql)
+    sql = _CAST_SIGNED.sub('AS INTEGER', sql)
+    sql = _INSERT_IGNORE.sub('INSERT OR IGNORE', sql)
+    if _ON_DUPLICATE_KEY.search(sql):
+        # Upsert: SQLite 3.35+ accepts DO UPDATE without naming the conflict target
+        sql = _ON_DUPLICATE_KEY.sub('ON CONFLICT DO UPDATE SET', sql)
+        sql = _VALUES_FUNCTION.sub(r"excluded.\1", sql)
+
+    # Schema statements
+    sql = _AUTO_INCREMENT_PK.sub('INTEGER PRIMARY KEY AUTOINCREMENT', sql)
+    sql = _ENUM_COLUMN.sub(r"\1 TEXT CHECK (\1 IN (\2))", sql)
+    sql = _DECIMAL_TYPE.sub('REAL', sql)
+    # MySQL's default collation compares strings case-insensitively
+    sql = _VARCHAR_TYPE.sub(lambda m: m.group(0) + ' COLLATE NOCASE', sql)
+    sql = _UNIQUE_KEY.sub('UNIQUE (', sql)
+    sql = _CREATE_INDEX.sub(lambda m: f"CREATE {m.group(1) or ''}INDEX IF NOT EXISTS ", sql)
+    # MySQL trigger bodies here are a single statement; SQLite wants BEGIN ... END
+    sql = _CREATE_TRIGGER.sub(r"CREATE TRIGGER \1\nBEGIN\n    \2;\nEND", sql)
+    return sql
+
+
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter('TIMESTAMP', lambda value: datetime.fromisoformat(value.decode()))
+
+
+class SQLiteBackend:
+    """Embedded SQLite database file, tuned for a single local user
+
+    Statements written for MySQL are translated on the fly (see
+    ``translate_to_sqlite``).  Money columns are stored as REAL; queries read
+    them through ``cents_sql`` (utils/money.py), which returns the same
+    integer cents from both backends.
+    """
+
+    name = 'sqlite'
+    display_name = 'SQLite'
+    supports_prepared = False
+    schema_script = 'setup_sqlite.sql'
+    Error = sqlite3.Error
+    # SQLITE_MAX_VARIABLE_NUMBER was raised from 999 in SQLite 3.32
+    max_params = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA foreign_keys = ON",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -65536",      # 64 MB page cache
+        "PRAGMA mmap_size = 268435456",    # 256 MB memory-mapped I/O
+        "PRAGMA busy_timeout = 5000",
+    )
+
+    def __init__(self, path: str):
+        if path == ':memory:':
+            # A named shared-cache database so every pooled connection sees the same data
+            self.path = f"file:finance_tracker_{id(self)}?mode=memory&cache=shared"
+            self.is_new = True
+        else:
+            self.path = path
+            self.is_new = not os.path.exists(path)
+
+    def connect(self):
+        """Open a new SQLite connection in autocommit mode"""
+        connection = sqlite3.connect(
+            self.path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None,
+            check_same_thread=False,
+            uri=self.path.startswith('file:')
+        )
+        for pragma in self.PRAGMAS:
+            connection.execute(pragma)
+        return connection
+
+    def translate(self, query: str, params=None) -> Optional[str]:
+        """Rewrite MySQL-dialect SQL for SQLite"""
+        return translate_to_sqlite(query, params is not None)
+
+    def cursor(self, connection, buffered: bool = True):
+        """SQLite cursors always step through rows lazily"""
+        return connection.cursor()
+
+    def begin(self, connection):
+        """Start an explicit transaction (connections run in autocommit mode)"""
+        connection.execute("BEGIN")
+
+    def execute_multi(self, connection, statements: Sequence[Tuple[str, Optional[tuple]]]) -> List[list]:
+        """Run each SELECT in turn; there is no network round trip to save"""
+        cursor = connection.cursor()
+        try:
+            results = []
+            for sql, params in statements:
+                if params is None:
+                    cursor.execute(sql)
+                else:
+                    cursor.execute(sql, params)
+                results.append(cursor.fetchall())
+            return results
+        finally:
+            cursor.close()
+
+    def is_connected(self, connection) -> bool:
+        """Local connections do not drop"""
+        return True
+
+    def reset_session(self, connection):
+        """Nothing to reset for an embedded database"""
+        pass
+
+    def is_connection_lost(self, error: Exception) -> bool:
+        """Local connections do not drop"""
+        return False
+
+    def is_prepare_rejected(self, error: Exception) -> bool:
+        """No server-side prepared statements to reject"""
+        return False
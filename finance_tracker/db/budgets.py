@@ -0,0 +1,80 @@
+from datetime import date
+from typing import List, Optional
+
+from db.connection import db
+from utils.money import Money, cents_sql
+
+# Per-category limits live in category_budget, keyed by the first day of the
+# month like monthly_summary, so a month's status is one join on both
+# primary keys: O(categories) lookups however long the history is.
+
+_STATUS_QUERY = f"""
+    SELECT c.category_id, c.category_name,
+           {cents_sql('b.limit_amount')} as limit_amount,
+           {cents_sql('COALESCE(s.total, 0)')} as spent
+    FROM category c
+    LEFT JOIN category_budget b
+        ON b.user_id = %s AND b.month = %s AND b.category_id = c.category_id
+    LEFT JOIN monthly_summary s
+        ON s.user_id = %s AND s.month = %s AND s.type = 'Expense' AND s.category_id = c.category_id
+    WHERE b.category_id IS NOT NULL OR s.category_id IS NOT NULL
+    ORDER BY c.category_name
+"""
+
+_SET_BUDGET = """
+    INSERT INTO category_budget (user_id, category_id, month, limit_amount)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE limit_amount = VALUES(limit_amount)
+"""
+
+_CLEAR_BUDGET = "DELETE FROM category_budget WHERE user_id = %s AND category_id = %s AND month = %s"
+
+
+class CategoryBudget:
+    """Spending against the limit (if any) for one category in one month"""
+
+    __slots__ = ('category_id', 'category_name', 'limit', 'spent')
+
+    def __init__(self, category_id: int, category_name: str, limit: Optional[Money], spent: Money):
+        self.category_id = category_id
+        self.category_name = category_name
+        self.limit = limit
+        self.spent = spent
+
+    @property
+    def remaining(self) -> Optional[Money]:
+        return self.limit - self.spent if self.limit is not None else None
+
+    @property
+    def over_budget(self) -> bool:
+        return self.limit is not None and self.spent > self.limit
+
+    @property
+    def usage(self) -> Optional[float]:
+        """Spent as a percentage of the limit; None without a (non-zero) limit"""
+        if not self.limit:
+            return None
+        return self.spent / self.limit * 100
+
+
+def budget_status(user_id: int, month: date) -> Optional[List[CategoryBudget]]:
+    """Every category with a limit or spending in ``month`` (its first day)
+
+    Returns None if the query failed.
+    """
+    result = db.execute_query(_STATUS_QUERY, (user_id, month, user_id, month))
+    if result is None:
+        return None
+    return [CategoryBudget(category_id, name,
+                           Money(limit) if limit is not None else None, Money(spent))
+            for category_id, name, limit, spent in result]
+
+
+def set_category_budget(user_id: int, category_id: int, month: date, limit: Money) -> bool:
+    """Create or replace the limit for one category in ``month``"""
+    return db.execute_query(_SET_BUDGET, (user_id, category_id, month, limit.to_decimal())) is not None
+
+
+def clear_category_budget(user_id: int, category_id: int, month: date) -> bool:
+    """Remove the limit for one category in ``month``"""
+    return db.execute_query(_CLEAR_BUDGET, (user_id, category_id, month)) is not None
@@ -0,0 +1,68 @@
+import re
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+_IDENTIFIER = re.compile(r"^\w+$")
+
+
+@lru_cache(maxsize=64)
+def build_insert(table: str, columns: Tuple[str, ...], row_count: int) -> str:
+    """Multi-row ``INSERT ... VALUES (...),(...)`` statement for ``row_count`` rows"""
+    for name in (table,) + columns:
+        if not _IDENTIFIER.match(name):
+            raise ValueError(f"Invalid identifier for bulk insert: {name!r}")
+
+    row = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+            + ", ".join([row] * row_count))
+
+
+def chunked(rows: Iterable[Sequence], size: int) -> Iterator[List[Sequence]]:
+    """Split ``rows`` into lists of at most ``size`` rows without materializing it"""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ChunkError:
+    """A chunk of a bulk insert that was rolled back"""
+
+    def __init__(self, index: int, offset: int, size: int, message: str):
+        self.index = index      # Chunk number, from 0
+        self.offset = offset    # Position of the chunk's first row in the input
+        self.size = size
+        self.message = message
+
+    def __repr__(self):
+        return (f"ChunkError(index={self.index}, rows={self.offset}-"
+                f"{self.offset + self.size - 1}, message={self.message!r})")
+
+
+class BulkInsertResult:
+    """Outcome of a bulk insert: rows written and the chunks that failed"""
+
+    def __init__(self):
+        self.inserted = 0
+        self.chunks = 0
+        self.errors: List[ChunkError] = []
+        self.elapsed = 0.0
+
+    @property
+    def failed(self) -> int:
+        """Number of rows in rolled-back chunks"""
+        return sum(error.size for error in self.errors)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def __bool__(self):
+        return self.ok
+
+    def __repr__(self):
+        return (f"BulkInsertResult(inserted={self.inserted}, failed={self.failed}, "
+                f"chunks={self.chunks}, elapsed={self.elapsed:.2f}s)")
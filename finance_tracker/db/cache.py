@@ -0,0 +1,204 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Optional, Set
+
+# Table references in reads and writes
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN|INTO|UPDATE)\s+`?(\w+)`?", re.IGNORECASE)
+_WRITE = re.compile(r"^\s*(INSERT|REPLACE|UPDATE|DELETE)\b", re.IGNORECASE)
+_USER_PREDICATE = re.compile(r"(?<![\w.])(?:\w+\.)?user_id\s*=\s*%s", re.IGNORECASE)
+_INSERT_COLUMNS = re.compile(r"\bINTO\s+`?\w+`?\s*\(([^)]*)\)\s*VALUES\s*(.*)$",
+                             re.IGNORECASE | re.DOTALL)
+_VALUES_ROW = re.compile(r"\(([^()]*)\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _placeholders_before(query: str, position: int) -> int:
+    """Number of %s placeholders in ``query`` before ``position``"""
+    return query[:position].replace('%%', '').count('%s')
+
+
+def referenced_tables(query: str) -> FrozenSet[str]:
+    """Tables a statement reads from or writes to"""
+    return frozenset(name.lower() for name in _TABLE_REF.findall(query))
+
+
+def user_ids(query: str, params) -> Optional[Set[str]]:
+    """user_id values bound by a statement's parameters; None if not determinable"""
+    if not params or isinstance(params, dict):
+        return None
+
+    match = _INSERT_COLUMNS.search(query)
+    if match:
+        columns = [column.strip(' `').lower() for column in match.group(1).split(',')]
+        if 'user_id' not in columns:
+            return None
+        column = columns.index('user_id')
+        users = set()
+        offset = _placeholders_before(query, match.start(2))
+        for row in _VALUES_ROW.findall(match.group(2)):
+            values = [value.strip() for value in row.split(',')]
+            if len(values) != len(columns) or values[column] != '%s':
+                return None
+            index = offset + values[:column].count('%s')
+            if index >= len(params):
+                return None
+            users.add(str(params[index]))
+            offset += values.count('%s')
+        return users or None
+
+    match = _USER_PREDICATE.search(query)
+    if match is None:
+        return None
+    index = _placeholders_before(query, match.end()) - 1
+    if index >= len(params):
+        return None
+    return {str(params[index])}
+
+
+class _CacheEntry:
+    """A cached result set and the tables/user it depends on"""
+
+    __slots__ = ('result', 'tables', 'user', 'expires')
+
+    def __init__(self, result, tables: FrozenSet[str], user: Optional[str], expires: float):
+        self.result = result
+        self.tables = tables
+        self.user = user
+        self.expires = expires
+
+
+class ResultCache:
+    """LRU cache of SELECT results with a TTL, invalidated by writes
+
+    Entries are keyed by the whitespace-normalized SQL and its parameters,
+    and tagged with the tables they read and the ``user_id`` they filter on.
+    A write to a table drops the entries for that table and user (or every
+    user when the written rows' owner cannot be determined).  Writes to a
+    table in ``cascades`` also drop entries of the dependent tables, mirroring
+    the ON DELETE CASCADE foreign keys and the rollup triggers in setup.sql.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 30.0,
+                 cascades: Optional[Dict[str, Iterable[str]]] = None):
+        self.enabled = True
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cascades = cascades if cascades is not None else {
+            'user': ('transaction', 'budget', 'monthly_summary', 'category_budget'),
+            'transaction': ('monthly_summary',),
+            'category': ('category_budget',),
+        }
+
+        self._entries: "OrderedDict[tuple, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so reads that raced a write are not stored
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(query: str, params) -> tuple:
+        normalized = _WHITESPACE.sub(' ', query).strip()
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        elif params is not None:
+            params = tuple(params)
+        return normalized, params
+
+    def get(self, query: str, params):
+        """Cached rows for ``query``/``params``, or None on a miss"""
+        key = self._key(query, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Callers may sort or append to the list they get back
+        return list(entry.result)
+
+    def put(self, query: str, params, result, generation: int):
+        """Store rows read while the cache was at ``generation``"""
+        if not isinstance(result, list):
+            return
+        users = user_ids(query, params)
+        user = next(iter(users)) if users and len(users) == 1 else None
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float('inf')
+        entry = _CacheEntry(list(result), referenced_tables(query), user, expires)
+
+        key = self._key(query, params)
+        with self._lock:
+            if generation != self.generation:
+                # A write landed while this result was being read
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_write(self, query: str, params_list: Iterable = (None,)):
+        """Drop entries made stale by a write statement run with each of ``params_list``"""
+        if not _WRITE.match(query):
+            # DDL or anything else we cannot reason about
+            self.clear()
+            return
+
+        tables = referenced_tables(query)
+        users: Optional[Set[str]] = set()
+        for params in params_list:
+            written = user_ids(query, params)
+            if written is None:
+                users = None
+                break
+            users |= written
+        self.invalidate(tables, users)
+
+    def invalidate(self, tables: Optional[Iterable[str]] = None,
+                   users: Optional[Iterable] = None):
+        """Drop entries reading any of ``tables`` (all tables if None) for ``users``
+
+        ``users=None`` means the affected rows may belong to anyone.
+        """
+        if tables is not None:
+            tables = {table.lower() for table in tables}
+            for table in list(tables):
+                tables.update(self.cascades.get(table, ()))
+        if users is not None:
+            users = {str(user) for user in users}
+
+        with self._lock:
+            self.generation += 1
+            stale = [key for key, entry in self._entries.items()
+                     if (tables is None or entry.tables & tables)
+                     and (users is None or entry.user is None or entry.user in users)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for hits, misses, LRU evictions and write invalidations"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+            }
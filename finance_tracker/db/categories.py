@@ -0,0 +1,87 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from db.connection import db
+
+_LOAD_CATEGORIES = "SELECT category_id, category_name FROM category"
+_ADD_CATEGORY = "INSERT IGNORE INTO category (category_name) VALUES (%s)"
+
+
+class CategoryRegistry:
+    """Process-wide name <-> id map of the category table
+
+    The table is read once, on first use.  ``add()`` reloads it after
+    inserting, and a lookup of an unknown name reloads it once in case
+    another process added the category.  Names match case-insensitively,
+    like MySQL's default collation.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Optional[Dict[str, int]] = None
+        self._names: Dict[int, str] = {}
+
+        self.loads = 0
+
+    def _load(self) -> bool:
+        """(Re)read the category table; False if the query failed"""
+        result = db.execute_query(_LOAD_CATEGORIES, cache=False)
+        if result is None:
+            return False
+        names = {category_id: name for category_id, name in result}
+        ids = {name.casefold(): category_id for category_id, name in result}
+        with self._lock:
+            self._ids, self._names = ids, names
+            self.loads += 1
+        return True
+
+    def _maps(self, reload: bool = False) -> Optional[Tuple[Dict[str, int], Dict[int, str]]]:
+        """The current (ids by name, names by id) maps, loading them if needed"""
+        with self._lock:
+            ids, names = self._ids, self._names
+        if ids is None or reload:
+            if not self._load():
+                return None
+            with self._lock:
+                ids, names = self._ids, self._names
+        return ids, names
+
+    def names(self) -> List[str]:
+        """Every category name, alphabetically"""
+        maps = self._maps()
+        return sorted(maps[1].values(), key=str.casefold) if maps else []
+
+    def items(self) -> List[Tuple[int, str]]:
+        """``(category_id, category_name)`` pairs, alphabetically by name"""
+        maps = self._maps()
+        return sorted(maps[1].items(), key=lambda item: item[1].casefold()) if maps else []
+
+    def id_for(self, name: str) -> Optional[int]:
+        """The id of category ``name``, or None if there is no such category"""
+        maps = self._maps()
+        if maps and name.casefold() not in maps[0]:
+            maps = self._maps(reload=True)
+        return maps[0].get(name.casefold()) if maps else None
+
+    def name_for(self, category_id: int) -> Optional[str]:
+        """The name of category ``category_id``, or None if unknown"""
+        maps = self._maps()
+        if maps and category_id not in maps[1]:
+            maps = self._maps(reload=True)
+        return maps[1].get(category_id) if maps else None
+
+    def add(self, name: str) -> Optional[int]:
+        """Create category ``name`` if it is missing and return its id"""
+        if db.execute_query(_ADD_CATEGORY, (name,)) is None:
+            return None
+        maps = self._maps(reload=True)
+        return maps[0].get(name.casefold()) if maps else None
+
+    def invalidate(self):
+        """Forget the loaded categories; the next lookup reads the table again"""
+        with self._lock:
+            self._ids = None
+            self._names = {}
+
+
+category_registry = CategoryRegistry()
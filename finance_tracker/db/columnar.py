@@ -0,0 +1,115 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+
+# NumPy is imported on first use (see _numpy), so importing this module, and
+# the screens that use it, works without NumPy until arrays are asked for
+
+# Shorthand dtype names accepted by fetch_columns()/fetch_frame()
+DTYPE_ALIASES = {
+    'float': 'float64',
+    'int': 'int64',
+    'date': 'datetime64[D]',
+    'datetime': 'datetime64[us]',
+    'str': object,
+}
+
+# Money as whole cents in an int64 column
+CENTS = 'cents'
+
+
+def is_cents(dtype) -> bool:
+    """Whether a resolved column dtype is the ``'cents'`` marker"""
+    return isinstance(dtype, str) and dtype == CENTS
+
+
+def _numpy():
+    """The numpy module; ImportError if it is not installed"""
+    import numpy
+    return numpy
+
+
+def resolve_dtype(dtype):
+    """Normalize a dtype alias, NumPy dtype or ``'cents'``"""
+    if is_cents(dtype):
+        return CENTS
+    np = _numpy()
+    if isinstance(dtype, str) and dtype in DTYPE_ALIASES:
+        return np.dtype(DTYPE_ALIASES[dtype])
+    return np.dtype(dtype)
+
+
+def infer_dtype(values: Sequence):
+    """Pick a column dtype from the Python values the driver returned"""
+    np = _numpy()
+    sample = next((value for value in values if value is not None), None)
+    has_nulls = any(value is None for value in values)
+    if isinstance(sample, bool):
+        return np.dtype(object) if has_nulls else np.dtype(bool)
+    if isinstance(sample, int):
+        # Integers with NULLs widen to float so NULL can become NaN
+        return np.dtype('float64') if has_nulls else np.dtype('int64')
+    if isinstance(sample, (float, Decimal)):
+        return np.dtype('float64')
+    if isinstance(sample, datetime):
+        return np.dtype('datetime64[us]')
+    if isinstance(sample, date):
+        return np.dtype('datetime64[D]')
+    return np.dtype(object)
+
+
+def to_array(values: Sequence, dtype) -> "numpy.ndarray":
+    """Convert one batch of a column to an array of ``dtype``"""
+    np = _numpy()
+    if is_cents(dtype):
+        sample = next((value for value in values if value is not None), None)
+        if isinstance(sample, int):
+            # Already cents (selected through utils.money.cents_sql); no Decimals involved
+            return np.array(values, dtype='int64')
+        # Two-place amounts are exact in float64 well beyond any realistic total
+        return np.rint(np.array(values, dtype='float64') * 100).astype('int64')
+    if dtype == np.dtype(object):
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return array
+    if dtype.kind == 'M':
+        # datetime64 understands date/datetime objects and ISO strings; None -> NaT
+        return np.array(['NaT' if value is None else value for value in values], dtype=dtype)
+    return np.array(values, dtype=dtype)
+
+
+class ColumnBuilder:
+    """Accumulates fetched row batches as typed column arrays"""
+
+    def __init__(self, names: List[str], dtypes: Optional[Dict[str, object]] = None):
+        self.names = names
+        requested = dtypes or {}
+        unknown = set(requested) - set(names)
+        if unknown:
+            raise KeyError(f"dtypes given for columns not in the result: {sorted(unknown)}")
+        self.dtypes = [resolve_dtype(requested[name]) if name in requested else None
+                       for name in names]
+        self._chunks: List[list] = [[] for _ in names]
+
+    def add(self, batch: List[Sequence]):
+        """Transpose a batch of rows and append it column by column"""
+        if not batch:
+            return
+        for index, values in enumerate(zip(*batch)):
+            if self.dtypes[index] is None:
+                self.dtypes[index] = infer_dtype(values)
+            self._chunks[index].append(to_array(values, self.dtypes[index]))
+
+    def columns(self) -> Dict[str, "numpy.ndarray"]:
+        """The finished ``{name: array}`` mapping, in result column order"""
+        np = _numpy()
+        result = {}
+        for name, dtype, chunks in zip(self.names, self.dtypes, self._chunks):
+            if not chunks:
+                empty_dtype = np.dtype('int64') if is_cents(dtype) else (dtype or np.dtype(object))
+                result[name] = np.empty(0, dtype=empty_dtype)
+            elif len(chunks) == 1:
+                result[name] = chunks[0]
+            else:
+                result[name] = np.concatenate(chunks)
+        return result
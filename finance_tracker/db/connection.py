@@ -1,71 +1,703 @@
-import mysql.connector
-from mysql.connector import Error
 import os
-from typing import Optional
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from db.backends import MySQLBackend, SQLiteBackend
+from db.bulk import BulkInsertResult, ChunkError, build_insert, chunked
+from db.cache import ResultCache
+from db.pool import ConnectionPool, PoolTimeoutError
+from db.statements import PreparedStatementCache
+from db.stats import QueryStats
+
+_CREATE_INDEX = re.compile(r"CREATE\s+(?:UNIQUE\s+|FULLTEXT\s+)?INDEX\s+(\w+)\s+ON\s+`?(\w+)", re.IGNORECASE)
+
+class Transaction:
+    """Statements run on one connection inside ``DatabaseConnection.transaction()``"""
+
+    def __init__(self, database, connection, backend):
+        self.database = database
+        self.connection = connection
+        self.backend = backend
+        self.writes = []
+
+    def execute(self, query: str, params: tuple = None):
+        """Run one statement; returns rows for a SELECT, else the affected row count"""
+        sql = self.backend.translate(query, params)
+        if sql is None:
+            return 0
+
+        start = time.perf_counter()
+        rows = 0
+        failed = True
+        cursor = self.connection.cursor()
+        try:
+            if params is None:
+                cursor.execute(sql)
+            else:
+                cursor.execute(sql, params)
+            if query.strip().upper().startswith('SELECT'):
+                result = cursor.fetchall()
+                rows = len(result)
+            else:
+                self.writes.append((query, params))
+                result = rows = cursor.rowcount
+            failed = False
+            return result
+        finally:
+            cursor.close()
+            self.database.query_stats.record(query, time.perf_counter() - start, rows, failed)
+
 
 class DatabaseConnection:
     def __init__(self):
-        self.connection = None
+        self.pool = None
+        self.backend = None
+        self._pool_lock = threading.Lock()
+
+        # Database engine: "mysql" (server) or "sqlite" (embedded file, no server needed)
+        self.backend_name = os.environ.get('FINANCE_TRACKER_DB', 'mysql')
+
+        # MySQL settings
         self.host = "localhost"
         self.user = "root"
         self.password = "admin"  # Change this to your MySQL password
         self.database = "finance_tracker"
-    
+
+        # SQLite settings (":memory:" gives a throwaway database)
+        self.sqlite_path = os.environ.get(
+            'FINANCE_TRACKER_SQLITE_PATH',
+            os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'finance_tracker.db'))
+
+        self._executor = None
+
+        # Connection pool settings
+        self.pool_min_size = 1
+        self.pool_max_size = 5
+        self.pool_timeout = 10.0       # Seconds to wait for a free connection
+        self.pool_reset_session = False  # Reset session state on every release
+        self.pool_validate_after = 30.0  # Ping connections idle for longer than this
+
+        # Reads retried after the server connection dropped
+        self.lost_connection_retries = 0
+
+        # Worker threads for submit()/execute_query_async()
+        self.async_workers = 4
+
+        # Per-statement latency instrumentation (see stats())
+        self.query_stats = QueryStats(slow_query_threshold=0.2)
+
+        # Server-side prepared statements for repeated SQL
+        self.statements = PreparedStatementCache(max_per_connection=32, auto_prepare_after=3)
+
+        # SELECT results, invalidated by writes through execute_query/execute_many
+        self.result_cache = ResultCache(max_entries=256, ttl=30.0)
+
+    def configure_pool(self, min_size: int = None, max_size: int = None,
+                       timeout: float = None, reset_session: bool = None,
+                       validate_after: float = None):
+        """Change pool settings; takes effect the next time the pool is created"""
+        if min_size is not None:
+            self.pool_min_size = min_size
+        if max_size is not None:
+            self.pool_max_size = max_size
+        if timeout is not None:
+            self.pool_timeout = timeout
+        if reset_session is not None:
+            self.pool_reset_session = reset_session
+        if validate_after is not None:
+            self.pool_validate_after = validate_after
+        self.close_connection()
+
+    def use_backend(self, name: str, sqlite_path: str = None):
+        """Switch database engine ("mysql" or "sqlite"); reconnects on next use"""
+        self.close_connection()
+        self.backend_name = name
+        if sqlite_path is not None:
+            self.sqlite_path = sqlite_path
+        self.backend = None
+        self.result_cache.clear()
+
+    def get_backend(self):
+        """Get the configured database backend"""
+        if self.backend is None:
+            if self.backend_name == 'sqlite':
+                self.backend = SQLiteBackend(self.sqlite_path)
+            elif self.backend_name == 'mysql':
+                self.backend = MySQLBackend(self.host, self.user, self.password, self.database)
+            else:
+                raise ValueError(f"Unknown database backend: {self.backend_name}")
+        return self.backend
+
+    @property
+    def errors(self) -> tuple:
+        """Exception types that signal a failed database operation"""
+        return (self.get_backend().Error, PoolTimeoutError)
+
+    def get_pool(self) -> ConnectionPool:
+        """Get the connection pool, creating it on first use"""
+        with self._pool_lock:
+            if self.pool is None:
+                backend = self.get_backend()
+                self.pool = ConnectionPool(
+                    backend.connect,
+                    min_size=self.pool_min_size,
+                    max_size=self.pool_max_size,
+                    timeout=self.pool_timeout,
+                    validate=backend.is_connected,
+                    validate_after=self.pool_validate_after,
+                    reset_session=backend.reset_session if self.pool_reset_session else None,
+                    on_reset=self.statements.clear,
+                    on_close=self.statements.clear
+                )
+                print(f"Successfully connected to {backend.display_name} database")
+                initialize = backend.name == 'sqlite' and backend.is_new
+            else:
+                initialize = False
+
+        if initialize:
+            # Fresh embedded database: create the schema straight away
+            from db.migrations import migrate
+            migrate()
+            self.backend.is_new = False
+        return self.pool
+
     def get_connection(self):
-        """Get MySQL database connection"""
+        """Check whether the database is reachable; returns the pool or None"""
         try:
-            if self.connection is None or not self.connection.is_connected():
-                self.connection = mysql.connector.connect(
-                    host=self.host,
-                    user=self.user,
-                    password=self.password,
-                    database=self.database,
-                    autocommit=True
-                )
-                print("Successfully connected to MySQL database")
-            return self.connection
-        except Error as e:
-            print(f"Error connecting to MySQL: {e}")
+            pool = self.get_pool()
+            with pool.connection():
+                pass
+            return pool
+        except self.errors as e:
+            print(f"Error connecting to database: {e}")
             return None
-    
+
+    def initialize_schema(self, script_path: str = None) -> bool:
+        """Run db/setup.sql statement by statement, translated for the backend
+
+        Backends with a ``schema_script`` (extra objects only they support)
+        run it afterwards from the same directory.
+        """
+        if script_path is not None:
+            return self._run_script(script_path)
+
+        directory = os.path.dirname(os.path.abspath(__file__))
+        success = self._run_script(os.path.join(directory, 'setup.sql'))
+        extra = self.get_backend().schema_script
+        if extra:
+            success = self._run_script(os.path.join(directory, extra)) and success
+        return success
+
+    def _run_script(self, script_path: str) -> bool:
+        """Execute each ';'-separated statement of a SQL script"""
+        with open(script_path, 'r') as f:
+            sql_script = f.read()
+
+        # Drop line comments, then split script into individual statements
+        sql_script = re.sub(r'--[^\n]*', '', sql_script)
+        statements = [stmt.strip() for stmt in sql_script.split(';') if stmt.strip()]
+
+        success = True
+        for statement in statements:
+            # MySQL has no CREATE INDEX IF NOT EXISTS; skip indexes that are already there
+            index = _CREATE_INDEX.match(statement)
+            if index and self.index_exists(index.group(2), index.group(1)):
+                continue
+            if self.execute_query(statement) is None:
+                success = False
+        return success
+
+    def index_exists(self, table: str, index: str) -> bool:
+        """Whether ``table`` already has an index called ``index``"""
+        if self.get_backend().name == 'sqlite':
+            query = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s"
+        else:
+            query = ("SELECT 1 FROM information_schema.STATISTICS "
+                     "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1")
+        return bool(self.execute_query(query, (table, index), cache=False))
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Check out a pooled connection for the duration of a with-block
+
+        A connection that fails with a lost-connection error is dropped from
+        the pool instead of being handed to the next caller.
+        """
+        pool = self.get_pool()
+        connection = pool.acquire(timeout)
+        try:
+            yield connection
+        except Exception as e:
+            if self.get_backend().is_connection_lost(e):
+                pool.discard(connection)
+                # The server probably went away for every idle connection too
+                pool.expire_idle()
+                connection = None
+            raise
+        finally:
+            if connection is not None:
+                pool.release(connection)
+
+    @contextmanager
+    def transaction(self):
+        """Run several statements atomically on one pooled connection
+
+            with db.transaction() as tx:
+                tx.execute("DELETE FROM ... WHERE user_id = %s", (user_id,))
+                tx.execute("INSERT INTO ... SELECT ...", (user_id,))
+
+        Commits when the block finishes and rolls back if it raises. Unlike
+        execute_query, database errors propagate to the caller.
+        """
+        backend = self.get_backend()
+        with self.connection() as connection:
+            backend.begin(connection)
+            tx = Transaction(self, connection, backend)
+            try:
+                yield tx
+                connection.commit()
+            except BaseException:
+                self._rollback_quietly(connection)
+                raise
+            finally:
+                for query, params in tx.writes:
+                    self.result_cache.invalidate_write(query, (params,))
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        """Run ``func`` on a database worker thread and return its Future"""
+        with self._pool_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.async_workers,
+                                                    thread_name_prefix='db-worker')
+            executor = self._executor
+        return executor.submit(func, *args, **kwargs)
+
+    def execute_query_async(self, query: str, params: tuple = None) -> Future:
+        """execute_query on a worker thread; the Future resolves to its result"""
+        return self.submit(self.execute_query, query, params)
+
     def close_connection(self):
-        """Close database connection"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            print("MySQL connection closed")
-    
-    def execute_query(self, query: str, params: tuple = None):
-        """Execute a query and return results"""
+        """Close all pooled connections"""
+        with self._pool_lock:
+            pool, self.pool = self.pool, None
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False)
+        if pool:
+            pool.close_all()
+            print("Database connection closed")
+
+    def stats(self) -> dict:
+        """Snapshot of per-statement call counts, rows and latency percentiles"""
+        return self.query_stats.snapshot()
+
+    def connection_stats(self) -> dict:
+        """Pool size, liveness pings and reconnect counters"""
+        with self._pool_lock:
+            pool = self.pool
+        stats = pool.stats() if pool else {}
+        stats['lost_connection_retries'] = self.lost_connection_retries
+        return stats
+
+    def reset_stats(self):
+        """Clear the per-statement statistics"""
+        self.query_stats.reset()
+
+    def set_slow_query_threshold(self, seconds: Optional[float]):
+        """Log statements slower than ``seconds``; None turns the slow log off"""
+        self.query_stats.slow_query_threshold = seconds
+
+    def cache_stats(self) -> dict:
+        """Result cache hits, misses, evictions and invalidations"""
+        return self.result_cache.stats()
+
+    def invalidate_cache(self, tables: list = None, user_id=None):
+        """Drop cached results after writing to the database outside execute_query"""
+        self.result_cache.invalidate(tables, None if user_id is None else [user_id])
+
+    def register_prepared(self, query: str):
+        """Prepare ``query`` server-side from its first execution"""
+        self.statements.register(query)
+
+    def prepared_stats(self) -> dict:
+        """Prepared statement cache hits, misses and evictions"""
+        return self.statements.stats()
+
+    def _execute_prepared(self, connection, query: str, params):
+        """Run ``query`` through a cached prepared cursor; None if not preparable
+
+        A statement the server refuses to prepare is marked unpreparable
+        before the error is re-raised, so the caller can retry it as plain
+        text.  Any other error (a duplicate key, a lock wait timeout) is the
+        statement's own failure: the cursor stays cached and the error is
+        re-raised as it is.
+        """
+        entry = self.statements.cursor_for(connection, query)
+        if entry is None:
+            return None
+
+        cursor, sql = entry
         try:
-            connection = self.get_connection()
-            if connection:
-                cursor = connection.cursor()
-                cursor.execute(query, params)
-                
+            cursor.execute(sql, params)
+            if query.strip().upper().startswith('SELECT'):
+                return cursor.fetchall(), None
+            return True, cursor.rowcount
+        except self.backend.Error as e:
+            if self.backend.is_prepare_rejected(e):
+                self.statements.evict(connection, query)
+                self.statements.mark_unpreparable(query)
+            raise
+
+    def execute_query(self, query: str, params: tuple = None, cache: bool = True):
+        """Execute a query and return results
+
+        SELECT results are served from the result cache unless ``cache`` is
+        False; any other statement invalidates the cached results it affects.
+        """
+        if not query.strip().upper().startswith('SELECT'):
+            try:
+                return self._execute(query, params)
+            finally:
+                self.result_cache.invalidate_write(query, (params,))
+
+        if not (cache and self.result_cache.enabled):
+            return self._execute(query, params)
+
+        result = self.result_cache.get(query, params)
+        if result is not None:
+            return result
+        generation = self.result_cache.generation
+        result = self._execute(query, params)
+        self.result_cache.put(query, params, result, generation)
+        return result
+
+    def _execute(self, query: str, params: tuple = None):
+        """Run a single statement against the database"""
+        start = time.perf_counter()
+        rows = 0
+        failed = False
+        try:
+            backend = self.get_backend()
+            sql = backend.translate(query, params)
+            if sql is None:
+                # Statement has no equivalent on this backend (e.g. USE database)
+                return True
+
+            try:
+                result, rows = self._run_statement(backend, query, sql, params)
+            except backend.Error as e:
+                # Reads are safe to repeat on a fresh connection; writes are not
+                if not (backend.is_connection_lost(e)
+                        and query.strip().upper().startswith('SELECT')):
+                    raise
+                self.lost_connection_retries += 1
+                print(f"Lost database connection, retrying query: {e}")
+                result, rows = self._run_statement(backend, query, sql, params)
+            return result
+        except self.errors as e:
+            failed = True
+            print(f"Error executing query: {e}")
+            return None
+        finally:
+            self.query_stats.record(query, time.perf_counter() - start, rows, failed)
+
+    def _run_statement(self, backend, query: str, sql: str, params):
+        """Execute ``sql`` on a pooled connection; returns ``(result, row count)``"""
+        with self.connection() as connection:
+            if backend.supports_prepared and self.statements.should_prepare(query, params):
+                try:
+                    outcome = self._execute_prepared(connection, query, params)
+                except backend.Error as e:
+                    if not backend.is_prepare_rejected(e):
+                        raise
+                    # Now marked unpreparable; run it through the text protocol below
+                    outcome = None
+                if outcome is not None:
+                    result, rowcount = outcome
+                    return result, len(result) if rowcount is None else rowcount
+
+            cursor = connection.cursor()
+            try:
+                if params is None:
+                    cursor.execute(sql)
+                else:
+                    cursor.execute(sql, params)
+
                 # Check if it's a SELECT query
                 if query.strip().upper().startswith('SELECT'):
                     result = cursor.fetchall()
-                    cursor.close()
-                    return result
+                    return result, len(result)
+                return True, cursor.rowcount
+            finally:
+                cursor.close()
+
+    def execute_batch(self, statements: Sequence[Tuple[str, Optional[tuple]]],
+                      cache: bool = True) -> Optional[List[list]]:
+        """Run several SELECTs in one round trip and return their rows in order
+
+        ``statements`` is a sequence of ``(query, params)`` pairs. Results
+        already in the result cache are reused and repeated statements are
+        sent once; everything else goes to the server as a single
+        multi-statement query. Returns None if the batch fails.
+        """
+        for query, _ in statements:
+            if not query.strip().upper().startswith('SELECT'):
+                raise ValueError("execute_batch only accepts SELECT statements")
+
+        use_cache = cache and self.result_cache.enabled
+        results = [None] * len(statements)
+        pending = {}  # (query, params) -> indexes waiting for that result
+        for index, (query, params) in enumerate(statements):
+            if isinstance(params, list):
+                params = tuple(params)
+            if use_cache:
+                results[index] = self.result_cache.get(query, params)
+            if results[index] is None:
+                pending.setdefault((query, params), []).append(index)
+        if not pending:
+            return results
+
+        start = time.perf_counter()
+        rows = 0
+        failed = False
+        batch = list(pending)
+        label = '; '.join(query for query, _ in batch)
+        generation = self.result_cache.generation
+        try:
+            backend = self.get_backend()
+            translated = [(backend.translate(query, params), params) for query, params in batch]
+            try:
+                with self.connection() as connection:
+                    result_sets = backend.execute_multi(connection, translated)
+            except backend.Error as e:
+                if not backend.is_connection_lost(e):
+                    raise
+                self.lost_connection_retries += 1
+                print(f"Lost database connection, retrying batch: {e}")
+                with self.connection() as connection:
+                    result_sets = backend.execute_multi(connection, translated)
+
+            for (query, params), result in zip(batch, result_sets):
+                rows += len(result)
+                if use_cache:
+                    self.result_cache.put(query, params, result, generation)
+                for index in pending[(query, params)]:
+                    results[index] = list(result)
+            return results
+        except self.errors as e:
+            failed = True
+            print(f"Error executing batch query: {e}")
+            return None
+        finally:
+            self.query_stats.record(label, time.perf_counter() - start, rows, failed)
+
+    def iter_query(self, query: str, params: tuple = None, batch_size: int = 500):
+        """Yield result rows one at a time, fetching ``batch_size`` rows per round trip
+
+        Uses an unbuffered cursor so only one batch is held in memory. A
+        pooled connection stays checked out until the generator is exhausted
+        or closed; if the consumer stops early the connection is dropped
+        rather than draining the remaining rows from the server.
+
+        Unlike execute_query, database errors propagate to the consumer,
+        including one that cuts the stream off part way, so a failed load
+        is never mistaken for a short result.
+        """
+        batches = self._iter_batches(query, params, batch_size)
+        try:
+            for _, batch in batches:
+                for row in batch:
+                    yield row
+        finally:
+            batches.close()
+
+    def _iter_batches(self, query: str, params, batch_size: int):
+        """Yield ``(column names, rows)`` per fetchmany() batch; errors propagate
+
+        At least one (possibly empty) batch is yielded for a successful query
+        so callers always learn the column names.
+        """
+        start = time.perf_counter()
+        rows = 0
+        failed = False
+        pool = None
+        connection = None
+        cursor = None
+        try:
+            backend = self.get_backend()
+            pool = self.get_pool()
+            connection = pool.acquire()
+            cursor = backend.cursor(connection, buffered=False)
+            sql = backend.translate(query, params)
+            if params is None:
+                cursor.execute(sql)
+            else:
+                cursor.execute(sql, params)
+
+            names = [column[0] for column in cursor.description or ()]
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                rows += len(batch)
+                yield names, batch
+            if not rows:
+                yield names, []
+        except self.errors as e:
+            failed = True
+            if connection is not None and backend.is_connection_lost(e):
+                pool.discard(connection)
+                pool.expire_idle()
+                connection = None
+            raise
+        finally:
+            if connection is not None:
+                if getattr(connection, 'unread_result', False):
+                    # Stopped early: closing the socket is cheaper than reading the rest
+                    pool.discard(connection)
                 else:
-                    cursor.close()
-                    return True
-        except Error as e:
+                    if cursor is not None:
+                        try:
+                            cursor.close()
+                        except self.errors:
+                            pass
+                    pool.release(connection)
+            self.query_stats.record(query, time.perf_counter() - start, rows, failed)
+
+    def fetch_columns(self, query: str, params: tuple = None, dtypes: dict = None,
+                      batch_size: int = 5000):
+        """Run a SELECT and return ``{column name: NumPy array}``
+
+        Rows are streamed in ``batch_size`` batches and converted column-wise,
+        so no full list of row tuples is built. ``dtypes`` maps column names
+        to a NumPy dtype or one of 'float', 'int', 'date', 'datetime', 'str'
+        and 'cents' (money as int64 cents); other columns are inferred, e.g.
+        DECIMAL as float64 and DATE as datetime64[D]. Returns None on error.
+        """
+        # NumPy is only needed by callers that ask for arrays
+        from db.columnar import ColumnBuilder
+
+        builder = None
+        batches = self._iter_batches(query, params, batch_size)
+        try:
+            for names, batch in batches:
+                if builder is None:
+                    builder = ColumnBuilder(names, dtypes)
+                builder.add(batch)
+            return builder.columns()
+        except self.errors as e:
             print(f"Error executing query: {e}")
             return None
-    
+        finally:
+            batches.close()
+
+    def fetch_frame(self, query: str, params: tuple = None, dtypes: dict = None,
+                    batch_size: int = 5000):
+        """fetch_columns() as a pandas DataFrame; None on error"""
+        import pandas as pd
+
+        columns = self.fetch_columns(query, params, dtypes, batch_size)
+        if columns is None:
+            return None
+        return pd.DataFrame(columns, copy=False)
+
     def execute_many(self, query: str, params_list: list):
         """Execute a query with multiple parameter sets"""
+        start = time.perf_counter()
+        rows = 0
+        failed = False
         try:
-            connection = self.get_connection()
-            if connection:
+            backend = self.get_backend()
+            sql = backend.translate(query, ())
+            with self.connection() as connection:
                 cursor = connection.cursor()
-                cursor.executemany(query, params_list)
-                cursor.close()
-                return True
-        except Error as e:
+                try:
+                    # One explicit transaction: the batch is applied entirely or not at all
+                    backend.begin(connection)
+                    cursor.executemany(sql, params_list)
+                    connection.commit()
+                    rows = cursor.rowcount
+                    return True
+                except backend.Error:
+                    self._rollback_quietly(connection)
+                    raise
+                finally:
+                    cursor.close()
+        except self.errors as e:
+            failed = True
             print(f"Error executing batch query: {e}")
             return None
+        finally:
+            self.query_stats.record(query, time.perf_counter() - start, rows, failed)
+            self.result_cache.invalidate_write(query, params_list)
+
+    def bulk_insert(self, table: str, columns: Sequence[str], rows: Iterable[Sequence],
+                    chunk_size: int = 1000, stop_on_error: bool = False) -> BulkInsertResult:
+        """Insert many rows with multi-row INSERT statements
+
+        Rows are sent ``chunk_size`` at a time as one ``INSERT ... VALUES
+        (...),(...)`` statement, each chunk in its own transaction. A failing
+        chunk is rolled back and reported in ``result.errors`` while the
+        remaining chunks carry on (unless ``stop_on_error``). ``rows`` may be
+        a generator, so large imports are never held in memory.
+        """
+        result = BulkInsertResult()
+        start = time.perf_counter()
+        columns = tuple(columns)
+        label = build_insert(table, columns, 1)
+        user_column = columns.index('user_id') if 'user_id' in columns else None
+        users = set()
+        try:
+            backend = self.get_backend()
+            chunk_size = max(1, min(chunk_size, backend.max_params // len(columns)))
+            with self.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    for index, chunk in enumerate(chunked(rows, chunk_size)):
+                        offset = result.inserted + result.failed
+                        query = build_insert(table, columns, len(chunk))
+                        params = tuple(value for row in chunk for value in row)
+                        chunk_start = time.perf_counter()
+                        failed = False
+                        try:
+                            backend.begin(connection)
+                            cursor.execute(backend.translate(query, params), params)
+                            connection.commit()
+                            result.inserted += len(chunk)
+                        except backend.Error as e:
+                            failed = True
+                            self._rollback_quietly(connection)
+                            result.errors.append(ChunkError(index, offset, len(chunk), str(e)))
+
+                        result.chunks += 1
+                        if user_column is not None:
+                            users.update(row[user_column] for row in chunk)
+                        self.query_stats.record(label, time.perf_counter() - chunk_start,
+                                                0 if failed else len(chunk), failed)
+                        if failed and (stop_on_error or not backend.is_connected(connection)):
+                            break
+                finally:
+                    cursor.close()
+        except self.errors as e:
+            print(f"Error executing bulk insert: {e}")
+            result.errors.append(ChunkError(result.chunks, result.inserted + result.failed, 0, str(e)))
+        finally:
+            self.result_cache.invalidate([table], users if user_column is not None else None)
+
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    @staticmethod
+    def _rollback_quietly(connection):
+        """Roll back the open transaction, ignoring errors from dead connections"""
+        try:
+            connection.rollback()
+        except Exception:
+            pass
 
 # Global database instance
 db = DatabaseConnection()
@@ -0,0 +1,351 @@
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Sequence, Set, Union
+
+from db.connection import db
+
+# Schema changes are numbered migrations, applied in order and recorded in
+# schema_migrations so each one runs once per database.  Version 1 is
+# setup.sql itself; later changes are appended to MIGRATIONS and never
+# edited once released.
+#
+# A migration runs its steps (idempotent DDL), then an optional Backfill
+# that rewrites existing rows in short primary-key-ranged transactions,
+# then its finalize steps, e.g. an index on the backfilled column:
+#
+#     Migration(3, "transaction.month", steps=[
+#         AddColumn('transaction', 'month', 'DATE NULL'),
+#     ], backfill=Backfill('transaction', 'transaction_id', """
+#         UPDATE transaction SET month = DATE_FORMAT(date, '%%Y-%%m-01')
+#         WHERE transaction_id > %s AND transaction_id <= %s
+#     """), finalize=[
+#         AddIndex('transaction', 'idx_transaction_user_month', ('user_id', 'month')),
+#     ])
+#
+# Backfill progress is committed together with each chunk in
+# schema_migration_progress, so a crashed or interrupted run picks up after
+# the last finished chunk.
+
+_CREATE_MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+_CREATE_PROGRESS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migration_progress (
+        version INT PRIMARY KEY,
+        last_key BIGINT NOT NULL,
+        end_key BIGINT NOT NULL,
+        rows_done BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+_APPLIED = "SELECT version FROM schema_migrations"
+_RECORD = "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)"
+
+_GET_PROGRESS = "SELECT last_key, end_key, rows_done FROM schema_migration_progress WHERE version = %s"
+_SAVE_PROGRESS = """
+    INSERT INTO schema_migration_progress (version, last_key, end_key, rows_done)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE last_key = VALUES(last_key), rows_done = VALUES(rows_done),
+                            updated_at = CURRENT_TIMESTAMP
+"""
+_CLEAR_PROGRESS = "DELETE FROM schema_migration_progress WHERE version = %s"
+
+_COLUMN_EXISTS = {
+    'mysql': ("SELECT 1 FROM information_schema.COLUMNS "
+              "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s"),
+    'sqlite': "SELECT 1 FROM pragma_table_info(%s) WHERE name = %s",
+}
+
+# Only one process may migrate a MySQL database at a time
+_LOCK_NAME = 'finance_tracker_migrate'
+
+
+class AddColumn:
+    """Step: add a column unless the table already has it
+
+    MySQL 8 adds a nullable or defaulted column in place (ALGORITHM=INSTANT);
+    SQLite only rewrites the schema entry.  Fill it afterwards with a Backfill.
+    """
+
+    def __init__(self, table: str, column: str, definition: str):
+        self.table = table
+        self.column = column
+        self.definition = definition
+
+    def __call__(self) -> bool:
+        query = _COLUMN_EXISTS[db.get_backend().name]
+        exists = db.execute_query(query, (self.table, self.column), cache=False)
+        if exists is None:
+            return False
+        if exists:
+            return True
+        return db.execute_query(
+            f"ALTER TABLE {self.table} ADD COLUMN {self.column} {self.definition}") is not None
+
+    def __str__(self):
+        return f"add column {self.table}.{self.column}"
+
+
+class AddIndex:
+    """Step: create an index unless it already exists
+
+    On MySQL the build is requested with LOCK=NONE, so writes carry on while
+    it runs; the server refuses the statement rather than locking the table.
+    """
+
+    def __init__(self, table: str, name: str, columns: Sequence[str], unique: bool = False):
+        self.table = table
+        self.name = name
+        self.columns = tuple(columns)
+        self.unique = unique
+
+    def __call__(self) -> bool:
+        if db.index_exists(self.table, self.name):
+            return True
+        unique = "UNIQUE " if self.unique else ""
+        query = f"CREATE {unique}INDEX {self.name} ON {self.table}({', '.join(self.columns)})"
+        if db.get_backend().name == 'mysql':
+            query += " ALGORITHM=INPLACE LOCK=NONE"
+        return db.execute_query(query) is not None
+
+    def __str__(self):
+        return f"add index {self.name}"
+
+
+class Backfill:
+    """Rewrite existing rows of ``table`` a primary-key range at a time
+
+    ``statement`` filters on ``<key> > %s AND <key> <= %s`` and is run once
+    per chunk, in its own short transaction, up to the largest key present
+    when the backfill started; rows added after that are written by code
+    that already knows the new schema.  ``prepare`` statements run once,
+    before the first chunk and in the same transaction that records the
+    starting position, so a resumed backfill skips them.  ``key`` must be an
+    integer column leading an index (the primary key).
+    Chunks shrink when one takes longer than ``target_seconds`` and grow back
+    up to ``chunk_size`` when they are quick; ``pause`` seconds between chunks
+    leave room for the application's own writes.
+    """
+
+    def __init__(self, table: str, key: str, statement: str, chunk_size: int = 1000,
+                 pause: float = 0.05, target_seconds: float = 0.5, prepare: Sequence[str] = ()):
+        self.table = table
+        self.key = key
+        self.statement = statement
+        self.prepare = tuple(prepare)
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.target_seconds = target_seconds
+
+        self._key_range = f"SELECT MIN({key}), MAX({key}) FROM {table}"
+        # Upper key of the next chunk, read from the index alone
+        self._next_key = (f"SELECT MAX(chunk.{key}) FROM (SELECT {key} FROM {table} "
+                          f"WHERE {key} > %s AND {key} <= %s ORDER BY {key} LIMIT %s) chunk")
+
+    def run(self, version: int, on_progress: Callable[[int, int], None] = None) -> bool:
+        """Backfill from the saved position; ``on_progress(rows_done, last_key)`` after each chunk"""
+        state = db.execute_query(_GET_PROGRESS, (version,), cache=False)
+        if state is None:
+            return False
+        if state:
+            last_key, end_key, rows_done = state[0]
+        else:
+            try:
+                with db.transaction() as tx:
+                    for statement in self.prepare:
+                        tx.execute(statement)
+                    first, end_key = tx.execute(self._key_range)[0]
+                    if first is None:
+                        return True  # Empty table
+                    last_key, rows_done = first - 1, 0
+                    tx.execute(_SAVE_PROGRESS, (version, last_key, end_key, rows_done))
+            except db.errors as e:
+                print(f"Error starting backfill of {self.table}: {e}")
+                return False
+
+        size = self.chunk_size
+        while True:
+            result = db.execute_query(self._next_key, (last_key, end_key, size), cache=False)
+            if result is None:
+                return False
+            high = result[0][0]
+            if high is None:
+                return True
+
+            start = time.perf_counter()
+            try:
+                with db.transaction() as tx:
+                    rows = max(tx.execute(self.statement, (last_key, high)), 0)
+                    tx.execute(_SAVE_PROGRESS, (version, high, end_key, rows_done + rows))
+            except db.errors as e:
+                print(f"Error backfilling {self.table} after {self.key} {last_key}: {e}")
+                return False
+            elapsed = time.perf_counter() - start
+
+            last_key, rows_done = high, rows_done + rows
+            if on_progress:
+                on_progress(rows_done, last_key)
+
+            # Keep each chunk's transaction, and the row locks it holds, short
+            if elapsed > self.target_seconds:
+                size = max(size // 2, 1)
+            elif elapsed < self.target_seconds / 4:
+                size = min(size * 2, self.chunk_size)
+            if self.pause:
+                time.sleep(self.pause)
+
+
+Step = Union[str, Callable[[], bool]]
+
+
+class Migration:
+    """One numbered schema change: steps, an optional backfill, finalize steps"""
+
+    def __init__(self, version: int, name: str, steps: Sequence[Step] = (),
+                 backfill: Optional[Backfill] = None, finalize: Sequence[Step] = ()):
+        self.version = version
+        self.name = name
+        self.steps = tuple(steps)
+        self.backfill = backfill
+        self.finalize = tuple(finalize)
+
+    def apply(self, on_progress: Callable[[int, int], None] = None) -> bool:
+        """Run the migration and record it; safe to re-run after a failure"""
+        for step in self.steps:
+            if not _run_step(step):
+                return False
+        if self.backfill and not self.backfill.run(self.version, on_progress):
+            return False
+        for step in self.finalize:
+            if not _run_step(step):
+                return False
+
+        try:
+            with db.transaction() as tx:
+                tx.execute(_RECORD, (self.version, self.name))
+                tx.execute(_CLEAR_PROGRESS, (self.version,))
+        except db.errors as e:
+            print(f"Error recording migration {self.version}: {e}")
+            return False
+        return True
+
+
+def _run_step(step: Step) -> bool:
+    """Run a SQL statement or a callable step"""
+    if callable(step):
+        return step()
+    return db.execute_query(step) is not None
+
+
+# Databases created before the rollup have transactions but no summary rows.
+# The triggers keep monthly_summary exact for rows written from here on, so
+# the backfill only adds up rows that existed when it started; it starts from
+# an empty rollup so rerunning it on a database that already has one is exact.
+# Editing an old row the backfill has not reached yet would be counted by
+# both, so apply it with the application closed (install.py or
+# 'maintenance.py migrate').
+_CREATE_MONTHLY_SUMMARY = """
+    CREATE TABLE IF NOT EXISTS monthly_summary (
+        user_id INT NOT NULL,
+        month DATE NOT NULL,
+        type ENUM('Income', 'Expense') NOT NULL,
+        category_id INT NOT NULL,
+        total DECIMAL(12,2) NOT NULL DEFAULT 0,
+        txn_count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, month, type, category_id),
+        FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE
+    )
+"""
+
+_BACKFILL_MONTHLY_SUMMARY = """
+    INSERT INTO monthly_summary (user_id, month, type, category_id, total, txn_count)
+    SELECT user_id, DATE_FORMAT(date, '%%Y-%%m-01'), type, category_id, SUM(amount), COUNT(*)
+    FROM transaction
+    WHERE transaction_id > %s AND transaction_id <= %s
+    GROUP BY user_id, DATE_FORMAT(date, '%%Y-%%m-01'), type, category_id
+    ON DUPLICATE KEY UPDATE total = total + VALUES(total), txn_count = txn_count + VALUES(txn_count)
+"""
+
+# Every schema change, oldest first
+MIGRATIONS: List[Migration] = [
+    # The whole of setup.sql (and the backend's extra schema script)
+    Migration(1, "baseline schema", steps=[db.initialize_schema]),
+    Migration(2, "monthly_summary backfill", steps=[
+        _CREATE_MONTHLY_SUMMARY,
+    ], backfill=Backfill('transaction', 'transaction_id', _BACKFILL_MONTHLY_SUMMARY,
+                         prepare=["DELETE FROM monthly_summary"])),
+]
+
+
+def applied_versions() -> Optional[Set[int]]:
+    """Versions already recorded in schema_migrations; None on failure"""
+    for query in (_CREATE_MIGRATIONS_TABLE, _CREATE_PROGRESS_TABLE):
+        if db.execute_query(query) is None:
+            return None
+    result = db.execute_query(_APPLIED, cache=False)
+    if result is None:
+        return None
+    return {version for version, in result}
+
+
+def pending_migrations() -> Optional[List[Migration]]:
+    """Migrations not applied yet, in order; None on failure"""
+    applied = applied_versions()
+    if applied is None:
+        return None
+    return [migration for migration in MIGRATIONS if migration.version not in applied]
+
+
+@contextmanager
+def _migration_lock():
+    """Hold a MySQL named lock while migrating; yields whether it was acquired"""
+    if db.get_backend().name != 'mysql':
+        yield True
+        return
+    with db.connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (_LOCK_NAME,))
+            acquired = cursor.fetchone()[0] == 1
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", (_LOCK_NAME,))
+                    cursor.fetchall()
+        finally:
+            cursor.close()
+
+
+def migrate(target: Optional[int] = None,
+            on_start: Callable[[Migration], None] = None,
+            on_progress: Callable[[Migration, int, int], None] = None) -> bool:
+    """Apply pending migrations in order, up to ``target`` if given
+
+    Stops at the first failure; running it again resumes from there.
+    """
+    with _migration_lock() as acquired:
+        if not acquired:
+            print("Error migrating: another process is applying migrations")
+            return False
+
+        pending = pending_migrations()
+        if pending is None:
+            return False
+        for migration in pending:
+            if target is not None and migration.version > target:
+                break
+            if on_start:
+                on_start(migration)
+            progress = None
+            if on_progress:
+                progress = lambda rows, key, migration=migration: on_progress(migration, rows, key)
+            if not migration.apply(progress):
+                return False
+        return True
@@ -0,0 +1,207 @@
+from datetime import date
+from typing import Dict, List, Optional
+
+from db.connection import db
+from db.search import forget_fulltext_index
+
+# Yearly RANGE partitioning of the transaction table (MySQL only).
+#
+# MySQL cannot partition a table that has foreign keys, and every unique key
+# must contain the partitioning column, so converting the table drops its
+# foreign keys and widens the primary key to (transaction_id, date).  FULLTEXT
+# indexes are not allowed either, so description search falls back to LIKE
+# (see db/search.py).  That is why setup.sql leaves the table unpartitioned
+# and this is an explicit step.
+#
+# Partitions are named p<year> and hold dates in that year; pmax catches
+# anything beyond the newest yearly partition.  Queries that filter on a date
+# range (monthly totals, reports) only read the partitions for those years.
+
+TABLE = 'transaction'
+CATCH_ALL = 'pmax'
+
+_PARTITIONS_QUERY = """
+    SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+    ORDER BY PARTITION_ORDINAL_POSITION
+"""
+
+_FULLTEXT_INDEXES_QUERY = """
+    SELECT DISTINCT INDEX_NAME
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_TYPE = 'FULLTEXT'
+"""
+
+_FOREIGN_KEYS_QUERY = """
+    SELECT CONSTRAINT_NAME
+    FROM information_schema.REFERENTIAL_CONSTRAINTS
+    WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = %s
+"""
+
+
+def is_supported() -> bool:
+    """Whether the active backend supports table partitioning"""
+    return db.get_backend().name == 'mysql'
+
+
+def partition_name(year: int) -> str:
+    return f"p{year}"
+
+
+def _partition_clause(year: int) -> str:
+    return f"PARTITION {partition_name(year)} VALUES LESS THAN ({year + 1})"
+
+
+def list_partitions() -> Optional[List[Dict]]:
+    """Partitions of the transaction table, oldest first; [] if unpartitioned"""
+    result = db.execute_query(_PARTITIONS_QUERY, (TABLE,), cache=False)
+    if result is None:
+        return None
+    partitions = []
+    for name, bound, rows in result:
+        year = int(name[1:]) if name != CATCH_ALL and name[1:].isdigit() else None
+        partitions.append({'name': name, 'year': year, 'bound': bound, 'rows': rows})
+    return partitions
+
+
+def _yearly(partitions: List[Dict]) -> List[int]:
+    return [p['year'] for p in partitions if p['year'] is not None]
+
+
+def partition_transactions(through_year: Optional[int] = None) -> bool:
+    """Convert the transaction table to yearly partitions
+
+    Creates one partition per year from the oldest transaction up to
+    ``through_year`` (next year by default) plus the pmax catch-all.
+    """
+    partitions = list_partitions()
+    if partitions is None:
+        return False
+    if partitions:
+        print("Transaction table is already partitioned")
+        return True
+
+    foreign_keys = db.execute_query(_FOREIGN_KEYS_QUERY, (TABLE,), cache=False)
+    fulltext = db.execute_query(_FULLTEXT_INDEXES_QUERY, (TABLE,), cache=False)
+    oldest = db.execute_query(f"SELECT MIN(YEAR(date)) FROM {TABLE}", cache=False)
+    if foreign_keys is None or fulltext is None or oldest is None:
+        return False
+
+    current_year = date.today().year
+    first_year = oldest[0][0] or current_year
+    if through_year is None:
+        through_year = current_year + 1
+
+    statements = [f"ALTER TABLE {TABLE} DROP FOREIGN KEY `{name}`" for (name,) in foreign_keys]
+    statements += [f"ALTER TABLE {TABLE} DROP INDEX `{name}`" for (name,) in fulltext]
+    statements.append(f"ALTER TABLE {TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (transaction_id, date)")
+    clauses = [_partition_clause(year) for year in range(first_year, through_year + 1)]
+    clauses.append(f"PARTITION {CATCH_ALL} VALUES LESS THAN MAXVALUE")
+    statements.append(f"ALTER TABLE {TABLE} PARTITION BY RANGE (YEAR(date)) ({', '.join(clauses)})")
+
+    try:
+        for statement in statements:
+            if db.execute_query(statement) is None:
+                return False
+        return True
+    finally:
+        # The FULLTEXT index is gone (or may be, after a partial run)
+        forget_fulltext_index()
+
+
+def add_year_partitions(year: Optional[int] = None) -> Optional[List[str]]:
+    """Split partitions up to ``year`` (next year by default) out of pmax
+
+    Returns the names of the partitions created, or None on failure.
+    """
+    if year is None:
+        year = date.today().year + 1
+
+    partitions = list_partitions()
+    if partitions is None:
+        return None
+    if not partitions:
+        print("Transaction table is not partitioned; run the 'partition' command first")
+        return None
+
+    years = _yearly(partitions)
+    start = max(years) + 1 if years else date.today().year
+    new_years = list(range(start, year + 1))
+    if not new_years:
+        return []
+
+    clauses = [_partition_clause(y) for y in new_years]
+    clauses.append(f"PARTITION {CATCH_ALL} VALUES LESS THAN MAXVALUE")
+    statement = f"ALTER TABLE {TABLE} REORGANIZE PARTITION {CATCH_ALL} INTO ({', '.join(clauses)})"
+    if db.execute_query(statement) is None:
+        return None
+    return [partition_name(y) for y in new_years]
+
+
+def archive_table(year: int) -> str:
+    return f"{TABLE}_archive_{year}"
+
+
+def archive_partitions(before_year: int, compress: bool = True) -> Optional[List[str]]:
+    """Move every yearly partition older than ``before_year`` into its own table
+
+    Each partition is swapped into a newly created ``transaction_archive_<year>``
+    table with EXCHANGE PARTITION (a metadata operation, no row copying), the
+    emptied partition is dropped, and the archive table is optionally rebuilt
+    with ROW_FORMAT=COMPRESSED.  monthly_summary keeps its totals for
+    the archived months because partition DDL does not fire the triggers.
+
+    Returns the archive tables written, or None on failure.
+    """
+    partitions = list_partitions()
+    if partitions is None:
+        return None
+    if not partitions:
+        print("Transaction table is not partitioned; run the 'partition' command first")
+        return None
+
+    years = [y for y in _yearly(partitions) if y < before_year]
+    if years and len(years) == len(_yearly(partitions)):
+        # Dropping every yearly partition would leave dates below pmax nowhere to go
+        years = years[:-1]
+
+    archived = []
+    for year in years:
+        table = archive_table(year)
+        if _table_exists(table):
+            count = db.execute_query(f"SELECT COUNT(*) FROM {table}", cache=False)
+            if count is None:
+                return None
+            if count[0][0]:
+                print(f"Error archiving {partition_name(year)}: {table} already holds rows")
+                return None
+            # Left empty by an interrupted run, possibly already compressed,
+            # and EXCHANGE PARTITION needs the row format to match
+            statements = [f"DROP TABLE {table}"]
+        else:
+            statements = []
+        # LIKE copies the partitioning but not the triggers or foreign keys
+        statements += [
+            f"CREATE TABLE {table} LIKE {TABLE}",
+            f"ALTER TABLE {table} REMOVE PARTITIONING",
+        ]
+        statements += [
+            f"ALTER TABLE {TABLE} EXCHANGE PARTITION {partition_name(year)} WITH TABLE {table}",
+            f"ALTER TABLE {TABLE} DROP PARTITION {partition_name(year)}",
+        ]
+        if compress:
+            statements.append(f"ALTER TABLE {table} ROW_FORMAT=COMPRESSED")
+
+        for statement in statements:
+            if db.execute_query(statement) is None:
+                return None
+        archived.append(table)
+    return archived
+
+
+def _table_exists(table: str) -> bool:
+    result = db.execute_query(
+        "SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table,), cache=False)
+    return bool(result and result[0][0])
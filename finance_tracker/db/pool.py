@@ -0,0 +1,219 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+    pass
+
+
+class ConnectionPool:
+    """Thread-safe pool of database connections
+
+    Connections are created through the ``connect`` factory.  ``min_size``
+    connections are opened up front and the pool grows on demand up to
+    ``max_size``; once every connection is checked out, callers block for up
+    to ``timeout`` seconds waiting for one to be released.
+
+    ``validate`` (typically a server ping) only runs on connections that have
+    sat idle for at least ``validate_after`` seconds, so busy connections are
+    handed out without an extra round trip.
+    """
+
+    def __init__(self, connect: Callable, min_size: int = 1, max_size: int = 5,
+                 timeout: float = 10.0, validate: Optional[Callable] = None,
+                 validate_after: float = 30.0, reset_session: Optional[Callable] = None,
+                 on_reset: Optional[Callable] = None, on_close: Optional[Callable] = None):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.validate = validate  # Liveness check for idle connections
+        self.validate_after = validate_after  # Idle seconds before validate() is called
+        self.reset_session = reset_session  # Per-release session reset, if any
+        self.on_reset = on_reset  # Called after a connection's session is reset
+        self.on_close = on_close  # Called before a connection is closed
+
+        self._idle: List = []
+        self._in_use = set()
+        self._last_used: Dict[int, float] = {}
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+
+        # Liveness metrics (see stats())
+        self.opened = 0
+        self.validations = 0
+        self.stale_replaced = 0
+        self.last_reconnect = None
+
+        for _ in range(min_size):
+            connection = self._open()
+            self._idle.append(connection)
+            self._size += 1
+
+    @property
+    def size(self) -> int:
+        """Number of open connections (idle and checked out)"""
+        return self._size
+
+    @property
+    def available(self) -> int:
+        """Number of idle connections ready for checkout"""
+        return len(self._idle)
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Check out a connection, opening a new one if the pool may grow"""
+        if timeout is None:
+            timeout = self.timeout
+        deadline = time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise PoolTimeoutError("Connection pool is closed")
+
+                if self._idle:
+                    connection = self._idle.pop()
+                    idle_for = time.monotonic() - self._last_used.get(id(connection), 0.0)
+                    break
+
+                if self._size < self.max_size:
+                    # Reserve the slot before connecting outside the lock
+                    self._size += 1
+                    connection = None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"No database connection available after {timeout:.1f}s "
+                        f"(pool size {self.max_size})")
+                self._condition.wait(remaining)
+
+        try:
+            if connection is None:
+                connection = self._open()
+            elif self.validate and idle_for >= self.validate_after:
+                self.validations += 1
+                try:
+                    alive = self.validate(connection)
+                except Exception:
+                    # A ping that raises means the socket is gone
+                    alive = False
+                if not alive:
+                    # Stale connection left in the pool; replace it transparently
+                    self.stale_replaced += 1
+                    self._close_quietly(connection)
+                    connection = self._open()
+                    self.last_reconnect = time.time()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._in_use.add(id(connection))
+        return connection
+
+    def release(self, connection):
+        """Reset a checked-out connection and return it to the pool"""
+        with self._condition:
+            self._in_use.discard(id(connection))
+
+        healthy = self._reset(connection)
+
+        with self._condition:
+            if healthy and not self._closed:
+                self._last_used[id(connection)] = time.monotonic()
+                self._idle.append(connection)
+            else:
+                self._size -= 1
+            self._condition.notify()
+
+        if not healthy or self._closed:
+            self._close_quietly(connection)
+
+    def discard(self, connection):
+        """Drop a broken connection instead of returning it to the pool"""
+        with self._condition:
+            self._in_use.discard(id(connection))
+            self._size -= 1
+            self._condition.notify()
+        self._close_quietly(connection)
+
+    def expire_idle(self):
+        """Validate every idle connection on its next checkout, e.g. after a server restart"""
+        with self._condition:
+            for connection in self._idle:
+                self._last_used.pop(id(connection), None)
+
+    def stats(self) -> Dict:
+        """Pool size and liveness counters"""
+        with self._condition:
+            return {
+                'size': self._size,
+                'available': len(self._idle),
+                'opened': self.opened,
+                'validations': self.validations,
+                'stale_replaced': self.stale_replaced,
+                'last_reconnect': self.last_reconnect,
+            }
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Check out a connection for the duration of a with-block"""
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close_all(self):
+        """Close idle connections; busy ones are closed when released"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def _reset(self, connection) -> bool:
+        """Clear per-session state so the next borrower starts clean"""
+        try:
+            if getattr(connection, 'in_transaction', False):
+                connection.rollback()
+            if self.reset_session:
+                self.reset_session(connection)
+                if self.on_reset:
+                    self.on_reset(connection)
+            return True
+        except Exception:
+            return False
+
+    def _open(self):
+        """Open a new connection through the factory"""
+        connection = self.connect()
+        with self._condition:
+            self.opened += 1
+            self._last_used[id(connection)] = time.monotonic()
+        return connection
+
+    def _close_quietly(self, connection):
+        """Close a connection, ignoring errors from dead sockets"""
+        with self._condition:
+            self._last_used.pop(id(connection), None)
+        try:
+            if self.on_close:
+                self.on_close(connection)
+            connection.close()
+        except Exception:
+            pass
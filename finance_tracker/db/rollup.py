@@ -0,0 +1,106 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from db.connection import db
+from utils.money import Money, cents_sql
+
+# monthly_summary holds one row per (user, first day of month, type, category);
+# the triggers in setup.sql keep it exact on every insert, update and delete.
+
+_DELETE_SUMMARY = "DELETE FROM monthly_summary{where}"
+
+_BACKFILL_SUMMARY = """
+    INSERT INTO monthly_summary (user_id, month, type, category_id, total, txn_count)
+    SELECT user_id, DATE_FORMAT(date, '%%Y-%%m-01'), type, category_id, SUM(amount), COUNT(*)
+    FROM transaction{where}
+    GROUP BY user_id, DATE_FORMAT(date, '%%Y-%%m-01'), type, category_id
+"""
+
+# Income and expense per month over a window of months: one range scan of
+# the monthly_summary primary key, whatever the window's length
+MONTHLY_TOTALS_QUERY = f"""
+    SELECT month, type, {cents_sql('SUM(total)')} as total
+    FROM monthly_summary
+    WHERE user_id = %s AND month >= %s AND month <= %s
+    GROUP BY month, type
+"""
+
+# This month and the twelve before it
+MONTH_WINDOW = 13
+
+
+def rebuild_monthly_summary(user_id: Optional[int] = None) -> Optional[int]:
+    """Recompute monthly_summary from transaction, for one user or everyone
+
+    Runs in a single transaction so readers never see a half-built rollup;
+    that holds locks on the whole table for the length of the rebuild, so
+    upgrades fill the rollup through migration 2 in db/migrations.py instead
+    and this is for repairing it.
+    Months whose partitions were archived (see db/partitions.py) are no
+    longer in transaction, so rebuilding drops their totals as well.
+    Returns the number of summary rows written, or None on failure.
+    """
+    where = " WHERE user_id = %s" if user_id is not None else ""
+    params = (user_id,) if user_id is not None else ()
+    try:
+        with db.transaction() as tx:
+            tx.execute(_DELETE_SUMMARY.format(where=where), params)
+            return tx.execute(_BACKFILL_SUMMARY.format(where=where), params)
+    except db.errors as e:
+        print(f"Error rebuilding monthly summary: {e}")
+        return None
+
+
+def month_window(last_month: Optional[date] = None, count: int = MONTH_WINDOW) -> List[date]:
+    """First days of the ``count`` months ending with ``last_month``, oldest first
+
+    ``last_month`` defaults to the current month.
+    """
+    last_month = (last_month or date.today()).replace(day=1)
+    index = last_month.year * 12 + last_month.month - 1
+    return [date(i // 12, i % 12 + 1, 1) for i in range(index - count + 1, index + 1)]
+
+
+def monthly_totals_params(user_id: int, months: List[date]) -> tuple:
+    """Parameters for MONTHLY_TOTALS_QUERY over ``months`` (from month_window)"""
+    return (user_id, months[0], months[-1])
+
+
+class MonthlyTotals:
+    """Income and expense totals for consecutive months, oldest first"""
+
+    def __init__(self, months: List[date], totals: Dict[Tuple[date, str], Money]):
+        self.months = months
+        self._totals = totals
+
+    @classmethod
+    def from_rows(cls, months: List[date], rows) -> "MonthlyTotals":
+        """Build from the ``(month, type, cents)`` rows of MONTHLY_TOTALS_QUERY"""
+        totals = {}
+        for month, kind, total in rows or ():
+            if not isinstance(month, date):
+                month = date.fromisoformat(str(month)[:10])
+            totals[(month, kind)] = Money(total)
+        return cls(months, totals)
+
+    def total(self, month: date, kind: str) -> Money:
+        """``kind`` ('Income' or 'Expense') total for ``month``; zero without activity"""
+        return self._totals.get((month, kind), Money(0))
+
+    def series(self, kind: str, count: Optional[int] = None) -> List[Money]:
+        """``kind`` totals for the last ``count`` months of the window (all by default)"""
+        months = self.months if count is None else self.months[-count:]
+        return [self.total(month, kind) for month in months]
+
+
+def fetch_monthly_totals(user_id: int, last_month: Optional[date] = None,
+                         count: int = MONTH_WINDOW) -> Optional[MonthlyTotals]:
+    """Income and expense for ``count`` months ending with ``last_month``
+
+    Returns None if the query failed.
+    """
+    months = month_window(last_month, count)
+    result = db.execute_query(MONTHLY_TOTALS_QUERY, monthly_totals_params(user_id, months))
+    if result is None:
+        return None
+    return MonthlyTotals.from_rows(months, result)
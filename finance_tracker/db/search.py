@@ -0,0 +1,169 @@
+import re
+from typing import List, Optional, Tuple
+
+from db.connection import db
+from utils.money import Money, cents_sql
+
+# Ranked search over transaction descriptions.  MySQL uses the FULLTEXT
+# index from setup.sql; SQLite uses the FTS5 table from setup_sqlite.sql.
+# Both rank documents matching any of the words, best first (SQLite only
+# the newest RANKED_MATCHES of them, see below).
+
+_COLUMNS = f"t.date, t.type, c.category_name, {cents_sql('t.amount')} as amount, t.description"
+
+_MYSQL_SEARCH = f"""
+    SELECT {_COLUMNS},
+           MATCH(t.description) AGAINST (%s IN NATURAL LANGUAGE MODE) as score
+    FROM transaction t
+    JOIN category c ON t.category_id = c.category_id
+    WHERE t.user_id = %s AND MATCH(t.description) AGAINST (%s IN NATURAL LANGUAGE MODE)
+    ORDER BY score DESC, t.date DESC, t.transaction_id DESC
+    LIMIT %s OFFSET %s
+"""
+
+# bm25() scoring costs a couple of microseconds a match, and ranking every
+# match of a user with hundreds of thousands of transactions takes most of
+# a second.  Only the user's RANKED_MATCHES newest matches (highest
+# transaction_id) are ranked, best first (bm25 is lower for better matches;
+# the weights leave the user_id column out of the score); older matches
+# follow, newest first.  The MATCH expression carries the user, so FTS5
+# never visits other users' rows.
+RANKED_MATCHES = 5000
+
+# transaction_id of the oldest ranked match; no row if everything is ranked
+_SQLITE_RANK_CUTOFF = """
+    SELECT rowid FROM transaction_fts WHERE transaction_fts MATCH %s
+    ORDER BY rowid DESC LIMIT 1 OFFSET %s
+"""
+
+_SQLITE_SEARCH = f"""
+    SELECT {_COLUMNS}, bm25(transaction_fts, 1.0, 0.0) as score
+    FROM transaction_fts
+    JOIN transaction t ON t.transaction_id = transaction_fts.rowid
+    JOIN category c ON t.category_id = c.category_id
+    WHERE transaction_fts MATCH %s AND transaction_fts.rowid >= %s AND t.user_id = %s
+    ORDER BY score, t.date DESC, t.transaction_id DESC
+    LIMIT %s OFFSET %s
+"""
+
+_SQLITE_OLDER = f"""
+    SELECT {_COLUMNS}, 0 as score
+    FROM transaction_fts
+    JOIN transaction t ON t.transaction_id = transaction_fts.rowid
+    JOIN category c ON t.category_id = c.category_id
+    WHERE transaction_fts MATCH %s AND transaction_fts.rowid < %s AND t.user_id = %s
+    ORDER BY transaction_fts.rowid DESC
+    LIMIT %s OFFSET %s
+"""
+
+# Without a FULLTEXT index (MySQL refuses one on a partitioned table)
+_LIKE_SEARCH = f"""
+    SELECT {_COLUMNS}, 0 as score
+    FROM transaction t
+    JOIN category c ON t.category_id = c.category_id
+    WHERE t.user_id = %s AND t.description LIKE %s
+    ORDER BY t.date DESC, t.transaction_id DESC
+    LIMIT %s OFFSET %s
+"""
+
+_FULLTEXT_INDEX_QUERY = """
+    SELECT COUNT(*) FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'transaction' AND INDEX_TYPE = 'FULLTEXT'
+"""
+
+_WORD = re.compile(r"\w+")
+
+# (backend, whether it has the FULLTEXT index), looked up on the first search
+# against each backend; use_backend() creates a new one
+_has_fulltext: Optional[Tuple[object, bool]] = None
+
+
+class SearchPage:
+    """One page of search results, best match first"""
+
+    def __init__(self, rows: List[tuple], offset: int, has_more: bool):
+        # (date, type, category_name, amount as Money, description) tuples
+        self.rows = rows
+        self.offset = offset
+        self.has_more = has_more
+
+    @property
+    def next_offset(self) -> int:
+        return self.offset + len(self.rows)
+
+
+def fts_query(text: str) -> str:
+    """FTS5 MATCH expression for any of the words in ``text``
+
+    Each word is quoted, so FTS5 operators and punctuation typed by the user
+    are searched for literally instead of being parsed.
+    """
+    return ' OR '.join(f'"{word}"' for word in _WORD.findall(text))
+
+
+def user_fts_query(user_id: int, text: str) -> str:
+    """FTS5 MATCH expression for ``user_id``'s descriptions with any word of ``text``"""
+    return f'user_id : "{int(user_id)}" AND description : ({fts_query(text)})'
+
+
+def forget_fulltext_index():
+    """Look the FULLTEXT index up again on the next search (after DDL that changes it)"""
+    global _has_fulltext
+    _has_fulltext = None
+
+
+def _mysql_has_fulltext() -> bool:
+    global _has_fulltext
+    backend = db.get_backend()
+    if _has_fulltext is None or _has_fulltext[0] is not backend:
+        result = db.execute_query(_FULLTEXT_INDEX_QUERY, cache=False)
+        if result is None:
+            return False
+        _has_fulltext = (backend, bool(result[0][0]))
+    return _has_fulltext[1]
+
+
+def _search_sqlite(user_id: int, text: str, limit: int, offset: int) -> Optional[List[tuple]]:
+    """Up to ``limit`` rows from ``offset``: ranked newest matches, then older ones"""
+    match = user_fts_query(user_id, text)
+    cutoff = db.execute_query(_SQLITE_RANK_CUTOFF, (match, RANKED_MATCHES - 1))
+    if cutoff is None:
+        return None
+    cutoff = cutoff[0][0] if cutoff else 0
+
+    rows = []
+    if offset < RANKED_MATCHES:
+        rows = db.execute_query(_SQLITE_SEARCH, (match, cutoff, user_id, limit, offset))
+        if rows is None:
+            return None
+    if cutoff and len(rows) < limit:
+        older = db.execute_query(_SQLITE_OLDER, (match, cutoff, user_id, limit - len(rows),
+                                                 max(offset - RANKED_MATCHES, 0)))
+        if older is None:
+            return None
+        rows = rows + older
+    return rows
+
+
+def search_transactions(user_id: int, text: str, limit: int = 50,
+                        offset: int = 0) -> Optional[SearchPage]:
+    """Search a user's transaction descriptions; None if the query failed"""
+    if not _WORD.search(text or ''):
+        return SearchPage([], offset, False)
+
+    # One extra row tells us whether another page follows
+    if db.get_backend().name == 'sqlite':
+        result = _search_sqlite(user_id, text, limit + 1, offset)
+    else:
+        if _mysql_has_fulltext():
+            query, params = _MYSQL_SEARCH, (text, user_id, text, limit + 1, offset)
+        else:
+            pattern = '%' + text.strip().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            query, params = _LIKE_SEARCH, (user_id, pattern, limit + 1, offset)
+        result = db.execute_query(query, params)
+
+    if result is None:
+        return None
+    rows = [(date, kind, category, Money(amount), description)
+            for date, kind, category, amount, description, _ in result[:limit]]
+    return SearchPage(rows, offset, len(result) > limit)
@@ -20,6 +20,8 @@ CREATE TABLE IF NOT EXISTS category (
 );
 
 -- Create transaction table
+-- (python maintenance.py partition switches it to yearly RANGE partitions on MySQL;
+--  that drops the foreign keys below, so it is not done here)
 CREATE TABLE IF NOT EXISTS transaction (
     transaction_id INT AUTO_INCREMENT PRIMARY KEY,
     user_id INT NOT NULL,
@@ -44,6 +46,30 @@ CREATE TABLE IF NOT EXISTS budget (
     UNIQUE KEY unique_user_month (user_id, month)
 );
 
+-- Create monthly rollup table (kept exact by the triggers at the end of this script)
+CREATE TABLE IF NOT EXISTS monthly_summary (
+    user_id INT NOT NULL,
+    month DATE NOT NULL,
+    type ENUM('Income', 'Expense') NOT NULL,
+    category_id INT NOT NULL,
+    total DECIMAL(12,2) NOT NULL DEFAULT 0,
+    txn_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, month, type, category_id),
+    FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE
+);
+
+-- Create per-category budget table (month is the first day of the month, as in monthly_summary)
+CREATE TABLE IF NOT EXISTS category_budget (
+    user_id INT NOT NULL,
+    category_id INT NOT NULL,
+    month DATE NOT NULL,
+    limit_amount DECIMAL(10,2) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, month, category_id),
+    FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES category(category_id) ON DELETE CASCADE
+);
+
 -- Insert default categories
 INSERT IGNORE INTO category (category_name) VALUES 
 ('Food'),
@@ -63,6 +89,44 @@ INSERT IGNORE INTO category (category_name) VALUES
 ('Other');
 
 -- Create indexes for better performance
-CREATE INDEX idx_transaction_user_date ON transaction(user_id, date);
+-- Recent-transaction lists: user_id = ? ORDER BY date DESC, transaction_id DESC LIMIT n.
+-- Covers every listed column except description (TEXT) and supersedes (user_id, date).
+CREATE INDEX idx_transaction_user_recent ON transaction(user_id, date, transaction_id, type, amount, category_id);
 CREATE INDEX idx_transaction_type ON transaction(type);
+-- Monthly totals filter on user, type and a date range (date >= first day AND date < next month)
+CREATE INDEX idx_transaction_user_type_date ON transaction(user_id, type, date);
 CREATE INDEX idx_budget_user_month ON budget(user_id, month);
+-- Description search (SQLite builds an FTS5 table instead, see setup_sqlite.sql)
+CREATE FULLTEXT INDEX idx_transaction_description ON transaction(description);
+
+-- Keep monthly_summary in step with transaction (month is the first day of the month)
+DROP TRIGGER IF EXISTS trg_transaction_insert_summary;
+CREATE TRIGGER trg_transaction_insert_summary AFTER INSERT ON transaction
+FOR EACH ROW
+    INSERT INTO monthly_summary (user_id, month, type, category_id, total, txn_count)
+    VALUES (NEW.user_id, DATE_FORMAT(NEW.date, '%Y-%m-01'), NEW.type, NEW.category_id, NEW.amount, 1)
+    ON DUPLICATE KEY UPDATE total = total + NEW.amount, txn_count = txn_count + 1;
+
+DROP TRIGGER IF EXISTS trg_transaction_delete_summary;
+CREATE TRIGGER trg_transaction_delete_summary AFTER DELETE ON transaction
+FOR EACH ROW
+    UPDATE monthly_summary
+    SET total = total - OLD.amount, txn_count = txn_count - 1
+    WHERE user_id = OLD.user_id AND month = DATE_FORMAT(OLD.date, '%Y-%m-01')
+    AND type = OLD.type AND category_id = OLD.category_id;
+
+-- An update takes the old amount out of its bucket and adds the new one (in either order)
+DROP TRIGGER IF EXISTS trg_transaction_update_summary_old;
+CREATE TRIGGER trg_transaction_update_summary_old AFTER UPDATE ON transaction
+FOR EACH ROW
+    UPDATE monthly_summary
+    SET total = total - OLD.amount, txn_count = txn_count - 1
+    WHERE user_id = OLD.user_id AND month = DATE_FORMAT(OLD.date, '%Y-%m-01')
+    AND type = OLD.type AND category_id = OLD.category_id;
+
+DROP TRIGGER IF EXISTS trg_transaction_update_summary_new;
+CREATE TRIGGER trg_transaction_update_summary_new AFTER UPDATE ON transaction
+FOR EACH ROW
+    INSERT INTO monthly_summary (user_id, month, type, category_id, total, txn_count)
+    VALUES (NEW.user_id, DATE_FORMAT(NEW.date, '%Y-%m-01'), NEW.type, NEW.category_id, NEW.amount, 1)
+    ON DUPLICATE KEY UPDATE total = total + NEW.amount, txn_count = txn_count + 1;
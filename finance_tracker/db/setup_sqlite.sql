@@ -0,0 +1,35 @@
+-- SQLite-only schema, run by the SQLite backend after setup.sql.
+-- Statements use the same MySQL-flavoured dialect and are translated the same way.
+
+-- Full-text search over descriptions (MySQL uses the FULLTEXT index in setup.sql).
+-- External-content FTS5 table: it stores only the index, rows stay in transaction.
+-- user_id is indexed too, so a search only walks the searching user's matches.
+CREATE VIRTUAL TABLE IF NOT EXISTS transaction_fts USING fts5(
+    description, user_id, content='transaction', content_rowid='transaction_id'
+);
+
+-- Keep transaction_fts in step with transaction
+CREATE TRIGGER IF NOT EXISTS trg_transaction_insert_fts AFTER INSERT ON transaction
+FOR EACH ROW
+    INSERT INTO transaction_fts (rowid, description, user_id)
+    VALUES (NEW.transaction_id, NEW.description, NEW.user_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_transaction_delete_fts AFTER DELETE ON transaction
+FOR EACH ROW
+    INSERT INTO transaction_fts (transaction_fts, rowid, description, user_id)
+    VALUES ('delete', OLD.transaction_id, OLD.description, OLD.user_id);
+
+-- An update removes the old entry before the new one is indexed
+CREATE TRIGGER IF NOT EXISTS trg_transaction_update_fts_old BEFORE UPDATE OF description, user_id ON transaction
+FOR EACH ROW
+    INSERT INTO transaction_fts (transaction_fts, rowid, description, user_id)
+    VALUES ('delete', OLD.transaction_id, OLD.description, OLD.user_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_transaction_update_fts_new AFTER UPDATE OF description, user_id ON transaction
+FOR EACH ROW
+    INSERT INTO transaction_fts (rowid, description, user_id)
+    VALUES (NEW.transaction_id, NEW.description, NEW.user_id);
+
+-- Index rows written before the search table existed (an existing database)
+INSERT INTO transaction_fts (transaction_fts)
+SELECT 'rebuild' WHERE NOT EXISTS (SELECT 1 FROM transaction_fts_docsize);
@@ -0,0 +1,155 @@
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Statements worth preparing: parameterized DML/queries, never DDL
+_PREPARABLE = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+_PYFORMAT_TOKEN = re.compile(r"%%|%s")
+
+
+def to_prepared_sql(query: str) -> Optional[str]:
+    """Convert pyformat SQL (``%s``, ``%%``) to the ``?`` form MySQL prepares
+
+    Returns None when the statement cannot be converted unambiguously.
+    """
+    if '%(' in query:
+        return None
+    converted = _PYFORMAT_TOKEN.sub(lambda m: '?' if m.group(0) == '%s' else '%', query)
+    # A literal "%%s" would turn into a placeholder-looking "%s"; leave it alone
+    if '%s' in converted:
+        return None
+    return converted
+
+
+class PreparedStatementCache:
+    """Transparent server-side prepared statements for hot SQL
+
+    A statement is prepared once it has been registered explicitly or seen
+    ``auto_prepare_after`` times.  Each pooled connection keeps its own LRU
+    of prepared cursors bounded by ``max_per_connection``; evicting a cursor
+    closes the statement on the server.
+    """
+
+    def __init__(self, max_per_connection: int = 32, auto_prepare_after: int = 3,
+                 max_tracked: int = 1000):
+        self.enabled = True
+        self.max_per_connection = max_per_connection
+        self.auto_prepare_after = auto_prepare_after
+        self.max_tracked = max_tracked
+
+        self._registered = set()
+        self._unpreparable = set()
+        self._seen: Dict[str, int] = {}
+        self._caches = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def register(self, query: str):
+        """Always prepare ``query`` from its first execution"""
+        with self._lock:
+            self._registered.add(query)
+
+    def should_prepare(self, query: str, params) -> bool:
+        """Count an execution of ``query`` and decide whether to prepare it"""
+        if not self.enabled or params is None or not _PREPARABLE.match(query):
+            return False
+
+        with self._lock:
+            if query in self._unpreparable:
+                return False
+            if query in self._registered:
+                return True
+            if self.auto_prepare_after is None:
+                return False
+
+            count = self._seen.get(query, 0) + 1
+            if count >= self.auto_prepare_after:
+                self._registered.add(query)
+                self._seen.pop(query, None)
+                return True
+
+            # Dynamically built SQL should not grow the counter table forever
+            if len(self._seen) >= self.max_tracked:
+                self._seen.clear()
+            self._seen[query] = count
+            return False
+
+    def cursor_for(self, connection, query: str) -> Optional[Tuple[object, str]]:
+        """Return ``(prepared_cursor, sql)`` for ``query`` on ``connection``
+
+        The same ``sql`` object must be passed back to ``cursor.execute`` so
+        the connector recognizes the statement and skips re-preparing it.
+        """
+        with self._lock:
+            cache = self._caches.get(connection)
+            if cache is None:
+                cache = self._caches[connection] = OrderedDict()
+
+        entry = cache.get(query)
+        if entry is not None:
+            cache.move_to_end(query)
+            self.hits += 1
+            return entry
+
+        sql = to_prepared_sql(query)
+        if sql is None:
+            self.mark_unpreparable(query)
+            return None
+
+        entry = (connection.cursor(prepared=True), sql)
+        cache[query] = entry
+        self.misses += 1
+
+        while len(cache) > self.max_per_connection:
+            _, (old_cursor, _) = cache.popitem(last=False)
+            self.evictions += 1
+            self._close_quietly(old_cursor)
+        return entry
+
+    def evict(self, connection, query: str):
+        """Drop one prepared statement, e.g. after it failed"""
+        cache = self._caches.get(connection)
+        if cache is not None:
+            entry = cache.pop(query, None)
+            if entry is not None:
+                self._close_quietly(entry[0])
+
+    def mark_unpreparable(self, query: str):
+        """Fall back to the text protocol for ``query`` from now on"""
+        with self._lock:
+            self._registered.discard(query)
+            self._unpreparable.add(query)
+
+    def clear(self, connection):
+        """Forget a connection's statements (server side state was reset)"""
+        with self._lock:
+            cache = self._caches.pop(connection, None)
+        if cache:
+            for cursor, _ in cache.values():
+                self._close_quietly(cursor)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for cache hits, misses (prepares) and evictions"""
+        with self._lock:
+            cached = sum(len(cache) for cache in self._caches.values())
+            registered = len(self._registered)
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'cached': cached,
+            'registered': registered,
+        }
+
+    @staticmethod
+    def _close_quietly(cursor):
+        """Close a prepared cursor, ignoring errors from dead connections"""
+        try:
+            cursor.close()
+        except Exception:
+            pass
@@ -0,0 +1,138 @@
+import logging
+import os
+import re
+import threading
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import Dict, Optional
+
+# Patterns used to collapse literal values out of SQL text
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(query: str) -> str:
+    """Normalize SQL so that calls differing only in literals group together"""
+    normalized = query.replace('%%', '%')
+    normalized = _STRING_LITERAL.sub('?', normalized)
+    normalized = _PLACEHOLDER.sub('?', normalized)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _IN_LIST.sub('IN (...)', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+def _percentile(sorted_samples, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    index = max(0, min(len(sorted_samples) - 1, int(round(fraction * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+class _StatementStats:
+    """Running counters for one statement fingerprint"""
+
+    def __init__(self, max_samples: int):
+        self.calls = 0
+        self.rows = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.samples = deque(maxlen=max_samples)
+
+    def to_dict(self) -> Dict:
+        ordered = sorted(self.samples)
+        return {
+            'calls': self.calls,
+            'rows': self.rows,
+            'errors': self.errors,
+            'total_ms': self.total_time * 1000,
+            'mean_ms': (self.total_time / self.calls) * 1000 if self.calls else 0.0,
+            'p50_ms': _percentile(ordered, 0.50) * 1000,
+            'p95_ms': _percentile(ordered, 0.95) * 1000,
+            'max_ms': self.max_time * 1000,
+        }
+
+
+class QueryStats:
+    """Per-statement latency instrumentation with a slow-query log
+
+    Latency percentiles are computed over the most recent ``max_samples``
+    calls of each fingerprint; call counts, row counts and the maximum are
+    exact since the last reset.
+    """
+
+    def __init__(self, slow_query_threshold: float = 0.2, log_path: Optional[str] = None,
+                 log_max_bytes: int = 1024 * 1024, log_backups: int = 3,
+                 max_samples: int = 1000):
+        self.enabled = True
+        self.slow_query_threshold = slow_query_threshold  # Seconds; None disables the log
+        self.log_path = log_path or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs', 'slow_queries.log')
+        self.log_max_bytes = log_max_bytes
+        self.log_backups = log_backups
+        self.max_samples = max_samples
+
+        self._statements: Dict[str, _StatementStats] = {}
+        self._lock = threading.Lock()
+        self._logger = None
+
+    def record(self, query: str, elapsed: float, rows: int = 0, error: bool = False):
+        """Record one execution of ``query`` that took ``elapsed`` seconds"""
+        if not self.enabled:
+            return
+
+        key = fingerprint(query)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = _StatementStats(self.max_samples)
+            stats.calls += 1
+            stats.rows += max(rows or 0, 0)
+            stats.total_time += elapsed
+            stats.samples.append(elapsed)
+            if elapsed > stats.max_time:
+                stats.max_time = elapsed
+            if error:
+                stats.errors += 1
+
+        if self.slow_query_threshold is not None and elapsed >= self.slow_query_threshold:
+            self._log_slow_query(key, elapsed, rows)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return per-fingerprint statistics, most expensive statements first"""
+        with self._lock:
+            items = [(key, stats.to_dict()) for key, stats in self._statements.items()]
+        items.sort(key=lambda item: item[1]['total_ms'], reverse=True)
+        return dict(items)
+
+    def reset(self):
+        """Forget all recorded statistics"""
+        with self._lock:
+            self._statements.clear()
+
+    def _log_slow_query(self, key: str, elapsed: float, rows: int):
+        """Append a slow statement to the rotating log file"""
+        try:
+            if self._logger is None:
+                self._logger = self._create_logger()
+            self._logger.warning("%.1f ms rows=%s %s", elapsed * 1000, rows, key)
+        except OSError as e:
+            print(f"Error writing slow query log: {e}")
+            self.slow_query_threshold = None
+
+    def _create_logger(self) -> logging.Logger:
+        """Create the slow-query logger with a rotating file handler"""
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        logger = logging.getLogger('finance_tracker.slow_queries')
+        logger.setLevel(logging.WARNING)
+        logger.propagate = False
+        if not logger.handlers:
+            handler = RotatingFileHandler(self.log_path, maxBytes=self.log_max_bytes,
+                                          backupCount=self.log_backups, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            logger.addHandler(handler)
+        return logger
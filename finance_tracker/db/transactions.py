@@ -0,0 +1,76 @@
+from typing import List, Optional, Tuple
+
+from db.connection import db
+from utils.money import Money, cents_sql
+
+# Newest-first listing of one user's transactions.  The ORDER BY matches
+# idx_transaction_user_recent in setup.sql, so MySQL walks the index backwards
+# and stops after LIMIT rows instead of sorting the user's whole history.
+_PAGE_QUERY = """
+    SELECT t.description, """ + cents_sql('t.amount') + """, t.type, t.date, c.category_name, t.transaction_id
+    FROM transaction t
+    LEFT JOIN category c ON t.category_id = c.category_id
+    WHERE t.user_id = %s{after}
+    ORDER BY t.date DESC, t.transaction_id DESC
+    LIMIT %s
+"""
+
+# Keyset predicate: strictly older than the last row of the previous page.
+# The leading "date <= %s" bounds the index range in MySQL and SQLite alike;
+# the OR only has to filter rows sharing the boundary date.
+_AFTER = " AND t.date <= %s AND (t.date < %s OR t.transaction_id < %s)"
+
+PageKey = Tuple[object, int]
+
+
+def page_query(after: bool = False) -> str:
+    """SQL for one page of transactions, optionally continuing after a page key"""
+    return _PAGE_QUERY.format(after=_AFTER if after else "")
+
+
+def page_params(user_id: int, limit: int, after: Optional[PageKey] = None) -> tuple:
+    """Parameters for ``page_query(after is not None)``
+
+    One extra row is requested so the page knows whether another follows.
+    """
+    if after is None:
+        return (user_id, limit + 1)
+    date, transaction_id = after
+    return (user_id, date, date, transaction_id, limit + 1)
+
+
+class TransactionPage:
+    """One page of transactions plus the key to fetch the next one"""
+
+    def __init__(self, rows: List[tuple], next_after: Optional[PageKey]):
+        # (description, amount as Money, type, date, category_name) tuples, newest first
+        self.rows = rows
+        self.next_after = next_after
+
+    @classmethod
+    def from_rows(cls, rows, limit: int) -> "TransactionPage":
+        """Build a page from the ``limit + 1`` rows returned by ``page_query``"""
+        rows = list(rows or [])
+        page = rows[:limit]
+        next_after = None
+        if len(rows) > limit and page:
+            last = page[-1]
+            next_after = (last[3], last[5])
+        return cls([(row[0], Money(row[1])) + tuple(row[2:5]) for row in page], next_after)
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_after is not None
+
+
+def fetch_transactions_page(user_id: int, limit: int = 10,
+                            after: Optional[PageKey] = None) -> Optional[TransactionPage]:
+    """A user's transactions newest first, starting after ``after`` (date, id)
+
+    Each page costs the same regardless of how far back it is, unlike
+    LIMIT/OFFSET.  Returns None if the query failed.
+    """
+    result = db.execute_query(page_query(after is not None), page_params(user_id, limit, after))
+    if result is None:
+        return None
+    return TransactionPage.from_rows(result, limit)
@@ -10,6 +10,7 @@ This script demonstrates the application features by:
 Run this after setting up the database to see the application in action.
 """
 
+import argparse
 import sys
 import os
 from datetime import datetime, timedelta
@@ -19,7 +20,11 @@ import random
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from db.connection import db
-from utils.helpers import format_currency
+from db.categories import category_registry
+from utils.helpers import format_currency, month_range
+from utils.money import Money, cents_sql
+
+TRANSACTION_COLUMNS = ('user_id', 'category_id', 'type', 'amount', 'date', 'description')
 
 def create_demo_user():
     """Create a demo user account"""
@@ -53,9 +58,7 @@ def create_demo_transactions(user_id):
     print("Creating demo transactions...")
     
     # Get category IDs
-    categories_query = "SELECT category_id, category_name FROM category"
-    categories_result = db.execute_query(categories_query)
-    categories = {row[1]: row[0] for row in categories_result}
+    categories = {name: category_id for category_id, name in category_registry.items()}
     
     # Sample transactions
     transactions = [
@@ -79,17 +82,12 @@ def create_demo_transactions(user_id):
     # Generate transactions for the last 3 months
     base_date = datetime.now() - timedelta(days=90)
     
+    rows = []
     for i, (category_name, transaction_type, amount, description) in enumerate(transactions):
         if category_name in categories:
             # Spread transactions over the last 3 months
             transaction_date = base_date + timedelta(days=random.randint(0, 90))
-            
-            insert_query = """
-                INSERT INTO transaction (user_id, category_id, type, amount, date, description)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            
-            db.execute_query(insert_query, (
+            rows.append((
                 user_id, 
                 categories[category_name], 
                 transaction_type, 
@@ -98,7 +96,33 @@ def create_demo_transactions(user_id):
                 description
             ))
     
-    print("✓ Demo transactions created")
+    result = db.bulk_insert('transaction', TRANSACTION_COLUMNS, rows)
+    if result:
+        print("✓ Demo transactions created")
+    else:
+        print(f"✗ Failed to create demo transactions: {result.errors}")
+
+def generate_transactions(user_id, count):
+    """Bulk-load ``count`` random transactions spread over the last two years"""
+    print(f"Generating {count:,} random transactions...")
+    
+    income_categories = {'Salary', 'Freelance', 'Investment', 'Gift'}
+    categories = [(category_id, 'Income' if name in income_categories else 'Expense')
+                  for category_id, name in category_registry.items()]
+    today = datetime.now().date()
+    
+    def rows():
+        for i in range(count):
+            category_id, transaction_type = random.choice(categories)
+            amount = Money(random.randint(500, 200000 if transaction_type == 'Income' else 30000))
+            yield (user_id, category_id, transaction_type, amount.to_decimal(),
+                   today - timedelta(days=random.randint(0, 730)), f"Generated #{i + 1}")
+    
+    result = db.bulk_insert('transaction', TRANSACTION_COLUMNS, rows(), chunk_size=2000)
+    rate = result.inserted / result.elapsed if result.elapsed else 0
+    print(f"✓ Inserted {result.inserted:,} transactions in {result.elapsed:.1f}s ({rate:,.0f} rows/s)")
+    for error in result.errors:
+        print(f"✗ {error}")
 
 def create_demo_budget(user_id):
     """Create a demo budget"""
@@ -129,31 +153,32 @@ def show_demo_summary(user_id):
     
     # Get current month
     current_month = datetime.now().strftime('%Y-%m')
+    month_start, month_end = month_range(current_month)
     
     # Total income
-    income_query = """
-        SELECT COALESCE(SUM(amount), 0) as total_income
+    income_query = f"""
+        SELECT {cents_sql('COALESCE(SUM(amount), 0)')} as total_income
         FROM transaction 
         WHERE user_id = %s AND type = 'Income' 
-        AND DATE_FORMAT(date, '%%Y-%%m') = %s
+        AND date >= %s AND date < %s
     """
-    income_result = db.execute_query(income_query, (user_id, current_month))
-    total_income = income_result[0][0] if income_result else 0
+    income_result = db.execute_query(income_query, (user_id, month_start, month_end))
+    total_income = Money(income_result[0][0]) if income_result else Money(0)
     
     # Total expenses
-    expense_query = """
-        SELECT COALESCE(SUM(amount), 0) as total_expense
+    expense_query = f"""
+        SELECT {cents_sql('COALESCE(SUM(amount), 0)')} as total_expense
         FROM transaction 
         WHERE user_id = %s AND type = 'Expense' 
-        AND DATE_FORMAT(date, '%%Y-%%m') = %s
+        AND date >= %s AND date < %s
     """
-    expense_result = db.execute_query(expense_query, (user_id, current_month))
-    total_expense = expense_result[0][0] if expense_result else 0
+    expense_result = db.execute_query(expense_query, (user_id, month_start, month_end))
+    total_expense = Money(expense_result[0][0]) if expense_result else Money(0)
     
     # Budget info
-    budget_query = "SELECT limit_amount FROM budget WHERE user_id = %s AND month = %s"
+    budget_query = f"SELECT {cents_sql('limit_amount')} FROM budget WHERE user_id = %s AND month = %s"
     budget_result = db.execute_query(budget_query, (user_id, current_month))
-    budget_limit = budget_result[0][0] if budget_result else 0
+    budget_limit = Money(budget_result[0][0]) if budget_result else Money(0)
     
     print(f"Current Month: {current_month}")
     print(f"Total Income: {format_currency(total_income)}")
@@ -176,6 +201,11 @@ def show_demo_summary(user_id):
 
 def main():
     """Main demo setup process"""
+    parser = argparse.ArgumentParser(description="Load demo data into the finance tracker")
+    parser.add_argument('--transactions', type=int, default=0, metavar='N',
+                        help="also bulk-load N random transactions (e.g. 1000000)")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Personal Finance Tracker - Demo Setup")
     print("=" * 60)
@@ -189,6 +219,8 @@ def main():
         
         # Create demo transactions
         create_demo_transactions(user_id)
+        if args.transactions > 0:
+            generate_transactions(user_id, args.transactions)
         
         # Create demo budget
         create_demo_budget(user_id)
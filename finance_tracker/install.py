@@ -28,18 +28,17 @@ def install_requirements():
         return False
 
 def check_mysql_connection():
-    """Check if MySQL is available"""
-    print("Checking MySQL connection...")
+    """Check if the configured database (MySQL or SQLite) is available"""
+    print("Checking database connection...")
     try:
-        import mysql.connector
         from db.connection import db
         
         connection = db.get_connection()
         if connection:
-            print("✓ MySQL connection successful")
+            print(f"✓ {db.get_backend().display_name} connection successful")
             return True
         else:
-            print("✗ MySQL connection failed")
+            print("✗ Database connection failed")
             return False
     except ImportError:
         print("✗ mysql-connector-python not installed")
@@ -49,28 +48,17 @@ def check_mysql_connection():
         return False
 
 def setup_database():
-    """Setup database schema"""
+    """Setup database schema by applying any pending migrations"""
     print("Setting up database schema...")
     try:
-        from db.connection import db
+        from db.migrations import migrate
         
-        # Read and execute setup.sql
-        setup_sql_path = Path("db/setup.sql")
-        if setup_sql_path.exists():
-            with open(setup_sql_path, 'r') as f:
-                sql_script = f.read()
-            
-            # Split script into individual statements
-            statements = [stmt.strip() for stmt in sql_script.split(';') if stmt.strip()]
-            
-            for statement in statements:
-                if statement:
-                    db.execute_query(statement)
-            
+        # Records each applied version, so running the installer again is safe
+        if migrate(on_start=lambda m: print(f"  Applying migration {m.version}: {m.name}")):
             print("✓ Database schema created successfully")
             return True
         else:
-            print("✗ setup.sql file not found")
+            print("✗ Some migrations failed (see errors above)")
             return False
     except Exception as e:
         print(f"✗ Database setup failed: {e}")
@@ -100,6 +88,8 @@ def main():
         print("2. Create database 'finance_tracker'")
         print("3. Update credentials in db/connection.py")
         print("4. Run this script again")
+        print("\nOr run without a server using the embedded SQLite backend:")
+        print("FINANCE_TRACKER_DB=sqlite python install.py")
         return False
     
     # Step 3: Setup database
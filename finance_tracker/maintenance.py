@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Maintenance commands for Personal Finance Tracker
+
+    python maintenance.py migrate            Apply pending schema migrations, resuming
+                                             an interrupted backfill [--to VERSION]
+                                             [--status]
+    python maintenance.py schema             Re-run db/setup.sql (safe to repeat)
+    python maintenance.py rebuild-summary    Recompute the monthly_summary rollup in one
+                                             transaction, to repair it
+                                             [--user USER_ID]
+    python maintenance.py partition          Convert transaction to yearly partitions
+                                             (MySQL; drops its foreign keys and the
+                                             FULLTEXT search index)
+    python maintenance.py add-partition      Pre-create next year's partition
+                                             [--year YEAR]
+    python maintenance.py archive --before YEAR
+                                             Move older yearly partitions into
+                                             compressed transaction_archive_<year>
+                                             tables [--no-compress]
+
+Run these from the finance_tracker directory. FINANCE_TRACKER_DB selects the
+database backend as usual.
+"""
+
+import argparse
+import sys
+import os
+
+# Add the current directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db.connection import db
+
+def apply_schema(args):
+    """Create any missing tables, indexes and triggers"""
+    print("Applying db/setup.sql...")
+    if db.initialize_schema():
+        print("✓ Schema is up to date")
+        return True
+    print("✗ Some statements failed (see errors above)")
+    return False
+
+def run_migrations(args):
+    """Apply pending migrations, or list them with --status"""
+    from db.migrations import migrate, pending_migrations
+
+    pending = pending_migrations()
+    if pending is None:
+        print("✗ Could not read schema_migrations")
+        return False
+    if args.status:
+        if not pending:
+            print("✓ Schema is up to date")
+        for migration in pending:
+            print(f"  pending {migration.version}: {migration.name}")
+        return True
+
+    def report(migration, rows, key):
+        print(f"\r  {rows} rows backfilled (up to key {key})", end='', flush=True)
+
+    if not migrate(args.to,
+                   on_start=lambda m: print(f"Applying migration {m.version}: {m.name}"),
+                   on_progress=report):
+        print("\n✗ Migration failed; run it again to resume")
+        return False
+    print("✓ Schema is up to date")
+    return True
+
+def rebuild_summary(args):
+    """Recompute monthly_summary from the transaction table"""
+    from db.rollup import rebuild_monthly_summary
+
+    scope = f"user {args.user}" if args.user is not None else "all users"
+    print(f"Rebuilding monthly summary for {scope}...")
+    rows = rebuild_monthly_summary(args.user)
+    if rows is None:
+        print("✗ Rebuild failed")
+        return False
+    print(f"✓ Wrote {rows} summary rows")
+    return True
+
+def require_partitioning():
+    """Report and return False when the backend cannot partition tables"""
+    from db.partitions import is_supported
+
+    if is_supported():
+        return True
+    print(f"✗ Partitioning is not available on {db.get_backend().display_name}")
+    return False
+
+def partition_table(args):
+    """Switch the transaction table to yearly RANGE partitions"""
+    from db.partitions import partition_transactions
+
+    if not require_partitioning():
+        return False
+    print("Partitioning transaction by year (this rebuilds the table)...")
+    if not partition_transactions(args.through):
+        print("✗ Partitioning failed")
+        return False
+    print("✓ Transaction table is partitioned by year")
+    return True
+
+def add_partition(args):
+    """Split upcoming years out of the catch-all partition"""
+    from db.partitions import add_year_partitions
+
+    if not require_partitioning():
+        return False
+    created = add_year_partitions(args.year)
+    if created is None:
+        print("✗ Could not add partitions")
+        return False
+    if created:
+        print(f"✓ Created {', '.join(created)}")
+    else:
+        print("✓ Partitions already exist")
+    return True
+
+def archive(args):
+    """Move yearly partitions before --before into archive tables"""
+    from db.partitions import archive_partitions
+
+    if not require_partitioning():
+        return False
+    print(f"Archiving transactions dated before {args.before}...")
+    tables = archive_partitions(args.before, compress=not args.no_compress)
+    if tables is None:
+        print("✗ Archive failed")
+        return False
+    if tables:
+        print(f"✓ Archived into {', '.join(tables)}")
+    else:
+        print("✓ Nothing to archive")
+    return True
+
+def main():
+    """Parse the command line and run one maintenance command"""
+    parser = argparse.ArgumentParser(description="Personal Finance Tracker maintenance")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    migrate_parser = commands.add_parser('migrate', help="apply pending schema migrations")
+    migrate_parser.add_argument('--to', type=int, help="stop after this version")
+    migrate_parser.add_argument('--status', action='store_true', help="only list pending migrations")
+    migrate_parser.set_defaults(func=run_migrations)
+
+    schema_parser = commands.add_parser('schema', help="re-run db/setup.sql")
+    schema_parser.set_defaults(func=apply_schema)
+
+    rebuild_parser = commands.add_parser('rebuild-summary', help="rebuild the monthly_summary rollup")
+    rebuild_parser.add_argument('--user', type=int, help="only rebuild this user_id")
+    rebuild_parser.set_defaults(func=rebuild_summary)
+
+    partition_parser = commands.add_parser('partition', help="partition transaction by year")
+    partition_parser.add_argument('--through', type=int, help="last year to create (default: next year)")
+    partition_parser.set_defaults(func=partition_table)
+
+    add_parser = commands.add_parser('add-partition', help="pre-create next year's partition")
+    add_parser.add_argument('--year', type=int, help="create partitions up to this year")
+    add_parser.set_defaults(func=add_partition)
+
+    archive_parser = commands.add_parser('archive', help="move old yearly partitions into archive tables")
+    archive_parser.add_argument('--before', type=int, required=True, help="archive years before this one")
+    archive_parser.add_argument('--no-compress', action='store_true', help="keep the archive tables uncompressed")
+    archive_parser.set_defaults(func=archive)
+
+    args = parser.parse_args()
+    try:
+        if not db.get_connection():
+            print("✗ Database connection failed")
+            return False
+        return args.func(args)
+    finally:
+        db.close_connection()
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+# Tests import modules the way main.py does, from the finance_tracker directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.connection import db
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """The global ``db`` on a fresh SQLite file with every migration applied"""
+    backend_name, sqlite_path = db.backend_name, db.sqlite_path
+    db.use_backend('sqlite', str(tmp_path / 'finance_tracker.db'))
+    db.get_pool()
+    yield db
+    db.use_backend(backend_name, sqlite_path)
@@ -0,0 +1,207 @@
+import threading
+import time
+from concurrent.futures import wait
+
+import pytest
+
+import ui.async_bridge
+from ui.async_bridge import TkQueryBridge
+
+
+class FakeWidget:
+    """Just enough of a Tk widget for the bridge: after() callbacks run on demand"""
+
+    def __init__(self):
+        self.scheduled = {}
+        self.next_id = 0
+
+    def bind(self, sequence, func, add=None):
+        pass
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.scheduled[self.next_id] = func
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.scheduled.pop(after_id, None)
+
+    def run_pending(self):
+        """Run the callbacks scheduled so far, like one pass of the Tk event loop"""
+        scheduled, self.scheduled = self.scheduled, {}
+        for func in scheduled.values():
+            func()
+
+
+@pytest.fixture
+def errors(monkeypatch):
+    shown = []
+    monkeypatch.setattr(ui.async_bridge, 'show_error', shown.append)
+    return shown
+
+
+def wait_for(future):
+    wait([future], timeout=5)
+
+
+def test_delivers_results_on_the_polling_thread(errors):
+    widget = FakeWidget()
+    bridge = TkQueryBridge(widget)
+    results = []
+    wait_for(bridge.run('totals', lambda: 42, results.append))
+    widget.run_pending()
+    assert results == [42]
+    assert not bridge.is_pending('totals')
+    assert widget.scheduled == {}
+
+
+def test_newer_request_supersedes_older_one(errors):
+    widget = FakeWidget()
+    bridge = TkQueryBridge(widget)
+    release = threading.Event()
+    results = []
+    old = bridge.run('search', lambda: release.wait(5) and 'old', results.append)
+    new = bridge.run('search', lambda: 'new', results.append)
+    release.set()
+    wait_for(old)
+    wait_for(new)
+    widget.run_pending()
+    assert results == ['new']
+
+
+def test_failed_work_goes_to_on_error_or_show_error(errors):
+    widget = FakeWidget()
+    bridge = TkQueryBridge(widget)
+    failures = []
+
+    def fail():
+        raise RuntimeError("database gone")
+
+    wait_for(bridge.run('a', fail, lambda result: None, failures.append))
+    wait_for(bridge.run('b', fail, lambda result: None))
+    widget.run_pending()
+    assert [str(error) for error in failures] == ["database gone"]
+    assert errors == ["Error loading data: database gone"]
+
+
+def test_raising_callback_does_not_stop_other_requests(errors):
+    widget = FakeWidget()
+    bridge = TkQueryBridge(widget)
+    release = threading.Event()
+    results = []
+
+    def broken(result):
+        raise ValueError("bad row")
+
+    wait_for(bridge.run('first', lambda: 1, broken))
+    slow = bridge.run('second', lambda: release.wait(5) and 2, results.append)
+    widget.run_pending()
+    assert errors == ["Error displaying data: bad row"]
+
+    # Polling carries on for the request that was still running
+    assert widget.scheduled
+    release.set()
+    wait_for(slow)
+    widget.run_pending()
+    assert results == [2]
+
+
+def drain(widget, future):
+    """Poll until the stream's worker has finished and its queue is empty"""
+    for _ in range(1000):
+        widget.run_pending()
+        if future.done() and not widget.scheduled:
+            return
+        time.sleep(0.001)
+    raise AssertionError("stream did not finish")
+
+
+def test_stream_delivers_batches_in_order_then_done(errors):
+    widget = FakeWidget()
+    bridge = TkQueryBridge(widget)
+    batches = []
+    done = []
+    future = bridge.stream('rows', lambda: ([n, n + 1] for n in range(0, 20, 2)),
+                           batches.append, lambda: done.append(len(batches)))
+    drain(widget, future)
+    assert batches == [[n, n + 1] for n in range(0, 20, 2)]
+    assert done == [10]
+    assert not bridge.is_pending('rows')
+
+
+def test_stream_holds_back_the_worker_until_batches_are_taken(errors):
+    widget = FakeWidget()
+    bridge = TkQueryBridge(widget)
+    produced = []
+
+    def work():
+        for n in range(10):
+            produced.append(n)
+            yield [n]
+
+    batches = []
+    future = bridge.stream('rows', work, batches.append, lambda: None, max_batches=2)
+    time.sleep(0.2)
+    # Two queued, one more waiting to be queued
+    assert len(produced) <= 3
+    drain(widget, future)
+    assert batches == [[n] for n in range(10)]
+
+
+def test_stream_error_comes_after_the_batches_that_arrived(errors):
+    widget = FakeWidget()
+    bridge = TkQueryBridge(widget)
+    events = []
+
+    def work():
+        yield [1]
+        yield [2]
+        raise RuntimeError("connection lost")
+
+    future = bridge.stream('rows', work, events.append, lambda: events.append('done'),
+                           lambda error: events.append(str(error)))
+    drain(widget, future)
+    assert events == [[1], [2], "connection lost"]
+
+
+def test_cancelled_stream_stops_the_worker_and_closes_the_iterator(errors):
+    widget = FakeWidget()
+    bridge = TkQueryBridge(widget)
+    started = threading.Event()
+    closed = threading.Event()
+    events = []
+
+    def work():
+        try:
+            n = 0
+            while True:
+                n += 1
+                started.set()
+                yield [n]
+        finally:
+            closed.set()
+
+    future = bridge.stream('rows', work, events.append, lambda: events.append('done'),
+                           max_batches=1)
+    assert started.wait(5)
+    widget.run_pending()
+    bridge.cancel('rows')
+    assert closed.wait(5)
+    wait_for(future)
+    widget.run_pending()
+    assert 'done' not in events
+    assert not bridge.is_pending('rows')
+
+
+def test_raising_on_batch_cancels_the_stream(errors):
+    widget = FakeWidget()
+    bridge = TkQueryBridge(widget)
+
+    def broken(batch):
+        raise ValueError("bad row")
+
+    future = bridge.stream('rows', lambda: iter([[1], [2]]), broken, lambda: None)
+    wait([future], timeout=5)
+    widget.run_pending()
+    assert errors == ["Error displaying data: bad row"]
+    assert not bridge.is_pending('rows')
@@ -0,0 +1,85 @@
+from datetime import date
+from decimal import Decimal
+
+from db.backends import translate_to_sqlite
+from utils.money import cents_sql
+
+
+def test_placeholders_and_escapes_only_change_with_params():
+    query = "SELECT DATE_FORMAT(date, '%%Y-%%m') FROM budget WHERE user_id = %s"
+    assert translate_to_sqlite(query, True) == \
+        "SELECT strftime('%Y-%m', date) FROM budget WHERE user_id = ?"
+    assert translate_to_sqlite("SELECT '%%'", False) == "SELECT '%%'"
+
+
+def test_quotes_the_transaction_table_only():
+    sql = translate_to_sqlite(
+        "SELECT t.transaction_id, 'transaction' FROM transaction t JOIN `category` c", False)
+    assert sql == "SELECT t.transaction_id, 'transaction' FROM \"transaction\" t JOIN \"category\" c"
+
+
+def test_functions_and_upserts():
+    assert translate_to_sqlite("SELECT COALESCE(SUM(amount), 0) FROM budget", False) == \
+        "SELECT TOTAL(amount) FROM budget"
+    assert translate_to_sqlite("SELECT CAST(x AS SIGNED)", False) == "SELECT CAST(x AS INTEGER)"
+    assert translate_to_sqlite("INSERT IGNORE INTO category (category_name) VALUES (%s)", True) == \
+        "INSERT OR IGNORE INTO category (category_name) VALUES (?)"
+    assert translate_to_sqlite(
+        "INSERT INTO t (a, b) VALUES (%s, %s) ON DUPLICATE KEY UPDATE b = VALUES(b)", True) == \
+        "INSERT INTO t (a, b) VALUES (?, ?) ON CONFLICT DO UPDATE SET b = excluded.b"
+
+
+def test_schema_statements():
+    sql = translate_to_sqlite("""CREATE TABLE IF NOT EXISTS t (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        kind ENUM('Income', 'Expense') NOT NULL,
+        amount DECIMAL(10,2) NOT NULL,
+        name VARCHAR(50) NOT NULL,
+        UNIQUE KEY unique_name (name)
+    )""", False)
+    assert "id INTEGER PRIMARY KEY AUTOINCREMENT" in sql
+    assert "kind TEXT CHECK (kind IN ('Income', 'Expense'))" in sql
+    assert "amount REAL NOT NULL" in sql
+    assert "name VARCHAR(50) COLLATE NOCASE" in sql
+    assert "UNIQUE (name)" in sql
+    assert translate_to_sqlite("CREATE INDEX idx_a ON t(a)", False) == \
+        "CREATE INDEX IF NOT EXISTS idx_a ON t(a)"
+
+
+def test_trigger_body_is_wrapped():
+    sql = translate_to_sqlite("CREATE TRIGGER trg AFTER INSERT ON t\nFOR EACH ROW\n"
+                              "    DELETE FROM u WHERE id = NEW.id", False)
+    assert sql == "CREATE TRIGGER trg AFTER INSERT ON t\nFOR EACH ROW\nBEGIN\n" \
+                  "    DELETE FROM u WHERE id = NEW.id;\nEND"
+
+
+def test_mysql_only_statements_are_skipped():
+    assert translate_to_sqlite("CREATE DATABASE IF NOT EXISTS finance_tracker", False) is None
+    assert translate_to_sqlite("USE finance_tracker", False) is None
+    assert translate_to_sqlite("CREATE FULLTEXT INDEX i ON t(description)", False) is None
+
+
+def test_floats_come_back_unrounded(sqlite_db):
+    assert sqlite_db.execute_query("SELECT %s * 1.0", (0.123456,)) == [(0.123456,)]
+
+
+def test_money_round_trips_as_cents(sqlite_db):
+    sqlite_db.execute_query("INSERT INTO user (username, password) VALUES (%s, %s)", ('ann', 'x'))
+    insert = """
+        INSERT INTO transaction (user_id, category_id, type, amount, date, description)
+        VALUES (1, 1, 'Expense', %s, %s, 'coffee')
+    """
+    for amount in (Decimal('0.10'), Decimal('0.20'), Decimal('19.99')):
+        sqlite_db.execute_query(insert, (amount, date(2024, 3, 5)))
+
+    rows = sqlite_db.execute_query(f"SELECT {cents_sql('amount')} FROM transaction ORDER BY transaction_id")
+    assert rows == [(10,), (20,), (1999,)]
+    total = sqlite_db.execute_query(f"SELECT {cents_sql('COALESCE(SUM(amount), 0)')} FROM transaction")
+    assert total == [(2029,)]
+    assert isinstance(total[0][0], int)
+    assert sqlite_db.execute_query("SELECT date FROM transaction LIMIT 1") == [(date(2024, 3, 5),)]
+
+
+def test_varchar_compares_case_insensitively(sqlite_db):
+    assert sqlite_db.execute_query("SELECT category_id FROM category WHERE category_name = %s",
+                                   ('food',)) == [(1,)]
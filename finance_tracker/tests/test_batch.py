@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+
+USERS = "SELECT username FROM user WHERE user_id = %s"
+COUNT = "SELECT COUNT(*) FROM user"
+BROKEN = "SELECT no_such_column FROM user"
+
+
+@pytest.fixture
+def users(sqlite_db):
+    for name in ('ann', 'bob'):
+        sqlite_db.execute_query("INSERT INTO user (username, password) VALUES (%s, %s)", (name, 'x'))
+    return sqlite_db
+
+
+@pytest.fixture
+def sent(users, monkeypatch):
+    """Statement lists that reached the backend, one list per round trip"""
+    backend = users.get_backend()
+    original = backend.execute_multi
+    trips = []
+
+    def execute_multi(connection, statements):
+        trips.append([params for _, params in statements])
+        return original(connection, statements)
+
+    monkeypatch.setattr(backend, 'execute_multi', execute_multi)
+    return trips
+
+
+def test_results_come_back_in_order(users, sent):
+    results = users.execute_batch([(USERS, (2,)), (COUNT, None), (USERS, (1,))])
+    assert results == [[('bob',)], [(2,)], [('ann',)]]
+    assert len(sent) == 1
+
+
+def test_repeated_statements_are_sent_once(users, sent):
+    results = users.execute_batch([(USERS, (1,)), (USERS, [1]), (USERS, (2,)), (USERS, (1,))])
+    assert results == [[('ann',)], [('ann',)], [('bob',)], [('ann',)]]
+    assert sent == [[(1,), (2,)]]
+    # Each caller gets its own list
+    results[0].append('changed')
+    assert results[1] == [('ann',)]
+
+
+def test_cached_members_are_not_sent(users, sent):
+    assert users.execute_query(USERS, (1,)) == [('ann',)]
+    results = users.execute_batch([(USERS, (1,)), (COUNT, None)])
+    assert results == [[('ann',)], [(2,)]]
+    assert sent == [[None]]
+
+    # Everything is cached now: no round trip at all
+    assert users.execute_batch([(COUNT, None), (USERS, (1,))]) == [[(2,)], [('ann',)]]
+    assert len(sent) == 1
+
+
+def test_cache_false_sends_everything(users, sent):
+    users.execute_query(USERS, (1,))
+    users.execute_batch([(USERS, (1,))], cache=False)
+    assert sent == [[(1,)]]
+
+
+def test_failing_statement_fails_the_batch_without_caching_the_rest(users, sent):
+    assert users.execute_batch([(USERS, (1,)), (BROKEN, None)]) is None
+    assert users.result_cache.get(USERS, (1,)) is None
+
+    # The good statement still runs, and later answers stay correct
+    users.execute_query("UPDATE user SET username = %s WHERE user_id = %s", ('anne', 1))
+    assert users.execute_batch([(USERS, (1,))]) == [[('anne',)]]
+
+
+def test_lost_connection_is_retried_once(users, monkeypatch):
+    backend = users.get_backend()
+    original = backend.execute_multi
+    calls = []
+
+    def execute_multi(connection, statements):
+        calls.append(1)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("server has gone away")
+        return original(connection, statements)
+
+    monkeypatch.setattr(backend, 'execute_multi', execute_multi)
+    monkeypatch.setattr(backend, 'is_connection_lost', lambda error: True)
+    assert users.execute_batch([(COUNT, None)]) == [[(2,)]]
+    assert len(calls) == 2
+    assert users.lost_connection_retries == 1
+
+
+def test_only_selects_are_accepted(users):
+    with pytest.raises(ValueError):
+        users.execute_batch([(COUNT, None), ("DELETE FROM user", None)])
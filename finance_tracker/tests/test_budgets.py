@@ -0,0 +1,89 @@
+from datetime import date
+
+import pytest
+
+from db.budgets import budget_status, clear_category_budget, set_category_budget
+from utils.money import Money, cents_sql
+
+COLUMNS = ('user_id', 'category_id', 'type', 'amount', 'date', 'description')
+MARCH = date(2024, 3, 1)
+
+# Default categories from setup.sql
+FOOD, TRANSPORTATION, ENTERTAINMENT = 1, 2, 3
+
+ROLLUP_SPENT = f"""
+    SELECT {cents_sql('total')} FROM monthly_summary
+    WHERE user_id = %s AND month = %s AND type = 'Expense' AND category_id = %s
+"""
+
+
+@pytest.fixture
+def spending(sqlite_db):
+    for name in ('ann', 'bob'):
+        sqlite_db.execute_query("INSERT INTO user (username, password) VALUES (%s, %s)", (name, 'x'))
+    rows = [(1, FOOD, 'Expense', '12.50', date(2024, 3, 2), "groceries"),
+            (1, FOOD, 'Expense', '7.25', date(2024, 3, 30), "lunch"),
+            (1, FOOD, 'Income', '99.00', date(2024, 3, 5), "refund"),
+            (1, FOOD, 'Expense', '50.00', date(2024, 2, 28), "last month"),
+            (1, TRANSPORTATION, 'Expense', '3.10', date(2024, 3, 9), "bus"),
+            (2, FOOD, 'Expense', '1000.00', date(2024, 3, 9), "someone else")]
+    assert sqlite_db.bulk_insert('transaction', COLUMNS, rows).ok
+    return sqlite_db
+
+
+def by_category(status):
+    return {budget.category_id: budget for budget in status}
+
+
+def test_spent_matches_the_rollup(spending):
+    assert set_category_budget(1, FOOD, MARCH, Money(2500))
+    food = by_category(budget_status(1, MARCH))[FOOD]
+
+    (rollup,), = spending.execute_query(ROLLUP_SPENT, (1, MARCH, FOOD))
+    assert food.spent == Money(rollup) == Money(1975)
+    assert food.category_name == 'Food'
+    assert food.limit == Money(2500)
+    assert food.remaining == Money(525)
+    assert not food.over_budget
+    assert food.usage == pytest.approx(79.0)
+
+
+def test_spending_without_a_limit_is_listed(spending):
+    transport = by_category(budget_status(1, MARCH))[TRANSPORTATION]
+    assert transport.spent == Money(310)
+    assert transport.limit is None
+    assert transport.remaining is None and transport.usage is None
+
+
+def test_limit_without_spending_counts_as_zero(spending):
+    assert set_category_budget(1, ENTERTAINMENT, MARCH, Money(4000))
+    status = by_category(budget_status(1, MARCH))
+    entertainment = status[ENTERTAINMENT]
+    assert entertainment.spent == Money(0)
+    assert entertainment.remaining == Money(4000)
+    assert entertainment.usage == 0
+    # Categories with neither are left out
+    assert set(status) == {FOOD, TRANSPORTATION, ENTERTAINMENT}
+
+
+def test_setting_a_limit_again_replaces_it(spending):
+    assert set_category_budget(1, FOOD, MARCH, Money(2500))
+    assert set_category_budget(1, FOOD, MARCH, Money(1500))
+    assert spending.execute_query(
+        "SELECT COUNT(*) FROM category_budget WHERE user_id = %s AND category_id = %s", (1, FOOD)) == [(1,)]
+    food = by_category(budget_status(1, MARCH))[FOOD]
+    assert food.limit == Money(1500)
+    assert food.over_budget
+
+
+def test_clearing_a_limit(spending):
+    assert set_category_budget(1, ENTERTAINMENT, MARCH, Money(4000))
+    assert clear_category_budget(1, ENTERTAINMENT, MARCH)
+    assert ENTERTAINMENT not in by_category(budget_status(1, MARCH))
+
+
+def test_other_months_and_users_are_separate(spending):
+    assert set_category_budget(2, FOOD, MARCH, Money(100))
+    assert by_category(budget_status(1, MARCH))[FOOD].limit is None
+    assert by_category(budget_status(1, date(2024, 2, 1)))[FOOD].spent == Money(5000)
+    assert budget_status(1, date(2024, 4, 1)) == []
@@ -0,0 +1,73 @@
+import pytest
+
+from db.bulk import build_insert, chunked
+
+COLUMNS = ('user_id', 'category_id', 'type', 'amount', 'date', 'description')
+
+
+def rows(count, bad=()):
+    """Transaction rows for user 1; indexes in ``bad`` get an invalid type"""
+    for index in range(count):
+        kind = 'Bogus' if index in bad else 'Expense'
+        yield (1, 1, kind, '1.00', '2024-01-01', f"row {index}")
+
+
+@pytest.fixture
+def user(sqlite_db):
+    sqlite_db.execute_query("INSERT INTO user (username, password) VALUES (%s, %s)", ('ann', 'x'))
+    return sqlite_db
+
+
+def count(database):
+    return database.execute_query("SELECT COUNT(*) FROM transaction", cache=False)[0][0]
+
+
+def test_build_insert():
+    assert build_insert('t', ('a', 'b'), 2) == "INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)"
+    with pytest.raises(ValueError):
+        build_insert('t; DROP TABLE user', ('a',), 1)
+
+
+def test_chunked_does_not_need_a_list():
+    assert list(chunked(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+
+def test_inserts_every_chunk(user):
+    result = user.bulk_insert('transaction', COLUMNS, rows(25), chunk_size=10)
+    assert result.ok
+    assert (result.inserted, result.chunks, result.failed) == (25, 3, 0)
+    assert count(user) == 25
+
+
+def test_failed_chunk_is_rolled_back_and_reported(user):
+    result = user.bulk_insert('transaction', COLUMNS, rows(25, bad={13}), chunk_size=10)
+    assert not result.ok
+    assert (result.inserted, result.chunks, result.failed) == (15, 3, 10)
+    [error] = result.errors
+    assert (error.index, error.offset, error.size) == (1, 10, 10)
+    assert 'CHECK' in error.message
+    # Rows 10-19 were rolled back together; the chunks around them are in
+    assert count(user) == 15
+    described = user.execute_query("SELECT description FROM transaction", cache=False)
+    assert ('row 13',) not in described and ('row 20',) in described
+
+
+def test_stop_on_error_skips_later_chunks(user):
+    result = user.bulk_insert('transaction', COLUMNS, rows(25, bad={3}), chunk_size=10,
+                              stop_on_error=True)
+    assert (result.inserted, result.chunks, result.failed) == (0, 1, 10)
+    assert count(user) == 0
+
+
+def test_chunk_size_respects_the_parameter_limit(user, monkeypatch):
+    monkeypatch.setattr(user.get_backend(), 'max_params', 12)
+    result = user.bulk_insert('transaction', COLUMNS, rows(5), chunk_size=1000)
+    assert (result.inserted, result.chunks) == (5, 3)
+
+
+def test_invalidates_cached_reads_for_the_users_written(user):
+    query = "SELECT COUNT(*) FROM transaction WHERE user_id = %s"
+    assert user.execute_query(query, (1,)) == [(0,)]
+    user.bulk_insert('transaction', COLUMNS, rows(3))
+    assert user.execute_query(query, (1,)) == [(3,)]
@@ -0,0 +1,108 @@
+from db.cache import ResultCache, referenced_tables, user_ids
+
+TOTALS = "SELECT SUM(total) FROM monthly_summary WHERE user_id = %s"
+CATEGORIES = "SELECT category_name FROM category"
+
+
+def cached(cache, query, params, result):
+    cache.put(query, params, result, cache.generation)
+
+
+def test_referenced_tables():
+    assert referenced_tables("SELECT * FROM transaction t JOIN `category` c ON 1 = 1") == \
+        {'transaction', 'category'}
+    assert referenced_tables("INSERT INTO budget (user_id) VALUES (%s)") == {'budget'}
+    assert referenced_tables("UPDATE budget SET limit_amount = %s") == {'budget'}
+
+
+def test_user_ids_from_where_clause():
+    query = "SELECT * FROM transaction t WHERE t.date >= %s AND t.user_id = %s"
+    assert user_ids(query, ('2024-01-01', 7)) == {'7'}
+    # A %% escape is not a placeholder
+    query = "SELECT DATE_FORMAT(date, '%%Y') FROM transaction WHERE user_id = %s"
+    assert user_ids(query, (3,)) == {'3'}
+    assert user_ids("SELECT * FROM category", ()) is None
+    assert user_ids(TOTALS, None) is None
+
+
+def test_user_ids_from_multi_row_insert():
+    query = "INSERT INTO transaction (category_id, user_id, amount) VALUES (%s, %s, %s), (%s, %s, %s)"
+    assert user_ids(query, (1, 10, 5, 2, 11, 6)) == {'10', '11'}
+
+
+def test_user_ids_unknown_when_not_bound_per_row():
+    assert user_ids("INSERT INTO transaction (user_id, amount) VALUES (1, %s)", (5,)) is None
+    assert user_ids("INSERT INTO category (category_name) VALUES (%s)", ('Food',)) is None
+
+
+def test_hit_returns_a_copy():
+    cache = ResultCache()
+    cached(cache, TOTALS, (1,), [(100,)])
+    rows = cache.get(TOTALS, (1,))
+    rows.append((0,))
+    assert cache.get("SELECT  SUM(total)\n FROM monthly_summary WHERE user_id = %s", (1,)) == [(100,)]
+    assert cache.stats()['hits'] == 2
+
+
+def test_write_invalidates_only_that_users_rows():
+    cache = ResultCache()
+    cached(cache, TOTALS, (1,), [(100,)])
+    cached(cache, TOTALS, (2,), [(200,)])
+    cached(cache, CATEGORIES, None, [('Food',)])
+
+    cache.invalidate_write("INSERT INTO transaction (user_id, amount) VALUES (%s, %s)", [(1, 5)])
+    # transaction cascades to monthly_summary, for user 1 only
+    assert cache.get(TOTALS, (1,)) is None
+    assert cache.get(TOTALS, (2,)) == [(200,)]
+    assert cache.get(CATEGORIES, None) == [('Food',)]
+
+
+def test_write_for_unknown_users_invalidates_every_user():
+    cache = ResultCache()
+    cached(cache, TOTALS, (1,), [(100,)])
+    cached(cache, TOTALS, (2,), [(200,)])
+    cache.invalidate_write("DELETE FROM transaction WHERE date < %s", [('2020-01-01',)])
+    assert cache.get(TOTALS, (1,)) is None
+    assert cache.get(TOTALS, (2,)) is None
+
+
+def test_ddl_clears_everything():
+    cache = ResultCache()
+    cached(cache, CATEGORIES, None, [('Food',)])
+    cache.invalidate_write("ALTER TABLE user ADD COLUMN email VARCHAR(100)")
+    assert cache.stats()['entries'] == 0
+
+
+def test_result_read_during_a_write_is_not_stored():
+    cache = ResultCache()
+    generation = cache.generation
+    cache.invalidate(['monthly_summary'])
+    cache.put(TOTALS, (1,), [(100,)], generation)
+    assert cache.get(TOTALS, (1,)) is None
+
+
+def test_lru_eviction_and_ttl():
+    cache = ResultCache(max_entries=2)
+    for user in (1, 2, 3):
+        cached(cache, TOTALS, (user,), [(user,)])
+    assert cache.get(TOTALS, (1,)) is None
+    assert cache.stats()['evictions'] == 1
+
+    expired = ResultCache(ttl=-1)
+    cached(expired, TOTALS, (1,), [(1,)])
+    assert expired.get(TOTALS, (1,)) is None
+
+
+def test_execute_query_serves_and_invalidates(sqlite_db):
+    sqlite_db.execute_query("INSERT INTO user (username, password) VALUES (%s, %s)", ('ann', 'x'))
+    count = "SELECT COUNT(*) FROM transaction WHERE user_id = %s"
+    assert sqlite_db.execute_query(count, (1,)) == [(0,)]
+    hits = sqlite_db.cache_stats()['hits']
+    assert sqlite_db.execute_query(count, (1,)) == [(0,)]
+    assert sqlite_db.cache_stats()['hits'] == hits + 1
+
+    sqlite_db.execute_query("""
+        INSERT INTO transaction (user_id, category_id, type, amount, date)
+        VALUES (%s, 1, 'Expense', 5, '2024-01-02')
+    """, (1,))
+    assert sqlite_db.execute_query(count, (1,)) == [(1,)]
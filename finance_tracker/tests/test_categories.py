@@ -0,0 +1,56 @@
+import pytest
+
+from db.categories import CategoryRegistry
+
+ADD = "INSERT INTO category (category_name) VALUES (%s)"
+
+
+@pytest.fixture
+def registry(sqlite_db):
+    return CategoryRegistry()
+
+
+def test_loads_once(registry):
+    food = registry.id_for('Food')
+    assert registry.name_for(food) == 'Food'
+    assert 'Travel' in registry.names()
+    assert registry.loads == 1
+
+
+def test_lookup_ignores_case(registry):
+    food = registry.id_for('Food')
+    assert registry.id_for('FOOD') == registry.id_for('food') == food
+    assert registry.loads == 1
+
+
+def test_category_added_elsewhere_is_found_by_reloading(registry, sqlite_db):
+    registry.names()
+    # Written behind the registry's back, as another process would
+    assert sqlite_db.execute_query(ADD, ('Pets',))
+
+    pets = registry.id_for('pets')
+    assert pets is not None
+    assert registry.loads == 2
+    assert registry.name_for(pets) == 'Pets'
+    assert 'Pets' in registry.names()
+    assert registry.loads == 2
+
+
+def test_new_id_is_found_by_reloading(registry, sqlite_db):
+    registry.names()
+    assert sqlite_db.execute_query(ADD, ('Pets',))
+    (pets,), = sqlite_db.execute_query("SELECT category_id FROM category WHERE category_name = %s", ('Pets',))
+    assert registry.name_for(pets) == 'Pets'
+    assert registry.loads == 2
+
+
+def test_unknown_name(registry):
+    assert registry.id_for('Nothing') is None
+    assert registry.loads == 2
+
+
+def test_add_reuses_an_existing_category(registry):
+    food = registry.id_for('Food')
+    assert registry.add('food') == food
+    pets = registry.add('Pets')
+    assert registry.id_for('PETS') == pets
@@ -0,0 +1,79 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from db.columnar import ColumnBuilder, infer_dtype, resolve_dtype, to_array
+
+COLUMNS = ('user_id', 'category_id', 'type', 'amount', 'date', 'description')
+
+
+def test_cents_from_decimals_and_floats_round_to_whole_cents():
+    array = to_array([Decimal('19.99'), Decimal('0.10'), 1234.56, 0.29], 'cents')
+    assert array.dtype == np.int64
+    assert array.tolist() == [1999, 10, 123456, 29]
+
+
+def test_cents_already_selected_as_integers_are_kept():
+    array = to_array([1999, 5, -250], 'cents')
+    assert array.dtype == np.int64
+    assert array.tolist() == [1999, 5, -250]
+
+
+def test_dates_and_nulls():
+    array = to_array([date(2024, 1, 31), None, '2024-02-29'], resolve_dtype('date'))
+    assert array.dtype == np.dtype('datetime64[D]')
+    assert str(array[0]) == '2024-01-31'
+    assert np.isnat(array[1])
+    assert str(array[2]) == '2024-02-29'
+
+
+def test_inferred_dtypes():
+    assert infer_dtype([1, 2]) == np.dtype('int64')
+    assert infer_dtype([1, None]) == np.dtype('float64')
+    assert infer_dtype([Decimal('1.50')]) == np.dtype('float64')
+    assert infer_dtype([None, date(2024, 1, 1)]) == np.dtype('datetime64[D]')
+    assert infer_dtype([datetime(2024, 1, 1, 12)]) == np.dtype('datetime64[us]')
+    assert infer_dtype(['a', None]) == np.dtype(object)
+
+
+def test_builder_concatenates_batches_column_by_column():
+    builder = ColumnBuilder(['day', 'amount', 'name'], {'amount': 'cents'})
+    builder.add([(date(2024, 1, 1), Decimal('1.25'), 'a'), (date(2024, 1, 2), Decimal('2.50'), 'b')])
+    builder.add([])
+    builder.add([(date(2024, 1, 3), Decimal('0.01'), None)])
+    columns = builder.columns()
+    assert list(columns) == ['day', 'amount', 'name']
+    assert columns['amount'].tolist() == [125, 250, 1]
+    assert columns['day'].dtype == np.dtype('datetime64[D]')
+    assert columns['name'].tolist() == ['a', 'b', None]
+
+
+def test_builder_with_no_rows_gives_typed_empty_columns():
+    columns = ColumnBuilder(['amount', 'day'], {'amount': 'cents', 'day': 'date'}).columns()
+    assert columns['amount'].dtype == np.int64 and len(columns['amount']) == 0
+    assert columns['day'].dtype == np.dtype('datetime64[D]')
+
+
+def test_builder_rejects_dtypes_for_unknown_columns():
+    with pytest.raises(KeyError):
+        ColumnBuilder(['amount'], {'amonut': 'cents'})
+
+
+def test_fetch_columns_from_sqlite(sqlite_db):
+    sqlite_db.execute_query("INSERT INTO user (username, password) VALUES (%s, %s)", ('ann', 'x'))
+    rows = [(1, 1, 'Expense', '19.99', date(2024, 3, 1), "a"),
+            (1, 2, 'Income', '0.10', date(2024, 3, 2), "b"),
+            (1, 1, 'Expense', '1000.01', date(2024, 3, 3), "c")]
+    assert sqlite_db.bulk_insert('transaction', COLUMNS, rows).ok
+    columns = sqlite_db.fetch_columns(
+        "SELECT date, amount FROM transaction WHERE user_id = %s ORDER BY transaction_id",
+        (1,), dtypes={'amount': 'cents', 'date': 'date'}, batch_size=2)
+    assert columns['amount'].tolist() == [1999, 10, 100001]
+    assert [str(day) for day in columns['date']] == ['2024-03-01', '2024-03-02', '2024-03-03']
+
+
+def test_fetch_columns_returns_none_on_error(sqlite_db):
+    assert sqlite_db.fetch_columns("SELECT no_such_column FROM transaction") is None
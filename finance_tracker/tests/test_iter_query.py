@@ -0,0 +1,36 @@
+import pytest
+
+# 1..1000 without a table; past ``fail_after`` abs() overflows, which SQLite
+# only reports when it reaches that row
+NUMBERS = """
+    WITH RECURSIVE n(value) AS (SELECT 1 UNION ALL SELECT value + 1 FROM n WHERE value < 1000)
+    SELECT CASE WHEN value > %s THEN abs(-9223372036854775807 - 1) ELSE value END FROM n
+"""
+
+
+def test_streams_every_row_in_batches(sqlite_db):
+    rows = list(sqlite_db.iter_query(NUMBERS, (1000,), batch_size=64))
+    assert [value for value, in rows] == list(range(1, 1001))
+
+
+def test_bad_query_raises(sqlite_db):
+    with pytest.raises(sqlite_db.errors):
+        list(sqlite_db.iter_query("SELECT no_such_column FROM transaction"))
+
+
+def test_error_part_way_raises_after_the_rows_before_it(sqlite_db):
+    seen = []
+    with pytest.raises(sqlite_db.errors):
+        for value, in sqlite_db.iter_query(NUMBERS, (700,), batch_size=100):
+            seen.append(value)
+    # Whole batches before the failing one were delivered
+    assert seen == list(range(1, 601))
+    # The connection went back to the pool and still works
+    assert sqlite_db.execute_query("SELECT 1") == [(1,)]
+
+
+def test_stopping_early_gives_the_connection_back(sqlite_db):
+    rows = sqlite_db.iter_query(NUMBERS, (1000,), batch_size=10)
+    assert next(rows) == (1,)
+    rows.close()
+    assert sqlite_db.get_pool().available == sqlite_db.get_pool().size
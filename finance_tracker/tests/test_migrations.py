@@ -0,0 +1,142 @@
+from datetime import date
+
+import pytest
+
+import db.connection
+from db.migrations import MIGRATIONS, applied_versions, migrate, pending_migrations
+from utils.money import cents_sql
+
+COLUMNS = ('user_id', 'category_id', 'type', 'amount', 'date', 'description')
+
+SUMMARY = f"""
+    SELECT user_id, month, type, category_id, {cents_sql('total')}, txn_count
+    FROM monthly_summary WHERE txn_count > 0 ORDER BY user_id, month, type, category_id
+"""
+EXPECTED = f"""
+    SELECT user_id, DATE_FORMAT(date, '%Y-%m-01') as month, type, category_id,
+           {cents_sql('SUM(amount)')}, COUNT(*)
+    FROM transaction
+    GROUP BY user_id, DATE_FORMAT(date, '%Y-%m-01'), type, category_id
+    ORDER BY user_id, month, type, category_id
+"""
+PROGRESS = "SELECT last_key, end_key, rows_done FROM schema_migration_progress WHERE version = 2"
+
+SUMMARY_BACKFILL = MIGRATIONS[1].backfill
+
+
+class Chunks(list):
+    fail_after = None
+
+
+def rows_of(database, query):
+    """Rows with the month as text, whichever type the column comes back as"""
+    return [(user_id, str(month)[:10]) + tuple(rest)
+            for user_id, month, *rest in database.execute_query(query)]
+
+
+def assert_rollup_exact(database):
+    assert rows_of(database, SUMMARY) == rows_of(database, EXPECTED)
+
+
+def transactions(count, user_id=1, month=1):
+    return [(user_id, 1 + i % 3, 'Expense' if i % 4 else 'Income', f"{i + 1}.25",
+             date(2023, month + i % 5, 1 + i % 28), f"t{i}") for i in range(count)]
+
+
+@pytest.fixture
+def upgraded(sqlite_db, monkeypatch):
+    """A database whose transactions predate the rollup, with migration 2 pending"""
+    for name in ('ann', 'bob'):
+        sqlite_db.execute_query("INSERT INTO user (username, password) VALUES (%s, %s)", (name, 'x'))
+    rows = transactions(40) + transactions(17, user_id=2, month=3)
+    assert sqlite_db.bulk_insert('transaction', COLUMNS, rows).ok
+    sqlite_db.execute_query("DELETE FROM monthly_summary")
+    sqlite_db.execute_query("DELETE FROM schema_migrations WHERE version = 2")
+    monkeypatch.setattr(SUMMARY_BACKFILL, 'chunk_size', 5)
+    monkeypatch.setattr(SUMMARY_BACKFILL, 'pause', 0)
+    return sqlite_db
+
+
+@pytest.fixture
+def chunks(monkeypatch):
+    """Records the key range of each backfill chunk; set ``fail_after`` to interrupt"""
+    calls = Chunks()
+    original = db.connection.Transaction.execute
+
+    def execute(tx, query, params=None):
+        if query == SUMMARY_BACKFILL.statement:
+            if calls.fail_after is not None and len(calls) >= calls.fail_after:
+                raise tx.backend.Error("interrupted")
+            calls.append(params)
+        return original(tx, query, params)
+
+    monkeypatch.setattr(db.connection.Transaction, 'execute', execute)
+    return calls
+
+
+def test_fresh_database_has_every_migration(sqlite_db):
+    assert applied_versions() == {migration.version for migration in MIGRATIONS}
+    assert pending_migrations() == []
+    assert sqlite_db.execute_query(PROGRESS) == []
+
+
+def test_backfill_builds_the_rollup(upgraded, chunks):
+    assert [migration.version for migration in pending_migrations()] == [2]
+    assert migrate()
+    assert_rollup_exact(upgraded)
+    assert len(chunks) == 12  # 57 rows, 5 keys a chunk
+    assert pending_migrations() == []
+    # Progress is cleared once the migration is recorded
+    assert upgraded.execute_query(PROGRESS) == []
+
+
+def test_interrupted_backfill_resumes_where_it_stopped(upgraded, chunks):
+    chunks.fail_after = 4
+    assert not migrate()
+    assert 2 not in applied_versions()
+    last_key, end_key, rows_done = upgraded.execute_query(PROGRESS)[0]
+    assert (last_key, end_key) == (20, 57)
+    assert rows_done > 0
+
+    chunks.fail_after = None
+    assert migrate()
+    # The fifth chunk starts after the last committed one, not from the top
+    assert chunks[4] == (20, 25)
+    assert len(chunks) == 12
+    assert_rollup_exact(upgraded)
+    assert upgraded.execute_query(PROGRESS) == []
+
+
+def test_rows_written_during_the_backfill_are_counted_once(upgraded, chunks):
+    chunks.fail_after = 2
+    assert not migrate()
+
+    # The triggers count these; the backfill stops at the key it started with
+    assert upgraded.bulk_insert('transaction', COLUMNS, transactions(9, month=2)).ok
+    upgraded.execute_query("DELETE FROM transaction WHERE transaction_id = 3")
+
+    chunks.fail_after = None
+    assert migrate()
+    assert chunks[-1][1] == 57
+    assert_rollup_exact(upgraded)
+
+
+def test_rerun_replaces_an_existing_rollup(upgraded, chunks):
+    # Summary rows already in the table are replaced, not added to
+    upgraded.execute_query("INSERT INTO monthly_summary (user_id, month, type, category_id, total, txn_count) "
+                           "VALUES (1, '2023-01-01', 'Expense', 1, 1000, 4)")
+    assert migrate()
+    assert_rollup_exact(upgraded)
+
+
+def test_empty_table_records_the_migration(sqlite_db):
+    sqlite_db.execute_query("DELETE FROM schema_migrations WHERE version = 2")
+    assert migrate()
+    assert pending_migrations() == []
+
+
+def test_target_stops_before_later_versions(upgraded):
+    assert migrate(target=1)
+    assert 2 not in applied_versions()
+    assert migrate()
+    assert 2 in applied_versions()
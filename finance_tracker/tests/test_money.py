@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+import pytest
+
+from utils.helpers import format_currency
+from utils.money import Money
+
+
+def test_from_decimal_rounds_half_up():
+    assert Money.from_decimal('19.99') == 1999
+    assert Money.from_decimal(0.1) == 10
+    assert Money.from_decimal(Decimal('2.675')) == 268
+    assert Money.from_decimal(Decimal('-2.675')) == -268
+    assert Money.from_decimal(12) == 1200
+
+
+def test_parse_accepts_symbols_and_separators():
+    assert Money.parse('$1,234.50') == 123450
+    assert Money.parse(' 12 ') == 1200
+    with pytest.raises(ValueError):
+        Money.parse('twelve')
+    with pytest.raises(ValueError):
+        Money.parse('')
+
+
+def test_sums_stay_exact():
+    total = sum([Money.from_decimal(0.1)] * 10)
+    assert type(total) is Money
+    assert total == Money.from_decimal(1)
+    assert type(Money(5) - 2) is Money
+    assert type(2 - Money(5)) is Money
+    assert 2 - Money(5) == -3
+
+
+def test_adding_dollars_is_refused():
+    with pytest.raises(TypeError):
+        Money(100) + 0.5
+    with pytest.raises(TypeError):
+        Money(100) - Decimal('1.00')
+
+
+def test_multiplication_keeps_money():
+    amount = Money(1234)
+    assert type(amount * 3) is Money and amount * 3 == 3702
+    assert type(3 * amount) is Money
+    assert amount * 1.5 == 1851
+    assert Money(1) * 0.5 == 1
+    assert Money(-1) * 0.5 == -1
+    assert amount * Decimal('0.1') == 123
+    with pytest.raises(TypeError):
+        amount * amount
+
+
+def test_division():
+    assert Money(1000) / Money(4000) == 0.25
+    assert type(Money(1000) / 3) is Money and Money(1000) / 3 == 333
+    assert Money(1000) / 6 == 167
+    assert Money(1000) // Money(300) == 3
+    assert type(Money(1000) // 3) is Money
+    with pytest.raises(TypeError):
+        1 / Money(100)
+
+
+def test_unary_operators_keep_money():
+    assert type(-Money(5)) is Money and -Money(5) == -5
+    assert type(abs(Money(-5))) is Money
+    assert type(+Money(5)) is Money
+
+
+def test_formats_as_dollars():
+    amount = Money(123456)
+    assert f"{amount:,.2f}" == '1,234.56'
+    assert f"{amount}" == '1234.56'
+    assert f"{Money(-5):.2f}" == '-0.05'
+    assert str(amount) == '1234.56'
+    assert float(amount) == 1234.56
+    assert int(amount) == 123456
+
+
+def test_format_currency():
+    assert format_currency(Money(123456)) == '$1,234.56'
+    assert format_currency(Money(-5)) == '$-0.05'
+    assert format_currency(1234.5) == '$1,234.50'
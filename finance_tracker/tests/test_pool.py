@@ -0,0 +1,206 @@
+import threading
+import time
+
+import pytest
+
+from db.pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    """Stands in for a driver connection; records what the pool does to it"""
+
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.fail_rollback = False
+
+    def rollback(self):
+        if self.fail_rollback:
+            raise OSError("connection reset")
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+class Factory:
+    """Connection factory that numbers the connections it opens"""
+
+    def __init__(self):
+        self.opened = []
+
+    def __call__(self):
+        connection = FakeConnection(len(self.opened))
+        self.opened.append(connection)
+        return connection
+
+
+def test_opens_min_size_up_front():
+    factory = Factory()
+    pool = ConnectionPool(factory, min_size=2, max_size=4)
+    assert pool.size == 2
+    assert pool.available == 2
+    assert len(factory.opened) == 2
+
+
+def test_rejects_invalid_sizes():
+    with pytest.raises(ValueError):
+        ConnectionPool(Factory(), min_size=3, max_size=2)
+    with pytest.raises(ValueError):
+        ConnectionPool(Factory(), min_size=0, max_size=0)
+
+
+def test_reuses_released_connections():
+    pool = ConnectionPool(Factory(), min_size=0, max_size=2)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    assert pool.size == 1
+
+
+def test_times_out_when_exhausted():
+    pool = ConnectionPool(Factory(), min_size=0, max_size=2, timeout=0.05)
+    pool.acquire()
+    pool.acquire()
+    start = time.monotonic()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    assert time.monotonic() - start >= 0.05
+    assert pool.size == 2
+
+
+def test_release_wakes_a_waiting_thread():
+    pool = ConnectionPool(Factory(), min_size=0, max_size=1, timeout=5.0)
+    held = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    assert not acquired
+    pool.release(held)
+    waiter.join(1.0)
+    assert acquired == [held]
+
+
+def test_discard_closes_and_frees_the_slot():
+    factory = Factory()
+    pool = ConnectionPool(factory, min_size=0, max_size=1, timeout=0.05)
+    broken = pool.acquire()
+    pool.discard(broken)
+    assert broken.closed
+    assert pool.size == 0
+    replacement = pool.acquire()
+    assert replacement is not broken
+    assert len(factory.opened) == 2
+
+
+def test_release_rolls_back_an_open_transaction():
+    pool = ConnectionPool(Factory(), min_size=0, max_size=1)
+    connection = pool.acquire()
+    connection.in_transaction = True
+    pool.release(connection)
+    assert connection.rollbacks == 1
+    assert pool.available == 1
+
+
+def test_connection_that_cannot_be_reset_is_closed():
+    pool = ConnectionPool(Factory(), min_size=0, max_size=1)
+    connection = pool.acquire()
+    connection.in_transaction = True
+    connection.fail_rollback = True
+    pool.release(connection)
+    assert connection.closed
+    assert pool.size == 0
+    assert pool.available == 0
+
+
+def test_reset_session_runs_on_release():
+    reset = []
+    pool = ConnectionPool(Factory(), min_size=0, max_size=1, reset_session=reset.append,
+                          on_reset=lambda connection: reset.append('on_reset'))
+    connection = pool.acquire()
+    pool.release(connection)
+    assert reset == [connection, 'on_reset']
+
+
+def test_busy_connections_are_not_validated():
+    checked = []
+    pool = ConnectionPool(Factory(), min_size=1, max_size=1, validate_after=3600,
+                          validate=lambda connection: checked.append(connection) or True)
+    pool.release(pool.acquire())
+    pool.acquire()
+    assert checked == []
+    assert pool.stats()['validations'] == 0
+
+
+def test_idle_connections_are_validated_and_stale_ones_replaced():
+    factory = Factory()
+    pool = ConnectionPool(factory, min_size=1, max_size=1, validate_after=0.0,
+                          validate=lambda connection: False)
+    stale = factory.opened[0]
+    connection = pool.acquire()
+    assert connection is not stale
+    assert stale.closed
+    stats = pool.stats()
+    assert stats['validations'] == 1
+    assert stats['stale_replaced'] == 1
+    assert stats['last_reconnect'] is not None
+    assert pool.size == 1
+
+
+def test_connection_whose_validation_raises_is_closed_and_replaced():
+    factory = Factory()
+
+    def ping(connection):
+        raise OSError("broken pipe")
+
+    pool = ConnectionPool(factory, min_size=1, max_size=1, validate_after=0.0, validate=ping)
+    stale = factory.opened[0]
+    connection = pool.acquire()
+    assert connection is not stale
+    assert stale.closed
+    assert pool.stats()['stale_replaced'] == 1
+    assert pool.size == 1
+
+
+def test_expire_idle_forces_validation_on_next_checkout():
+    checked = []
+    pool = ConnectionPool(Factory(), min_size=1, max_size=1, validate_after=3600,
+                          validate=lambda connection: checked.append(connection) or True)
+    pool.expire_idle()
+    connection = pool.acquire()
+    assert checked == [connection]
+
+
+def test_failed_connect_gives_the_slot_back():
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        raise OSError("server down")
+
+    pool = ConnectionPool(connect, min_size=0, max_size=1, timeout=0.05)
+    for _ in range(2):
+        with pytest.raises(OSError):
+            pool.acquire()
+    assert pool.size == 0
+    assert len(attempts) == 2
+
+
+def test_close_all_closes_idle_and_later_released_connections():
+    factory = Factory()
+    pool = ConnectionPool(factory, min_size=0, max_size=2)
+    idle = pool.acquire()
+    busy = pool.acquire()
+    pool.release(idle)
+    pool.close_all()
+    assert idle.closed
+    assert not busy.closed
+    pool.release(busy)
+    assert busy.closed
+    assert pool.size == 0
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
@@ -0,0 +1,96 @@
+from datetime import date
+
+import pytest
+
+from db.rollup import MonthlyTotals, fetch_monthly_totals, month_window, rebuild_monthly_summary
+from utils.money import Money, cents_sql
+
+COLUMNS = ('user_id', 'category_id', 'type', 'amount', 'date', 'description')
+
+# Buckets emptied by updates and deletes stay behind with a zero count
+SUMMARY = f"""
+    SELECT user_id, month, type, category_id, {cents_sql('total')}, txn_count
+    FROM monthly_summary WHERE txn_count > 0 ORDER BY user_id, month, type, category_id
+"""
+EMPTIED = f"SELECT {cents_sql('total')} FROM monthly_summary WHERE txn_count = 0"
+
+
+def rows_of(database, query):
+    """Rows with the month as text, whichever type the column comes back as"""
+    return [(user_id, str(month)[:10]) + tuple(rest)
+            for user_id, month, *rest in database.execute_query(query)]
+
+
+def assert_matches_rebuild(database):
+    """The trigger-maintained rollup equals one rebuilt from scratch"""
+    maintained = rows_of(database, SUMMARY)
+    assert all(total == 0 for total, in database.execute_query(EMPTIED))
+    assert rebuild_monthly_summary() is not None
+    assert maintained == rows_of(database, SUMMARY)
+
+
+@pytest.fixture
+def ledger(sqlite_db):
+    for name in ('ann', 'bob'):
+        sqlite_db.execute_query("INSERT INTO user (username, password) VALUES (%s, %s)", (name, 'x'))
+    rows = [(1, 1, 'Expense', '10.25', date(2024, 1, 5), "rent"),
+            (1, 1, 'Expense', '4.50', date(2024, 1, 20), "lunch"),
+            (1, 2, 'Income', '100.00', date(2024, 1, 31), "salary"),
+            (1, 1, 'Expense', '7.75', date(2024, 2, 1), "bus"),
+            (2, 1, 'Expense', '3.00', date(2024, 1, 5), "coffee")]
+    assert sqlite_db.bulk_insert('transaction', COLUMNS, rows).ok
+    return sqlite_db
+
+
+def test_inserts_match_rebuild(ledger):
+    assert_matches_rebuild(ledger)
+
+
+def test_update_moving_between_months(ledger):
+    ledger.execute_query("UPDATE transaction SET date = %s WHERE description = %s",
+                         (date(2024, 3, 2), 'lunch'))
+    # Moving the only row out of a month empties its bucket
+    ledger.execute_query("UPDATE transaction SET date = %s WHERE description = %s",
+                         (date(2023, 12, 31), 'bus'))
+    assert_matches_rebuild(ledger)
+
+
+def test_update_moving_between_types(ledger):
+    ledger.execute_query("UPDATE transaction SET type = %s, amount = %s WHERE description = %s",
+                         ('Income', '4.75', 'lunch'))
+    assert_matches_rebuild(ledger)
+
+
+def test_delete(ledger):
+    ledger.execute_query("DELETE FROM transaction WHERE description IN (%s, %s)", ('rent', 'coffee'))
+    assert_matches_rebuild(ledger)
+
+
+def test_month_window_across_the_start_of_a_year():
+    months = month_window(date(2024, 1, 15))
+    assert len(months) == 13
+    assert months[0] == date(2023, 1, 1)
+    assert months[-2:] == [date(2023, 12, 1), date(2024, 1, 1)]
+
+
+def test_month_window_ending_in_december():
+    months = month_window(date(2024, 12, 31))
+    assert months[0] == date(2023, 12, 1)
+    assert months[-1] == date(2024, 12, 1)
+    assert len(set(months)) == 13
+    assert month_window(date(2024, 12, 1), count=1) == [date(2024, 12, 1)]
+
+
+def test_months_without_rows_are_zero():
+    months = month_window(date(2024, 3, 1), count=3)
+    totals = MonthlyTotals.from_rows(months, [('2024-02-01', 'Expense', 1250)])
+    assert totals.series('Expense') == [Money(0), Money(1250), Money(0)]
+    assert totals.series('Income') == [Money(0)] * 3
+    assert totals.series('Expense', count=2) == [Money(1250), Money(0)]
+
+
+def test_fetch_monthly_totals_fills_the_window(ledger):
+    totals = fetch_monthly_totals(1, date(2024, 2, 10), count=3)
+    assert totals.months == [date(2023, 12, 1), date(2024, 1, 1), date(2024, 2, 1)]
+    assert totals.series('Expense') == [Money(0), Money(1475), Money(775)]
+    assert totals.series('Income') == [Money(0), Money(10000), Money(0)]
@@ -0,0 +1,143 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from db import search
+from db.search import fts_query, search_transactions, user_fts_query
+
+COLUMNS = ('user_id', 'category_id', 'type', 'amount', 'date', 'description')
+
+
+@pytest.fixture
+def corpus(sqlite_db):
+    for name in ('ann', 'bob'):
+        sqlite_db.execute_query("INSERT INTO user (username, password) VALUES (%s, %s)", (name, 'x'))
+    start = date(2020, 1, 1)
+    # The best match is the oldest row, followed by thousands of weaker
+    # matches whose long descriptions only mention "coffee" once
+    rows = [(1, 1, 'Expense', '3.50', start, "coffee coffee beans")]
+    filler = "weekly grocery run with milk bread eggs and one coffee"
+    rows += [(1, 1, 'Expense', '1.00', start + timedelta(days=1 + i % 1000), filler)
+             for i in range(3000)]
+    rows.append((1, 1, 'Expense', '2.00', date(2024, 6, 1), "rent"))
+    rows.append((2, 1, 'Expense', '4.00', date(2024, 6, 1), "coffee coffee beans"))
+    assert sqlite_db.bulk_insert('transaction', COLUMNS, rows).ok
+    return sqlite_db
+
+
+def test_fts_query_quotes_each_word():
+    assert fts_query('coffee AND "beans"*') == '"coffee" OR "AND" OR "beans"'
+
+
+def test_best_match_first_even_when_oldest(corpus):
+    page = search_transactions(1, "coffee beans", limit=10)
+    assert page.rows[0][0] == date(2020, 1, 1)
+    assert page.rows[0][4] == "coffee coffee beans"
+    assert page.has_more
+
+
+def test_pages_cover_every_match_once(corpus):
+    seen = 0
+    offset = 0
+    first = None
+    while True:
+        page = search_transactions(1, "coffee", limit=700, offset=offset)
+        first = first or page.rows[0]
+        seen += len(page.rows)
+        if not page.has_more:
+            break
+        offset = page.next_offset
+    # Only user 1's rows, and "rent" does not match
+    assert seen == 3001
+    assert first[4] == "coffee coffee beans"
+
+
+def test_no_words_matches_nothing(corpus):
+    page = search_transactions(1, "  !! ")
+    assert page.rows == [] and not page.has_more
+
+
+def test_user_fts_query_is_scoped_to_the_user():
+    assert user_fts_query(7, "coffee beans") == 'user_id : "7" AND description : ("coffee" OR "beans")'
+
+
+def test_only_the_newest_matches_are_ranked(corpus, monkeypatch):
+    monkeypatch.setattr(search, 'RANKED_MATCHES', 100)
+    # The best match is older than the 100 newest, so it comes after them
+    ranked = search_transactions(1, "coffee beans", limit=100)
+    assert "coffee coffee beans" not in [row[4] for row in ranked.rows]
+    assert ranked.has_more
+
+    seen = ranked.rows
+    while ranked.has_more:
+        ranked = search_transactions(1, "coffee beans", limit=70, offset=ranked.next_offset)
+        seen += ranked.rows
+    assert len(seen) == 3001
+    # Older matches follow newest first, down to the oldest
+    assert seen[-1][4] == "coffee coffee beans"
+
+
+def test_pages_straddling_the_ranked_window(corpus, monkeypatch):
+    monkeypatch.setattr(search, 'RANKED_MATCHES', 100)
+    whole = search_transactions(1, "coffee", limit=300)
+    pages = [search_transactions(1, "coffee", limit=30, offset=offset) for offset in range(0, 300, 30)]
+    assert [row for page in pages for row in page.rows] == whole.rows
+
+
+def test_updates_move_rows_between_users_in_the_index(corpus):
+    corpus.execute_query("UPDATE transaction SET user_id = %s WHERE description = %s", (2, "rent"))
+    assert len(search_transactions(2, "rent").rows) == 1
+    assert search_transactions(1, "rent").rows == []
+
+
+def test_fulltext_lookup_is_per_backend(sqlite_db, monkeypatch):
+    calls = []
+
+    def execute_query(query, params=None, cache=True):
+        calls.append(query)
+        return [(1,)]
+
+    monkeypatch.setattr(sqlite_db, 'execute_query', execute_query)
+    monkeypatch.setattr(search, '_has_fulltext', None)
+    assert search._mysql_has_fulltext() and search._mysql_has_fulltext()
+    assert len(calls) == 1
+
+    # A new backend (use_backend) and forget_fulltext_index both look again
+    sqlite_db.backend = None
+    assert search._mysql_has_fulltext()
+    search.forget_fulltext_index()
+    assert search._mysql_has_fulltext()
+    assert len(calls) == 3
+
+
+# Searching must stay in the tens of milliseconds however many
+# transactions the user has; ranking every match took most of a second
+SEARCH_TARGET = 0.1
+
+
+def test_search_time_for_a_user_with_500k_transactions(sqlite_db, monkeypatch):
+    # Building the data takes seconds; keep it out of the slow-query log
+    monkeypatch.setattr(sqlite_db.query_stats, 'slow_query_threshold', None)
+    sqlite_db.execute_query("INSERT INTO user (username, password) VALUES (%s, %s)", ('ann', 'x'))
+    # Insert without the row-by-row triggers, then index everything at once
+    for trigger in ('trg_transaction_insert_summary', 'trg_transaction_insert_fts'):
+        assert sqlite_db.execute_query(f"DROP TRIGGER {trigger}")
+    assert sqlite_db.execute_query("""
+        INSERT INTO transaction (user_id, category_id, type, amount, date, description)
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 500000)
+        SELECT 1, 1 + i % 3, 'Expense', 1.25, date('2015-01-01', '+' || (i % 3650) || ' days'),
+               CASE i % 4 WHEN 0 THEN 'coffee and a bagel' WHEN 1 THEN 'groceries with coffee beans'
+                          WHEN 2 THEN 'bus fare' ELSE 'coffee' END
+        FROM n
+    """)
+    assert sqlite_db.execute_query("INSERT INTO transaction_fts (transaction_fts) VALUES ('rebuild')")
+
+    timings = []
+    for _ in range(3):
+        sqlite_db.result_cache.clear()
+        started = time.perf_counter()
+        page = search_transactions(1, "coffee beans")
+        timings.append(time.perf_counter() - started)
+    assert len(page.rows) == 50 and page.rows[0][4] == 'groceries with coffee beans'
+    assert min(timings) < SEARCH_TARGET
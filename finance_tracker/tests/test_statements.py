@@ -0,0 +1,183 @@
+import pytest
+
+from db.connection import DatabaseConnection
+from db.statements import PreparedStatementCache, to_prepared_sql
+from db.stats import fingerprint
+
+
+class FakeError(Exception):
+    def __init__(self, msg, errno=None):
+        super().__init__(msg)
+        self.errno = errno
+
+
+# ER_UNSUPPORTED_PS and ER_DUP_ENTRY
+UNSUPPORTED_PS = 1295
+DUP_ENTRY = 1062
+
+
+class FakeCursor:
+    def __init__(self, connection, prepared):
+        self.connection = connection
+        self.prepared = prepared
+        self.closed = False
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        if self.prepared and self.connection.reject_prepared:
+            raise FakeError("This command is not supported in the prepared statement protocol yet",
+                            UNSUPPORTED_PS)
+        self.connection.log.append(('prepared' if self.prepared else 'text', sql, params))
+        if self.connection.fail_with is not None:
+            raise FakeError("Duplicate entry", self.connection.fail_with)
+        self.rowcount = 1
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self):
+        self.log = []
+        self.cursors = []
+        self.reject_prepared = False
+        self.fail_with = None
+
+    def cursor(self, prepared=False):
+        cursor = FakeCursor(self, prepared)
+        self.cursors.append(cursor)
+        return cursor
+
+    def close(self):
+        pass
+
+
+class FakeBackend:
+    """A MySQL-like backend with prepared statement support"""
+
+    name = 'fake'
+    display_name = 'Fake'
+    supports_prepared = True
+    Error = FakeError
+
+    def __init__(self):
+        self.connection = FakeConnection()
+
+    def connect(self):
+        return self.connection
+
+    def translate(self, query, params=None):
+        return query
+
+    def is_connected(self, connection):
+        return True
+
+    def is_connection_lost(self, error):
+        return False
+
+    def is_prepare_rejected(self, error):
+        return error.errno == UNSUPPORTED_PS
+
+
+@pytest.fixture
+def fake_db():
+    database = DatabaseConnection()
+    database.backend = FakeBackend()
+    database.configure_pool(min_size=0, max_size=1)
+    database.result_cache.enabled = False
+    yield database
+    database.close_connection()
+
+
+QUERY = "SELECT 1 FROM user WHERE user_id = %s"
+
+
+def test_to_prepared_sql():
+    assert to_prepared_sql("SELECT * FROM t WHERE a = %s AND b LIKE '%%x'") == \
+        "SELECT * FROM t WHERE a = ? AND b LIKE '%x'"
+    assert to_prepared_sql("SELECT * FROM t WHERE a = %(a)s") is None
+    # "%%s" is a literal "%s", which would look like a placeholder once unescaped
+    assert to_prepared_sql("SELECT '%%s' FROM t WHERE a = %s") is None
+
+
+def test_prepares_after_repeated_executions():
+    cache = PreparedStatementCache(auto_prepare_after=3)
+    assert [cache.should_prepare(QUERY, (1,)) for _ in range(4)] == [False, False, True, True]
+
+
+def test_registered_statements_prepare_immediately():
+    cache = PreparedStatementCache(auto_prepare_after=None)
+    assert not cache.should_prepare(QUERY, (1,))
+    cache.register(QUERY)
+    assert cache.should_prepare(QUERY, (1,))
+
+
+def test_never_prepares_ddl_or_unparameterized_sql():
+    cache = PreparedStatementCache(auto_prepare_after=1)
+    assert not cache.should_prepare("CREATE TABLE t (a INT)", ())
+    assert not cache.should_prepare("SELECT 1", None)
+
+
+def test_per_connection_lru_closes_evicted_cursors():
+    cache = PreparedStatementCache(max_per_connection=2)
+    connection = FakeConnection()
+    first, _ = cache.cursor_for(connection, "SELECT 1 FROM a WHERE x = %s")
+    cache.cursor_for(connection, "SELECT 1 FROM b WHERE x = %s")
+    cache.cursor_for(connection, "SELECT 1 FROM c WHERE x = %s")
+    assert first.closed
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['cached'] == 2
+
+
+def test_clear_closes_a_connections_cursors():
+    cache = PreparedStatementCache()
+    connection = FakeConnection()
+    cursor, _ = cache.cursor_for(connection, QUERY)
+    cache.clear(connection)
+    assert cursor.closed
+    assert cache.stats()['cached'] == 0
+
+
+def test_execute_query_reuses_one_prepared_cursor(fake_db):
+    for user_id in range(5):
+        assert fake_db.execute_query(QUERY, (user_id,)) == [(1,)]
+    log = fake_db.backend.connection.log
+    assert [kind for kind, _, _ in log] == ['text', 'text', 'prepared', 'prepared', 'prepared']
+    assert log[-1][1] == "SELECT 1 FROM user WHERE user_id = ?"
+    assert fake_db.prepared_stats()['misses'] == 1
+    assert fake_db.prepared_stats()['hits'] == 2
+
+
+def test_rejected_statement_falls_back_to_text(fake_db):
+    fake_db.register_prepared(QUERY)
+    fake_db.backend.connection.reject_prepared = True
+
+    assert fake_db.execute_query(QUERY, (1,)) == [(1,)]
+    assert fake_db.execute_query(QUERY, (2,)) == [(1,)]
+    log = fake_db.backend.connection.log
+    assert [kind for kind, _, _ in log] == ['text', 'text']
+    assert fake_db.stats()[fingerprint(QUERY)]['errors'] == 0
+
+
+INSERT = "INSERT INTO budget (user_id, month, limit_amount) VALUES (%s, %s, %s)"
+
+
+def test_failing_statement_stays_prepared_and_runs_once(fake_db):
+    fake_db.register_prepared(INSERT)
+    connection = fake_db.backend.connection
+    connection.fail_with = DUP_ENTRY
+
+    assert fake_db.execute_query(INSERT, (1, '2024-01', 10)) is None
+    # Not retried as text
+    assert [kind for kind, _, _ in connection.log] == ['prepared']
+    assert fake_db.stats()[fingerprint(INSERT)]['errors'] == 1
+
+    connection.fail_with = None
+    assert fake_db.execute_query(INSERT, (1, '2024-02', 10)) is True
+    assert [kind for kind, _, _ in connection.log] == ['prepared', 'prepared']
+    # The same cached cursor served both executions
+    assert fake_db.prepared_stats()['misses'] == 1
+    assert fake_db.prepared_stats()['hits'] == 1
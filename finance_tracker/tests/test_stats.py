@@ -0,0 +1,102 @@
+import logging
+import os
+
+import pytest
+
+from db.stats import QueryStats, fingerprint
+
+
+@pytest.fixture
+def slow_log(tmp_path):
+    """A QueryStats writing its slow-query log under tmp_path"""
+    logger = logging.getLogger('finance_tracker.slow_queries')
+    saved = logger.handlers[:]
+    logger.handlers = []
+    stats = QueryStats(slow_query_threshold=0.1, log_path=str(tmp_path / 'logs' / 'slow.log'))
+    yield stats
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers = saved
+
+
+def test_fingerprint_collapses_literals():
+    assert fingerprint("SELECT * FROM user WHERE username = 'ann' AND user_id = 42") == \
+        "SELECT * FROM user WHERE username = ? AND user_id = ?"
+    assert fingerprint("SELECT * FROM user WHERE username = 'o''brien'") == \
+        "SELECT * FROM user WHERE username = ?"
+    assert fingerprint("SELECT 1.50, %s, ?") == "SELECT ?, ?, ?"
+    # Names containing digits are not literals
+    assert fingerprint("SELECT col1 FROM t2") == "SELECT col1 FROM t2"
+
+
+def test_fingerprint_groups_in_lists_and_whitespace():
+    assert fingerprint("SELECT * FROM t WHERE id IN (1, 2, 3)") == \
+        fingerprint("SELECT *\n  FROM t WHERE id IN (%s,%s)") == \
+        "SELECT * FROM t WHERE id IN (...)"
+    assert fingerprint("SELECT DATE_FORMAT(date, '%%Y') FROM t") == "SELECT DATE_FORMAT(date, ?) FROM t"
+
+
+def test_calls_with_different_literals_share_stats():
+    stats = QueryStats(slow_query_threshold=None)
+    stats.record("SELECT * FROM t WHERE id = 1", 0.002, rows=1)
+    stats.record("SELECT * FROM t WHERE id = 2", 0.004, rows=3)
+    stats.record("SELECT * FROM t WHERE id = 3", 0.006, error=True)
+    snapshot = stats.snapshot()
+    assert list(snapshot) == ["SELECT * FROM t WHERE id = ?"]
+    entry = snapshot["SELECT * FROM t WHERE id = ?"]
+    assert (entry['calls'], entry['rows'], entry['errors']) == (3, 4, 1)
+    assert entry['mean_ms'] == pytest.approx(4.0)
+    assert entry['max_ms'] == pytest.approx(6.0)
+
+
+def test_percentiles_on_a_known_distribution():
+    stats = QueryStats(slow_query_threshold=None)
+    # 1 ms .. 100 ms, recorded out of order
+    for ms in list(range(100, 0, -2)) + list(range(1, 100, 2)):
+        stats.record("SELECT 1", ms / 1000)
+    entry = stats.snapshot()["SELECT ?"]
+    assert entry['p50_ms'] == pytest.approx(50.0)
+    assert entry['p95_ms'] == pytest.approx(95.0)
+    assert entry['max_ms'] == pytest.approx(100.0)
+
+
+def test_percentiles_cover_only_recent_samples():
+    stats = QueryStats(slow_query_threshold=None, max_samples=10)
+    for _ in range(90):
+        stats.record("SELECT 1", 1.0)
+    for _ in range(10):
+        stats.record("SELECT 1", 0.001)
+    entry = stats.snapshot()["SELECT ?"]
+    assert entry['p95_ms'] == pytest.approx(1.0)
+    assert entry['calls'] == 100
+    assert entry['max_ms'] == pytest.approx(1000.0)
+
+
+def test_snapshot_orders_by_total_time_and_reset_clears():
+    stats = QueryStats(slow_query_threshold=None)
+    stats.record("SELECT a FROM t", 0.001)
+    stats.record("SELECT b FROM t", 0.010)
+    assert list(stats.snapshot()) == ["SELECT b FROM t", "SELECT a FROM t"]
+    stats.reset()
+    assert stats.snapshot() == {}
+
+
+def test_only_statements_over_the_threshold_are_logged(slow_log):
+    slow_log.record("SELECT * FROM t WHERE id = 7", 0.05)
+    assert not os.path.exists(slow_log.log_path)
+    slow_log.record("SELECT * FROM t WHERE id = 8", 0.25, rows=12)
+    slow_log.record("SELECT * FROM t WHERE id = 9", 0.1)
+    for handler in logging.getLogger('finance_tracker.slow_queries').handlers:
+        handler.flush()
+    with open(slow_log.log_path, encoding='utf-8') as log:
+        lines = log.read().splitlines()
+    assert len(lines) == 2
+    assert lines[0].endswith("250.0 ms rows=12 SELECT * FROM t WHERE id = ?")
+    assert lines[1].endswith("100.0 ms rows=0 SELECT * FROM t WHERE id = ?")
+
+
+def test_disabled_stats_record_nothing():
+    stats = QueryStats(slow_query_threshold=None)
+    stats.enabled = False
+    stats.record("SELECT 1", 0.5)
+    assert stats.snapshot() == {}
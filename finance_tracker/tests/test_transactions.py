@@ -0,0 +1,72 @@
+from datetime import date
+
+import pytest
+
+from db.transactions import fetch_transactions_page
+from utils.money import Money
+
+COLUMNS = ('user_id', 'category_id', 'type', 'amount', 'date', 'description')
+
+# Dates out of id order, with several rows sharing a date
+DATES = [date(2024, 3, 1), date(2024, 3, 5), date(2024, 3, 1), date(2024, 2, 28),
+         date(2024, 3, 5), date(2024, 3, 5), date(2024, 3, 1), date(2024, 1, 15),
+         date(2024, 3, 5), date(2024, 2, 28)]
+
+
+@pytest.fixture
+def history(sqlite_db):
+    for name in ('ann', 'bob'):
+        sqlite_db.execute_query("INSERT INTO user (username, password) VALUES (%s, %s)", (name, 'x'))
+    rows = [(1, 1, 'Expense', '1.25', day, f"t{index + 1}") for index, day in enumerate(DATES)]
+    # Another user's rows must never show up
+    rows.append((2, 1, 'Expense', '9.00', date(2024, 3, 3), "other"))
+    assert sqlite_db.bulk_insert('transaction', COLUMNS, rows).ok
+    return sqlite_db
+
+
+def expected_order():
+    """Descriptions newest first: date descending, then id descending"""
+    ids = sorted(range(1, len(DATES) + 1), key=lambda i: (DATES[i - 1], i), reverse=True)
+    return [f"t{i}" for i in ids]
+
+
+def walk(user_id, limit):
+    pages = []
+    page = fetch_transactions_page(user_id, limit)
+    pages.append(page)
+    while page.has_more:
+        page = fetch_transactions_page(user_id, limit, page.next_after)
+        pages.append(page)
+    return pages
+
+
+@pytest.mark.parametrize('limit', [1, 3, 4, 5, 10, 20])
+def test_pages_cover_every_row_once_in_order(history, limit):
+    pages = walk(1, limit)
+    descriptions = [row[0] for page in pages for row in page.rows]
+    assert descriptions == expected_order()
+    assert all(len(page.rows) == limit for page in pages[:-1])
+    assert not pages[-1].has_more
+
+
+def test_exact_multiple_of_the_page_size_has_no_empty_last_page(history):
+    pages = walk(1, 5)
+    assert [len(page.rows) for page in pages] == [5, 5]
+
+
+def test_page_key_is_the_last_rows_date_and_id(history):
+    page = fetch_transactions_page(1, 4)
+    # All four rows share 2024-03-05; the next page continues below id 2 on that date
+    assert [row[0] for row in page.rows] == ['t9', 't6', 't5', 't2']
+    assert page.next_after == (date(2024, 3, 5), 2)
+
+
+def test_rows_carry_money_and_dates(history):
+    description, amount, kind, day, category = fetch_transactions_page(1, 1).rows[0]
+    assert amount == Money(125) and isinstance(amount, Money)
+    assert (kind, day, category) == ('Expense', date(2024, 3, 5), 'Food')
+
+
+def test_empty_history(sqlite_db):
+    page = fetch_transactions_page(1, 10)
+    assert page.rows == [] and not page.has_more
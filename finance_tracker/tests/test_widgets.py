@@ -0,0 +1,90 @@
+import tkinter as tk
+from datetime import date
+
+import pytest
+
+from ui.widgets import RowWindow, TransactionList
+
+
+def shown(window):
+    return list(range(window.offset, window.stop))
+
+
+def test_window_never_holds_more_than_its_size():
+    window = RowWindow(10)
+    window.reset(25)
+    assert shown(window) == list(range(10))
+    for _ in range(5):
+        window.grow(7)
+        assert window.stop - window.offset <= 10
+    # Extending brings the new items into view, keeping the window full
+    assert shown(window) == list(range(50, 60))
+
+
+def test_short_data_fits_in_one_window():
+    window = RowWindow(10)
+    window.reset(4)
+    assert shown(window) == [0, 1, 2, 3]
+    assert not window.overflow
+    assert window.at_start and window.at_end
+    assert not window.scroll(3)
+
+
+def test_scrolling_is_clamped_to_the_data():
+    window = RowWindow(10)
+    window.reset(25)
+    assert not window.scroll(-3)
+    assert window.scroll(10) and window.offset == 10
+    assert window.scroll(10) and window.offset == 15
+    assert window.at_end
+    assert not window.scroll(1)
+    assert window.scroll(-100) and window.offset == 0
+
+
+def test_more_to_load_counts_as_overflow():
+    window = RowWindow(10)
+    window.reset(4, more=True)
+    assert window.overflow and window.at_end
+    window.grow(4, more=False)
+    # The window did not need to move: both pages fit
+    assert shown(window) == list(range(8))
+    assert not window.overflow
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    yield root
+    root.destroy()
+
+
+COLORS = dict(bg_cards='white', border='grey', text_primary='black', text_secondary='grey',
+              accent_green='green', accent_red='red')
+
+
+def transactions(count, start=0):
+    return [(f"t{i}", 1, 'Expense', date(2024, 1, 1), 'Food') for i in range(start, start + count)]
+
+
+def test_row_widgets_are_reused(root):
+    requests = []
+    listing = TransactionList(root, COLORS, max_rows=5, on_reach_end=lambda: requests.append(1))
+    listing.show(transactions(3), more=True)
+    assert len(listing.rows) == 3
+
+    listing.scroll(5)
+    assert requests == [1]
+    listing.extend(transactions(10, start=3), more=False)
+    assert len(listing.rows) == 5
+    assert listing.window.offset == 3
+    assert listing.rows[0].desc_label.cget('text') == 't3'
+
+    listing.scroll(100)
+    assert listing.rows[0].desc_label.cget('text') == 't8'
+    # Nothing more to load
+    listing.scroll(5)
+    assert requests == [1]
+    assert str(listing.older_button.cget('state')) == tk.DISABLED
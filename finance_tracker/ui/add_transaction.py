@@ -2,7 +2,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime, date
 from db.connection import db
+from db.categories import category_registry
 from utils.helpers import validate_amount, validate_date, format_currency, show_error, show_success
+from ui.async_bridge import TkQueryBridge
 
 class AddTransactionWindow:
     def __init__(self, user_id, parent_window=None, callback=None):
@@ -16,6 +18,9 @@ class AddTransactionWindow:
         self.root.geometry("500x400")
         self.root.resizable(False, False)
         
+        # Runs SQL on worker threads so the form stays responsive
+        self.queries = TkQueryBridge(self.root)
+        
         # Center the window
         self.center_window()
         
@@ -115,18 +120,15 @@ class AddTransactionWindow:
         self.root.bind('<Return>', lambda e: self.save_transaction())
     
     def load_categories(self):
-        """Load categories from database"""
-        try:
-            query = "SELECT category_name FROM category ORDER BY category_name"
-            result = db.execute_query(query)
-            
-            if result:
-                categories = [row[0] for row in result]
-                self.category_combo['values'] = categories
-                if categories:
-                    self.category_combo.set(categories[0])
-        except Exception as e:
-            show_error(f"Error loading categories: {str(e)}")
+        """Load categories in the background (read from the database only once per process)"""
+        self.queries.run('categories', category_registry.names, self.show_categories,
+                         lambda e: show_error(f"Error loading categories: {str(e)}"))
+    
+    def show_categories(self, categories):
+        """Fill the category combobox with loaded categories"""
+        if categories:
+            self.category_combo['values'] = categories
+            self.category_combo.set(categories[0])
     
     def on_type_change(self):
         """Handle transaction type change"""
@@ -181,44 +183,53 @@ class AddTransactionWindow:
                 show_error("Please enter a valid date (YYYY-MM-DD)")
                 return
             
-            # Get category ID
-            category_query = "SELECT category_id FROM category WHERE category_name = %s"
-            category_result = db.execute_query(category_query, (category_name,))
-            
-            if not category_result:
-                show_error("Invalid category selected")
-                return
-            
-            category_id = category_result[0][0]
-            
-            # Insert transaction
-            insert_query = """
-                INSERT INTO transaction (user_id, category_id, type, amount, date, description)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            
-            if db.execute_query(insert_query, (self.user_id, category_id, transaction_type, 
-                                            amount, transaction_date, description)):
-                show_success("Transaction saved successfully!")
-                
-                # Clear form
-                self.amount_entry.delete(0, tk.END)
-                self.date_entry.delete(0, tk.END)
-                self.date_entry.insert(0, datetime.now().strftime('%Y-%m-%d'))
-                self.description_text.delete("1.0", tk.END)
-                
-                # Call callback to refresh dashboard
-                if self.callback:
-                    self.callback()
-                
-                # Close window after a short delay
-                self.root.after(1000, self.cancel)
-            else:
-                show_error("Failed to save transaction")
+            values = (transaction_type, amount, transaction_date, description)
+            self.queries.run('save', lambda: self.insert_transaction(category_name, *values),
+                             self.on_transaction_saved,
+                             lambda e: show_error(f"Error saving transaction: {str(e)}"))
                 
         except Exception as e:
             show_error(f"Error saving transaction: {str(e)}")
     
+    def insert_transaction(self, category_name, transaction_type, amount, transaction_date, description):
+        """Insert the transaction; called on a database worker thread"""
+        # Get category ID (from the in-process registry, no round trip)
+        category_id = category_registry.id_for(category_name)
+        if category_id is None:
+            return "Invalid category selected"
+        
+        # Insert transaction
+        insert_query = """
+            INSERT INTO transaction (user_id, category_id, type, amount, date, description)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        
+        if db.execute_query(insert_query, (self.user_id, category_id, transaction_type, 
+                                        amount.to_decimal(), transaction_date, description)):
+            return None
+        return "Failed to save transaction"
+    
+    def on_transaction_saved(self, error_message):
+        """Report the outcome of insert_transaction on the Tk thread"""
+        if error_message:
+            show_error(error_message)
+            return
+        
+        show_success("Transaction saved successfully!")
+        
+        # Clear form
+        self.amount_entry.delete(0, tk.END)
+        self.date_entry.delete(0, tk.END)
+        self.date_entry.insert(0, datetime.now().strftime('%Y-%m-%d'))
+        self.description_text.delete("1.0", tk.END)
+        
+        # Call callback to refresh dashboard
+        if self.callback:
+            self.callback()
+        
+        # Close window after a short delay
+        self.root.after(1000, self.cancel)
+    
     def cancel(self):
         """Cancel and close window"""
         self.root.destroy()
@@ -0,0 +1,206 @@
+import queue
+import threading
+import tkinter as tk
+from typing import Callable, Dict, Iterable, Optional
+from db.connection import db
+from utils.helpers import show_error
+
+
+class _Stream:
+    """Batches handed from a worker thread to the Tk thread through a bounded queue
+
+    The worker blocks while ``max_batches`` batches are waiting, so a slow
+    consumer holds back the query instead of the whole result piling up.
+    """
+
+    def __init__(self, on_batch: Callable, on_done: Callable,
+                 on_error: Optional[Callable], max_batches: int):
+        self.batches = queue.Queue(max_batches)
+        self.cancelled = threading.Event()
+        self.on_batch = on_batch
+        self.on_done = on_done
+        self.on_error = on_error
+        self.future = None
+
+    def produce(self, work: Callable[[], Iterable]):
+        """Worker side: queue each batch from ``work()`` until done or cancelled"""
+        batches = iter(work())
+        try:
+            for batch in batches:
+                while not self.cancelled.is_set():
+                    try:
+                        self.batches.put(batch, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if self.cancelled.is_set():
+                    return
+        finally:
+            # Closing a generator over iter_query gives its connection back
+            close = getattr(batches, 'close', None)
+            if close:
+                close()
+
+    def cancel(self):
+        self.cancelled.set()
+        self.future.cancel()
+
+
+class TkQueryBridge:
+    """Run database work off the Tk thread and deliver results back to it
+
+    ``run(key, work, on_success)`` executes ``work()`` on a database worker
+    thread.  Completed futures are picked up by polling with ``after`` so the
+    callbacks always run on the Tk thread.  Starting a new request under a key
+    that is still in flight supersedes the old one: it is cancelled if it has
+    not started yet, and its result is discarded otherwise.
+
+    ``stream(key, work, on_batch, on_done)`` is the same for results too big
+    to hold at once: ``work()`` yields batches on the worker thread and each
+    one reaches ``on_batch`` on the Tk thread as soon as it is ready.
+    """
+
+    # Batches handed to on_batch per poll, so input is handled between them
+    BATCHES_PER_POLL = 2
+
+    def __init__(self, widget: tk.Misc, poll_interval: int = 30):
+        self.widget = widget
+        self.poll_interval = poll_interval
+        self._pending: Dict[str, object] = {}  # key -> (future, callbacks) or _Stream
+        self._after_id = None
+        self._destroyed = False
+
+        widget.bind('<Destroy>', self._on_destroy, add='+')
+
+    def run(self, key: str, work: Callable, on_success: Callable,
+            on_error: Optional[Callable] = None):
+        """Run ``work()`` in the background and pass its result to ``on_success``"""
+        if self._destroyed:
+            return None
+
+        self.cancel(key)
+        future = db.submit(work)
+        self._pending[key] = (future, on_success, on_error)
+        self._schedule()
+        return future
+
+    def stream(self, key: str, work: Callable[[], Iterable], on_batch: Callable,
+               on_done: Callable[[], None], on_error: Optional[Callable] = None,
+               max_batches: int = 4):
+        """Iterate ``work()`` in the background, passing each batch to ``on_batch``
+
+        ``on_done()`` runs after the last batch; if the iteration raises,
+        ``on_error(error)`` runs instead, after the batches that did arrive.
+        """
+        if self._destroyed:
+            return None
+
+        self.cancel(key)
+        stream = _Stream(on_batch, on_done, on_error, max_batches)
+        stream.future = db.submit(stream.produce, work)
+        self._pending[key] = stream
+        self._schedule()
+        return stream.future
+
+    def cancel(self, key: str):
+        """Cancel (or ignore the result of) the request running under ``key``"""
+        pending = self._pending.pop(key, None)
+        if isinstance(pending, _Stream):
+            pending.cancel()
+        elif pending:
+            pending[0].cancel()
+
+    def cancel_all(self):
+        """Cancel every in-flight request"""
+        for key in list(self._pending):
+            self.cancel(key)
+
+    def is_pending(self, key: str) -> bool:
+        """Whether a request is still in flight under ``key``"""
+        return key in self._pending
+
+    def _schedule(self):
+        """Start polling if it is not already running"""
+        if self._after_id is None and self._pending and not self._destroyed:
+            self._after_id = self.widget.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        """Dispatch callbacks for every finished request"""
+        self._after_id = None
+        try:
+            for key, pending in list(self._pending.items()):
+                # A callback may have superseded this key while we were iterating
+                if self._pending.get(key) is not pending:
+                    continue
+                if isinstance(pending, _Stream):
+                    self._drain(key, pending)
+                    continue
+
+                future, on_success, on_error = pending
+                if not future.done():
+                    continue
+                del self._pending[key]
+
+                if not future.cancelled():
+                    self._dispatch(future, on_success, on_error)
+        finally:
+            # Keep polling for the other requests whatever a callback did
+            self._schedule()
+
+    @staticmethod
+    def _dispatch(future, on_success: Callable, on_error: Optional[Callable]):
+        """Run the callback for one finished future, reporting anything it raises"""
+        error = future.exception()
+        try:
+            if error is None:
+                on_success(future.result())
+            elif on_error:
+                on_error(error)
+            else:
+                show_error(f"Error loading data: {str(error)}")
+        except Exception as e:
+            show_error(f"Error displaying data: {str(e)}")
+
+    def _drain(self, key: str, stream: _Stream):
+        """Hand a few queued batches to on_batch; finish once the worker is done"""
+        try:
+            for _ in range(self.BATCHES_PER_POLL):
+                try:
+                    batch = stream.batches.get_nowait()
+                except queue.Empty:
+                    break
+                stream.on_batch(batch)
+                if self._pending.get(key) is not stream:
+                    return  # on_batch cancelled or replaced the stream
+        except Exception as e:
+            self.cancel(key)
+            show_error(f"Error displaying data: {str(e)}")
+            return
+
+        if stream.future.done() and stream.batches.empty():
+            del self._pending[key]
+            if stream.future.cancelled():
+                return
+            error = stream.future.exception()
+            try:
+                if error is None:
+                    stream.on_done()
+                elif stream.on_error:
+                    stream.on_error(error)
+                else:
+                    show_error(f"Error loading data: {str(error)}")
+            except Exception as e:
+                show_error(f"Error displaying data: {str(e)}")
+
+    def _on_destroy(self, event):
+        """Stop polling once the owning widget is gone"""
+        if event.widget is not self.widget:
+            return
+        self._destroyed = True
+        self.cancel_all()
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
@@ -2,7 +2,11 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from db.connection import db
-from utils.helpers import format_currency, get_current_month, show_error, show_success, get_month_name
+from utils.helpers import format_currency, get_current_month, month_range, show_error, show_success, get_month_name
+from utils.money import Money, cents_sql
+from db.budgets import budget_status, clear_category_budget, set_category_budget
+from db.categories import category_registry
+from ui.async_bridge import TkQueryBridge
 
 class BudgetWindow:
     def __init__(self, user_id, parent_window=None, callback=None):
@@ -13,9 +17,12 @@ class BudgetWindow:
         # Create window
         self.root = tk.Toplevel() if parent_window else tk.Tk()
         self.root.title("Budget Management")
-        self.root.geometry("600x500")
+        self.root.geometry("640x780")
         self.root.resizable(False, False)
         
+        # Runs SQL on worker threads so the window stays responsive
+        self.queries = TkQueryBridge(self.root)
+        
         # Center the window
         self.center_window()
         
@@ -33,6 +40,7 @@ class BudgetWindow:
         
         # Load current budget data
         self.load_budget_data()
+        self.load_category_budgets()
         
         # Focus on limit entry
         self.limit_entry.focus()
@@ -104,13 +112,16 @@ class BudgetWindow:
                                     font=('Arial', 10, 'bold'), foreground='red')
         self.alert_label.pack(pady=5)
         
+        # Per-category budgets
+        self.create_category_budget_section()
+        
         # Buttons frame
         buttons_frame = ttk.Frame(self.main_frame)
         buttons_frame.pack(fill=tk.X, pady=20)
         
         # Refresh button
         refresh_btn = ttk.Button(buttons_frame, text="Refresh", 
-                               command=self.load_budget_data)
+                               command=self.refresh)
         refresh_btn.pack(side=tk.LEFT, padx=(0, 10))
         
         # Close button
@@ -121,6 +132,146 @@ class BudgetWindow:
         # Bind Enter key to set budget
         self.root.bind('<Return>', lambda e: self.set_budget())
     
+    def create_category_budget_section(self):
+        """Create the per-category limit form and status table"""
+        category_frame = ttk.LabelFrame(self.main_frame, text="Category Budgets", padding="15")
+        category_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+        
+        form_frame = ttk.Frame(category_frame)
+        form_frame.pack(fill=tk.X)
+        
+        ttk.Label(form_frame, text="Category:", font=('Arial', 10, 'bold')).grid(
+            row=0, column=0, sticky=tk.W, padx=(0, 10))
+        self.category_var = tk.StringVar()
+        self.category_combo = ttk.Combobox(form_frame, textvariable=self.category_var,
+                                           state='readonly', width=16)
+        self.category_combo.grid(row=0, column=1, sticky=tk.W)
+        
+        ttk.Label(form_frame, text="Limit ($):", font=('Arial', 10, 'bold')).grid(
+            row=0, column=2, sticky=tk.W, padx=(10, 10))
+        self.category_limit_entry = ttk.Entry(form_frame, width=12)
+        self.category_limit_entry.grid(row=0, column=3, sticky=tk.W)
+        
+        ttk.Button(form_frame, text="Set", command=self.set_category_limit).grid(
+            row=0, column=4, padx=(10, 0))
+        ttk.Button(form_frame, text="Remove", command=self.remove_category_limit).grid(
+            row=0, column=5, padx=(5, 0))
+        
+        # Status table: one row per category with a limit or spending this month
+        columns = ('category', 'limit', 'spent', 'remaining')
+        self.category_tree = ttk.Treeview(category_frame, columns=columns, show='headings', height=8)
+        for column, heading, width in (('category', 'Category', 160), ('limit', 'Limit', 110),
+                                       ('spent', 'Spent', 110), ('remaining', 'Remaining', 110)):
+            self.category_tree.heading(column, text=heading)
+            self.category_tree.column(column, width=width, anchor=tk.W if column == 'category' else tk.E)
+        self.category_tree.tag_configure('over', foreground='red')
+        self.category_tree.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.category_tree.bind('<<TreeviewSelect>>', self.on_category_selected)
+        
+        self.category_ids = {}
+    
+    def refresh(self):
+        """Reload the overall and per-category budget status"""
+        self.load_budget_data()
+        self.load_category_budgets()
+    
+    def load_category_budgets(self):
+        """Load every category's limit and spending in one query, in the background"""
+        month_start, _ = month_range(get_current_month())
+        load_names = not self.category_ids
+        self.queries.run('category_budgets',
+                         lambda: (category_registry.items() if load_names else None,
+                                  budget_status(self.user_id, month_start)),
+                         self.show_category_budgets,
+                         lambda e: show_error(f"Error loading category budgets: {str(e)}"))
+    
+    def show_category_budgets(self, result):
+        """Fill the category combobox and status table on the Tk thread"""
+        categories, status = result
+        try:
+            if categories:
+                self.category_ids = {name: category_id for category_id, name in categories}
+                self.category_combo['values'] = list(self.category_ids)
+            
+            if status is None:
+                show_error("Could not load category budgets")
+                return
+            
+            for item in self.category_tree.get_children():
+                self.category_tree.delete(item)
+            for line in status:
+                limit = format_currency(line.limit) if line.limit is not None else "—"
+                remaining = format_currency(line.remaining) if line.limit is not None else "—"
+                self.category_tree.insert('', 'end', values=(
+                    line.category_name, limit, format_currency(line.spent), remaining
+                ), tags=('over',) if line.over_budget else ())
+            
+        except Exception as e:
+            show_error(f"Error loading category budgets: {str(e)}")
+    
+    def on_category_selected(self, event):
+        """Copy the selected row into the form for editing"""
+        selection = self.category_tree.selection()
+        if not selection:
+            return
+        name, limit = self.category_tree.item(selection[0])['values'][:2]
+        self.category_var.set(name)
+        self.category_limit_entry.delete(0, tk.END)
+        if limit != "—":
+            self.category_limit_entry.insert(0, str(Money.parse(str(limit))))
+    
+    def set_category_limit(self):
+        """Set this month's limit for the selected category"""
+        try:
+            category_id = self.category_ids.get(self.category_var.get())
+            if category_id is None:
+                show_error("Please select a category")
+                return
+            
+            try:
+                limit = Money.parse(self.category_limit_entry.get().strip())
+                if limit < 0:
+                    show_error("Budget limit must be positive")
+                    return
+            except ValueError:
+                show_error("Please enter a valid amount")
+                return
+            
+            month_start, _ = month_range(get_current_month())
+            self.queries.run('category_save',
+                             lambda: set_category_budget(self.user_id, category_id, month_start, limit),
+                             lambda saved: self.on_category_limit_saved(saved, "Failed to set category budget"),
+                             lambda e: show_error(f"Error setting category budget: {str(e)}"))
+                
+        except Exception as e:
+            show_error(f"Error setting category budget: {str(e)}")
+    
+    def remove_category_limit(self):
+        """Remove this month's limit for the selected category"""
+        category_id = self.category_ids.get(self.category_var.get())
+        if category_id is None:
+            show_error("Please select a category")
+            return
+        
+        month_start, _ = month_range(get_current_month())
+        self.queries.run('category_save',
+                         lambda: clear_category_budget(self.user_id, category_id, month_start),
+                         lambda saved: self.on_category_limit_saved(saved, "Failed to remove category budget",
+                                                                    clear_entry=True),
+                         lambda e: show_error(f"Error removing category budget: {str(e)}"))
+    
+    def on_category_limit_saved(self, saved, failure_message, clear_entry=False):
+        """Reload the status table after a category limit was set or removed"""
+        if not saved:
+            show_error(failure_message)
+            return
+        
+        if clear_entry:
+            self.category_limit_entry.delete(0, tk.END)
+        self.load_category_budgets()
+        if self.callback:
+            self.callback()
+    
     def create_budget_status_labels(self):
         """Create labels for budget status display"""
         # Budget limit label
@@ -145,33 +296,45 @@ class BudgetWindow:
         self.remaining_label.grid(row=2, column=1, sticky=tk.W, padx=(10, 0), pady=5)
     
     def load_budget_data(self):
-        """Load current budget data"""
+        """Load the current budget and spending in the background"""
+        self.queries.run('budget', self.fetch_budget_data, self.show_budget_data,
+                         lambda e: show_error(f"Error loading budget data: {str(e)}"))
+    
+    def fetch_budget_data(self):
+        """This month's (budget limit, spending, whether a budget is set); runs on a worker thread"""
+        current_month = get_current_month()
+        
+        # Get current budget limit
+        budget_query = f"""
+            SELECT {cents_sql('limit_amount')} as limit_amount FROM budget 
+            WHERE user_id = %s AND month = %s
+        """
+        budget_result = db.execute_query(budget_query, (self.user_id, current_month))
+        
+        budget_limit = Money(0)
+        if budget_result and len(budget_result) > 0:
+            budget_limit = Money(budget_result[0][0])
+        
+        # Get current month expenses
+        expense_query = f"""
+            SELECT {cents_sql('COALESCE(SUM(total), 0)')} as total_expense
+            FROM monthly_summary 
+            WHERE user_id = %s AND type = 'Expense' AND month = %s
+        """
+        month_start, _ = month_range(current_month)
+        expense_result = db.execute_query(expense_query, (self.user_id, month_start))
+        current_spending = Money(expense_result[0][0]) if expense_result else Money(0)
+        
+        return budget_limit, current_spending, bool(budget_result)
+    
+    def show_budget_data(self, data):
+        """Display the loaded budget status on the Tk thread"""
+        budget_limit, current_spending, has_budget = data
         try:
-            current_month = get_current_month()
-            
-            # Get current budget limit
-            budget_query = """
-                SELECT limit_amount FROM budget 
-                WHERE user_id = %s AND month = %s
-            """
-            budget_result = db.execute_query(budget_query, (self.user_id, current_month))
-            
-            budget_limit = 0
-            if budget_result and len(budget_result) > 0:
-                budget_limit = float(budget_result[0][0])
+            if has_budget:
                 self.limit_entry.delete(0, tk.END)
                 self.limit_entry.insert(0, str(budget_limit))
             
-            # Get current month expenses
-            expense_query = """
-                SELECT COALESCE(SUM(amount), 0) as total_expense
-                FROM transaction 
-                WHERE user_id = %s AND type = 'Expense' 
-                AND DATE_FORMAT(date, '%%Y-%%m') = %s
-            """
-            expense_result = db.execute_query(expense_query, (self.user_id, current_month))
-            current_spending = float(expense_result[0][0]) if expense_result else 0
-            
             # Update labels
             self.budget_limit_label.config(text=format_currency(budget_limit))
             self.spending_label.config(text=format_currency(current_spending))
@@ -215,7 +378,7 @@ class BudgetWindow:
             
             # Validate amount
             try:
-                limit_amount = float(limit_str)
+                limit_amount = Money.parse(limit_str)
                 if limit_amount < 0:
                     show_error("Budget limit must be positive")
                     return
@@ -224,45 +387,59 @@ class BudgetWindow:
                 return
             
             current_month = get_current_month()
-            
-            # Check if budget already exists
-            check_query = """
-                SELECT budget_id FROM budget 
-                WHERE user_id = %s AND month = %s
-            """
-            existing_budget = db.execute_query(check_query, (self.user_id, current_month))
-            
-            if existing_budget and len(existing_budget) > 0:
-                # Update existing budget
-                update_query = """
-                    UPDATE budget SET limit_amount = %s 
-                    WHERE user_id = %s AND month = %s
-                """
-                if db.execute_query(update_query, (limit_amount, self.user_id, current_month)):
-                    show_success("Budget updated successfully!")
-                else:
-                    show_error("Failed to update budget")
-            else:
-                # Insert new budget
-                insert_query = """
-                    INSERT INTO budget (user_id, month, limit_amount)
-                    VALUES (%s, %s, %s)
-                """
-                if db.execute_query(insert_query, (self.user_id, current_month, limit_amount)):
-                    show_success("Budget set successfully!")
-                else:
-                    show_error("Failed to set budget")
-            
-            # Refresh data
-            self.load_budget_data()
-            
-            # Call callback to refresh dashboard
-            if self.callback:
-                self.callback()
+            self.queries.run('save', lambda: self.save_budget(current_month, limit_amount),
+                             self.on_budget_saved,
+                             lambda e: show_error(f"Error setting budget: {str(e)}"))
                 
         except Exception as e:
             show_error(f"Error setting budget: {str(e)}")
     
+    def save_budget(self, current_month, limit_amount):
+        """Create or update the month's budget; runs on a worker thread
+
+        Returns ``(saved, message)`` for on_budget_saved.
+        """
+        # Check if budget already exists
+        check_query = """
+            SELECT budget_id FROM budget 
+            WHERE user_id = %s AND month = %s
+        """
+        existing_budget = db.execute_query(check_query, (self.user_id, current_month))
+        
+        if existing_budget and len(existing_budget) > 0:
+            # Update existing budget
+            update_query = """
+                UPDATE budget SET limit_amount = %s 
+                WHERE user_id = %s AND month = %s
+            """
+            if db.execute_query(update_query, (limit_amount.to_decimal(), self.user_id, current_month)):
+                return True, "Budget updated successfully!"
+            return False, "Failed to update budget"
+        
+        # Insert new budget
+        insert_query = """
+            INSERT INTO budget (user_id, month, limit_amount)
+            VALUES (%s, %s, %s)
+        """
+        if db.execute_query(insert_query, (self.user_id, current_month, limit_amount.to_decimal())):
+            return True, "Budget set successfully!"
+        return False, "Failed to set budget"
+    
+    def on_budget_saved(self, outcome):
+        """Report the outcome of save_budget and refresh on the Tk thread"""
+        saved, message = outcome
+        if saved:
+            show_success(message)
+        else:
+            show_error(message)
+        
+        # Refresh data
+        self.load_budget_data()
+        
+        # Call callback to refresh dashboard
+        if self.callback:
+            self.callback()
+    
     def close_window(self):
         """Close the window"""
         self.root.destroy()
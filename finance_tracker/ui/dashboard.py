@@ -3,19 +3,34 @@ from tkinter import ttk, messagebox
 from datetime import datetime, timedelta
 # Assuming these imports are correct and available
 from db.connection import db
-from utils.helpers import format_currency, get_current_month, show_error
-from utils.charts import ChartGenerator
+from db.categories import category_registry
+from utils.helpers import format_currency, show_error
+from utils.money import Money, cents_sql
+from utils.charts import ChartGenerator, GroupedBarChart, PieChart
+from db.columnar import ColumnBuilder
+from db.rollup import MONTHLY_TOTALS_QUERY, MonthlyTotals, month_window, monthly_totals_params
+from db.transactions import TransactionPage, fetch_transactions_page, page_params, page_query
+from ui.async_bridge import TkQueryBridge
+from ui.widgets import TransactionList
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 import tkinter.font as tkFont
+import logging
+import time
+
+# Time-to-first-dashboard at INFO; silent unless the application configures logging
+startup_logger = logging.getLogger('finance_tracker.startup')
 
 # Base Frame Class
 class BaseFrame(tk.Frame):
+    # Background requests that only load data for display
+    REFRESH_KEYS = ('refresh',)
+    
     def __init__(self, parent, user_id, colors):
         super().__init__(parent, bg=colors['bg_main'])
         self.user_id = user_id
         self.colors = colors
+        # Runs SQL on worker threads and hands results back to the Tk thread
+        self.queries = TkQueryBridge(self)
         self.setup_frame()
     
     def setup_frame(self):
@@ -25,11 +40,28 @@ class BaseFrame(tk.Frame):
     def refresh_data(self):
         """Override this method in subclasses to refresh frame data"""
         pass
+    
+    def on_hide(self):
+        """Drop loads still in flight; showing the frame again refreshes it"""
+        for key in self.REFRESH_KEYS:
+            self.queries.cancel(key)
 
 # Dashboard Frame
 class DashboardFrame(BaseFrame):
+    # Loading placeholders appear only if a refresh takes longer than this
+    # many milliseconds, so a quick refresh does not flash them
+    PLACEHOLDER_DELAY = 150
+    
     def setup_frame(self):
         """Create dashboard content"""
+        # Bumped by every refresh and hide; stale render steps check it
+        self.generation = 0
+        self.placeholder_after = None
+        # perf_counter() when data first reached the screen; on_first_data()
+        # is called then, if set
+        self.first_data_at = None
+        self.on_first_data = None
+        
         # Configure grid weights
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=0)  # Header
@@ -147,6 +179,8 @@ class DashboardFrame(BaseFrame):
                                 bg=self.colors['bg_cards'], fg=self.colors['text_primary'])
         chart_title1.pack(pady=25)
         
+        self.income_expense_chart_body = self.create_chart_body(self.income_expense_chart_frame)
+        
         # Right chart - Expense by Category
         self.category_chart_frame = tk.Frame(charts_frame, bg=self.colors['bg_cards'], relief='groove', bd=1)
         self.category_chart_frame.grid(row=0, column=1, sticky='nsew', padx=(12, 0))
@@ -155,6 +189,20 @@ class DashboardFrame(BaseFrame):
                                 font=('Segoe UI', 16, 'bold'), 
                                 bg=self.colors['bg_cards'], fg=self.colors['text_primary'])
         chart_title2.pack(pady=25)
+        
+        self.category_chart_body = self.create_chart_body(self.category_chart_frame)
+        
+        # Charts are created on first refresh and updated in place after that
+        self.income_expense_chart = None
+        self.category_chart = None
+    
+    def create_chart_body(self, chart_frame):
+        """Area under a chart title holding the chart or a loading/error message"""
+        body = tk.Frame(chart_frame, bg=self.colors['bg_cards'])
+        body.pack(fill=tk.BOTH, expand=True)
+        body.message = tk.Label(body, text="", font=('Segoe UI', 12),
+                                bg=self.colors['bg_cards'], fg=self.colors['text_secondary'])
+        return body
     
     def create_recent_transactions(self):
         """Create recent transactions section"""
@@ -169,43 +217,134 @@ class DashboardFrame(BaseFrame):
                                 bg=self.colors['bg_cards'], fg=self.colors['text_primary'])
         trans_title.pack(anchor=tk.W, padx=25, pady=25)
         
-        self.transactions_list = tk.Frame(self.transactions_container, bg=self.colors['bg_cards'])
+        self.transactions_list = TransactionList(self.transactions_container, self.colors)
         self.transactions_list.pack(fill=tk.X, padx=25, pady=(0, 25))
     
     def refresh_data(self):
-        """Load and display dashboard data"""
+        """Load dashboard data in the background and display it when ready"""
+        self.generation += 1
+        self.cancel_placeholders()
+        self.placeholder_after = self.after(self.PLACEHOLDER_DELAY, self.show_placeholders)
+        self.queries.run('refresh', self.fetch_dashboard_data, self.apply_dashboard_data,
+                         self.on_refresh_failed)
+    
+    def on_hide(self):
+        """Drop an in-flight refresh and any chart still waiting to be drawn"""
+        super().on_hide()
+        self.generation += 1
+        self.cancel_placeholders()
+    
+    def on_refresh_failed(self, error):
+        """Report a failed refresh on the Tk thread"""
+        self.cancel_placeholders()
+        show_error(f"Error loading dashboard data: {str(error)}")
+    
+    def cancel_placeholders(self):
+        """Stop a pending switch to the loading placeholders"""
+        if self.placeholder_after is not None:
+            self.after_cancel(self.placeholder_after)
+            self.placeholder_after = None
+    
+    def show_placeholders(self):
+        """Put the cards, charts and recent list into their loading state"""
+        self.placeholder_after = None
+        for card in (self.income_card, self.expense_card, self.balance_card):
+            card.amount_label.config(text="—", fg=self.colors['text_secondary'])
+            card.arrow_label.config(text="")
+            card.change_label.config(text="Loading...", fg=self.colors['text_secondary'])
+        
+        # Charts are hidden, not destroyed, so the next refresh can reuse them
+        self.show_chart_message(self.income_expense_chart_body, self.income_expense_chart, "Loading chart...")
+        self.show_chart_message(self.category_chart_body, self.category_chart, "Loading chart...")
+        
+        self.transactions_list.show_message("Loading transactions...")
+    
+    def fetch_dashboard_data(self):
+        """Run every dashboard query; called on a database worker thread"""
+        # Thirteen months of income and expense in one grouped query over the
+        # monthly_summary rollup; it feeds the cards and the bar chart alike
+        months = month_window()
+        current_month, prev_month = months[-1], months[-2]
+        
+        # Expense by category for current month
+        chart_query = f"""
+            SELECT c.category_name, {cents_sql('COALESCE(SUM(s.total), 0)')} as total_amount
+            FROM monthly_summary s
+            JOIN category c ON c.category_id = s.category_id
+            WHERE s.user_id = %s AND s.type = 'Expense' AND s.month = %s
+            GROUP BY c.category_id, c.category_name
+            HAVING total_amount > 0
+            ORDER BY total_amount DESC
+        """
+        
+        # Ship every query for the screen to the server in one round trip
+        statements = [
+            (MONTHLY_TOTALS_QUERY, monthly_totals_params(self.user_id, months)),
+            (chart_query, (self.user_id, current_month)),
+            (page_query(), page_params(self.user_id, 5)),
+        ]
+        
+        results = db.execute_batch(statements)
+        if results is None:
+            raise RuntimeError("Could not load dashboard data")
+        
+        totals = MonthlyTotals.from_rows(months, results[0])
+        data = {
+            'income': totals.total(current_month, 'Income'),
+            'prev_income': totals.total(prev_month, 'Income'),
+            'expense': totals.total(current_month, 'Expense'),
+            'prev_expense': totals.total(prev_month, 'Expense'),
+        }
+        
+        # Income vs expense for the last 6 months, oldest to newest
+        data['months'] = [
+            {
+                'month': month.strftime('%b'),
+                'income': totals.total(month, 'Income').dollars,
+                'expense': totals.total(month, 'Expense').dollars
+            }
+            for month in months[-6:]
+        ]
+        
+        categories = ColumnBuilder(['category_name', 'total_amount'], {'total_amount': 'cents'})
+        categories.add(results[1])
+        data['categories'] = categories.columns()
+        data['recent'] = TransactionPage.from_rows(results[-1], 5).rows
+        
+        return data
+    
+    def apply_dashboard_data(self, data):
+        """Display data returned by fetch_dashboard_data on the Tk thread
+        
+        The cards update at once; each chart and the recent list is drawn in
+        its own idle callback so input is handled between the slow renders.
+        """
+        self.cancel_placeholders()
+        self.update_summary_cards(data)
+        if self.first_data_at is None:
+            self.first_data_at = time.perf_counter()
+            if self.on_first_data:
+                self.on_first_data()
+        self.render_steps(self.generation, [
+            lambda: self.create_income_vs_expense_chart(data['months']),
+            lambda: self.create_expense_category_chart(data['categories']),
+            lambda: self.load_recent_transactions(data['recent']),
+        ])
+    
+    def render_steps(self, generation, steps):
+        """Run ``steps`` one idle callback at a time until a newer refresh starts"""
+        if generation != self.generation or not steps:
+            return
+        steps[0]()
+        self.after_idle(lambda: self.render_steps(generation, steps[1:]))
+    
+    def update_summary_cards(self, data):
+        """Fill the income, expense and balance cards"""
         try:
-            # Get current month and previous month
-            current_month = get_current_month()
-            prev_month = (datetime.now().replace(day=1) - timedelta(days=1)).strftime('%Y-%m')
-            
-            # Get total income for current month
-            income_query = """
-                SELECT COALESCE(SUM(amount), 0) as total_income
-                FROM transaction 
-                WHERE user_id = %s AND type = 'Income' 
-                AND DATE_FORMAT(date, '%%Y-%%m') = %s
-            """
-            income_result = db.execute_query(income_query, (self.user_id, current_month))
-            total_income = income_result[0][0] if income_result else 0
-            
-            # Get total income for previous month
-            prev_income_result = db.execute_query(income_query, (self.user_id, prev_month))
-            prev_income = prev_income_result[0][0] if prev_income_result else 0
-            
-            # Get total expenses for current month
-            expense_query = """
-                SELECT COALESCE(SUM(amount), 0) as total_expense
-                FROM transaction 
-                WHERE user_id = %s AND type = 'Expense' 
-                AND DATE_FORMAT(date, '%%Y-%%m') = %s
-            """
-            expense_result = db.execute_query(expense_query, (self.user_id, current_month))
-            total_expense = expense_result[0][0] if expense_result else 0
-            
-            # Get total expenses for previous month
-            prev_expense_result = db.execute_query(expense_query, (self.user_id, prev_month))
-            prev_expense = prev_expense_result[0][0] if prev_expense_result else 0
+            total_income = data['income']
+            prev_income = data['prev_income']
+            total_expense = data['expense']
+            prev_expense = data['prev_expense']
             
             # Calculate balance
             balance = total_income - total_expense
@@ -217,8 +356,10 @@ class DashboardFrame(BaseFrame):
             balance_change = self.calculate_percentage_change(prev_balance, balance)
             
             # Update summary cards
-            self.income_card.amount_label.config(text=format_currency(total_income))
-            self.expense_card.amount_label.config(text=format_currency(total_expense))
+            self.income_card.amount_label.config(text=format_currency(total_income),
+                                                 fg=self.colors['text_primary'])
+            self.expense_card.amount_label.config(text=format_currency(total_expense),
+                                                  fg=self.colors['text_primary'])
             self.balance_card.amount_label.config(text=format_currency(balance))
             
             # Update change labels with arrows and percentages
@@ -231,13 +372,6 @@ class DashboardFrame(BaseFrame):
                 self.balance_card.amount_label.config(fg=self.colors['accent_green'])
             else:
                 self.balance_card.amount_label.config(fg=self.colors['accent_red'])
-            
-            # Load charts
-            self.create_income_vs_expense_chart()
-            self.create_expense_category_chart()
-            
-            # Load recent transactions
-            self.load_recent_transactions()
                 
         except Exception as e:
             show_error(f"Error loading dashboard data: {str(e)}")
@@ -268,51 +402,9 @@ class DashboardFrame(BaseFrame):
         card.arrow_label.config(text=arrow, fg=color)
         card.change_label.config(text=change_text, fg=color)
     
-    def create_income_vs_expense_chart(self):
-        """Create income vs expense bar chart"""
+    def create_income_vs_expense_chart(self, months_data):
+        """Show income vs expense bars, creating the chart on first use"""
         try:
-            # Clear existing chart
-            for widget in self.income_expense_chart_frame.winfo_children():
-                if isinstance(widget, tk.Frame) and widget != self.income_expense_chart_frame.winfo_children()[0]:
-                    widget.destroy()
-            
-            # Get data for last 6 months
-            current_date = datetime.now()
-            months_data = []
-            
-            for i in range(6):
-                month_date = current_date - timedelta(days=30*i)
-                month_str = month_date.strftime('%Y-%m')
-                
-                # Get income for this month
-            income_query = """
-                SELECT COALESCE(SUM(amount), 0) as total_income
-                FROM transaction 
-                WHERE user_id = %s AND type = 'Income' 
-                AND DATE_FORMAT(date, '%%Y-%%m') = %s
-            """
-            income_result = db.execute_query(income_query, (self.user_id, month_str))
-            income = income_result[0][0] if income_result else 0
-            
-                # Get expenses for this month
-            expense_query = """
-                SELECT COALESCE(SUM(amount), 0) as total_expense
-                FROM transaction 
-                WHERE user_id = %s AND type = 'Expense' 
-                AND DATE_FORMAT(date, '%%Y-%%m') = %s
-            """
-            expense_result = db.execute_query(expense_query, (self.user_id, month_str))
-            expense = expense_result[0][0] if expense_result else 0
-            
-            months_data.append({
-                'month': month_date.strftime('%b'),
-                'income': float(income),
-                'expense': float(expense)
-            })
-            
-            # Reverse to show oldest to newest
-            months_data.reverse()
-            
             # Add demo data if no real data
             if not any(data['income'] > 0 or data['expense'] > 0 for data in months_data):
                 demo_data = [
@@ -325,154 +417,97 @@ class DashboardFrame(BaseFrame):
                 ]
                 months_data = demo_data
             
-            # Create matplotlib figure
-            fig = Figure(figsize=(6, 4), dpi=100, facecolor=self.colors['bg_cards'])
-            ax = fig.add_subplot(111, facecolor=self.colors['bg_cards'])
+            if self.income_expense_chart is None:
+                self.income_expense_chart = self.build_income_vs_expense_chart()
             
             months = [data['month'] for data in months_data]
             income_values = [data['income'] for data in months_data]
             expense_values = [data['expense'] for data in months_data]
             
-            x = range(len(months))
-            width = 0.35
-            
-            # Use theme colors
-            income_color = self.colors['accent_green']
-            expense_color = self.colors['accent_red']
-            
-            ax.bar([i - width/2 for i in x], income_values, width, label='Income', 
-                    color=income_color, alpha=0.8, edgecolor='white', linewidth=1)
-            ax.bar([i + width/2 for i in x], expense_values, width, label='Expense', 
-                    color=expense_color, alpha=0.8, edgecolor='white', linewidth=1)
-            
-            ax.set_xlabel('Month', color=self.colors['text_primary'], fontsize=11)
-            ax.set_ylabel('Amount ($)', color=self.colors['text_primary'], fontsize=11)
-            ax.set_xticks(x)
-            ax.set_xticklabels(months, color=self.colors['text_primary'])
-            ax.tick_params(colors=self.colors['text_primary'])
-            
-            # Customize legend
-            legend = ax.legend(loc='upper right', frameon=True, fancybox=True, shadow=True)
-            legend.get_frame().set_facecolor(self.colors['bg_cards'])
-            legend.get_frame().set_edgecolor(self.colors['border'])
-            
-            ax.grid(True, alpha=0.3, color=self.colors['border'])
-            
-            # Format y-axis as currency
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-            
-            # Set background colors
-            ax.spines['bottom'].set_color(self.colors['border'])
-            ax.spines['top'].set_color(self.colors['border'])
-            ax.spines['right'].set_color(self.colors['border'])
-            ax.spines['left'].set_color(self.colors['border'])
-            
-            fig.tight_layout()
-            
-            # Display chart
-            canvas = FigureCanvasTkAgg(fig, self.income_expense_chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+            # The figure and canvas are reused; only the bars and ticks change
+            self.income_expense_chart.update(months, [income_values, expense_values])
+            if not self.income_expense_chart.ax.get_legend():
+                legend = self.income_expense_chart.ax.legend(loc='upper right', frameon=True,
+                                                             fancybox=True, shadow=True)
+                legend.get_frame().set_facecolor(self.colors['bg_cards'])
+                legend.get_frame().set_edgecolor(self.colors['border'])
+            self.show_chart(self.income_expense_chart_body, self.income_expense_chart)
             
         except Exception as e:
-            error_label = tk.Label(self.income_expense_chart_frame, 
-                                   text=f"Error loading chart: {str(e)}",
-                                   font=('Segoe UI', 12), 
-                                   bg=self.colors['bg_cards'], fg=self.colors['accent_red'])
-            error_label.pack(pady=50)
-    
-    def create_expense_category_chart(self):
-        """Create expense by category pie chart"""
+            self.show_chart_message(self.income_expense_chart_body, self.income_expense_chart,
+                                    f"Error loading chart: {str(e)}", self.colors['accent_red'])
+    
+    def build_income_vs_expense_chart(self):
+        """Create the themed income vs expense bar chart (once per frame)"""
+        chart = GroupedBarChart(['Income', 'Expense'],
+                                [self.colors['accent_green'], self.colors['accent_red']],
+                                width=0.35,
+                                bar_style={'alpha': 0.8, 'edgecolor': 'white', 'linewidth': 1},
+                                parent=self.income_expense_chart_body, figsize=(6, 4), dpi=100,
+                                facecolor=self.colors['bg_cards'])
+        ax = chart.ax
+        
+        ax.set_xlabel('Month', color=self.colors['text_primary'], fontsize=11)
+        ax.set_ylabel('Amount ($)', color=self.colors['text_primary'], fontsize=11)
+        ax.tick_params(colors=self.colors['text_primary'])
+        ax.grid(True, alpha=0.3, color=self.colors['border'])
+        
+        # Format y-axis as currency
+        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
+        
+        # Set background colors
+        for spine in ax.spines.values():
+            spine.set_color(self.colors['border'])
+        return chart
+    
+    def create_expense_category_chart(self, chart_result):
+        """Show the expense by category pie, creating the chart on first use"""
         try:
-            # Clear existing chart
-            for widget in self.category_chart_frame.winfo_children():
-                if isinstance(widget, tk.Frame) and widget != self.category_chart_frame.winfo_children()[0]:
-                    widget.destroy()
-            
-            # Get expense data by category for current month
-            current_month = get_current_month()
-            chart_query = """
-                SELECT c.category_name, COALESCE(SUM(t.amount), 0) as total_amount
-                FROM category c
-                LEFT JOIN transaction t ON c.category_id = t.category_id 
-                    AND t.user_id = %s AND t.type = 'Expense' 
-                    AND DATE_FORMAT(t.date, '%%Y-%%m') = %s
-                GROUP BY c.category_id, c.category_name
-                HAVING total_amount > 0
-                ORDER BY total_amount DESC
-            """
-            
-            chart_result = db.execute_query(chart_query, (self.user_id, current_month))
-            
             # Use demo data if no real data
-            if not chart_result:
+            if not chart_result or not len(chart_result['category_name']):
                 demo_categories = ['Food & Dining', 'Transportation', 'Entertainment', 'Shopping', 'Bills']
                 demo_amounts = [1200, 800, 600, 400, 300]
                 categories = demo_categories
                 amounts = demo_amounts
             else:
-                categories = [row[0] for row in chart_result]
-                amounts = [float(row[1]) for row in chart_result]
-                
-            # Create matplotlib figure
-            fig = Figure(figsize=(6, 4), dpi=100, facecolor=self.colors['bg_cards'])
-            ax = fig.add_subplot(111, facecolor=self.colors['bg_cards'])
-            
-            # Use theme colors
-            colors = [self.colors['accent_red'], self.colors['accent_blue'], 
-                      self.colors['accent_green'], '#f39c12', '#9b59b6', '#1abc9c']
-            
-            wedges, texts, autotexts = ax.pie(amounts, labels=categories, autopct='%1.1f%%', 
-                                             colors=colors[:len(categories)], startangle=90,
-                                             textprops={'color': self.colors['text_primary'], 'fontsize': 10})
-            
-            # Customize text
-            for autotext in autotexts:
-                autotext.set_color('white')
-                autotext.set_fontweight('bold')
-                autotext.set_fontsize(9)
-            
-            # Customize labels
-            for text in texts:
-                text.set_color(self.colors['text_primary'])
-                text.set_fontsize(10)
-                text.set_fontweight('bold')
-                
-            ax.axis('equal')
-            
-            fig.tight_layout()
-            
-            # Display chart
-            canvas = FigureCanvasTkAgg(fig, self.category_chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+                categories = chart_result['category_name'].tolist()
+                amounts = (chart_result['total_amount'] / 100).tolist()
+            
+            if self.category_chart is None:
+                # Use theme colors
+                colors = [self.colors['accent_red'], self.colors['accent_blue'], 
+                          self.colors['accent_green'], '#f39c12', '#9b59b6', '#1abc9c']
+                self.category_chart = PieChart(
+                    colors, startangle=90,
+                    label_style={'color': self.colors['text_primary'], 'fontsize': 10,
+                                 'fontweight': 'bold'},
+                    pct_style={'color': 'white', 'fontweight': 'bold', 'fontsize': 9},
+                    parent=self.category_chart_body, figsize=(6, 4), dpi=100,
+                    facecolor=self.colors['bg_cards'])
+            
+            # Wedges move in place unless the number of categories changed
+            self.category_chart.update(categories, amounts)
+            self.show_chart(self.category_chart_body, self.category_chart)
             
         except Exception as e:
-            error_label = tk.Label(self.category_chart_frame, 
-                                   text=f"Error loading chart: {str(e)}",
-                                   font=('Segoe UI', 12), 
-                                   bg=self.colors['bg_cards'], fg=self.colors['accent_red'])
-            error_label.pack(pady=50)
-    
-    def load_recent_transactions(self):
-        """Load and display recent transactions"""
+            self.show_chart_message(self.category_chart_body, self.category_chart,
+                                    f"Error loading chart: {str(e)}", self.colors['accent_red'])
+    
+    def show_chart(self, body, chart):
+        """Show ``chart`` in its body frame in place of any message"""
+        body.message.pack_forget()
+        chart.widget.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+    
+    def show_chart_message(self, body, chart, text, color=None):
+        """Show ``text`` in a chart's body frame, hiding the chart if it exists"""
+        if chart is not None:
+            chart.widget.pack_forget()
+        body.message.config(text=text, fg=color or self.colors['text_secondary'])
+        body.message.pack(pady=50)
+    
+    def load_recent_transactions(self, result):
+        """Display recent transactions"""
         try:
-            # Clear existing transactions
-            for widget in self.transactions_list.winfo_children():
-                widget.destroy()
-            
-            # Get recent transactions
-            query = """
-                SELECT t.description, t.amount, t.type, t.date, c.category_name
-                FROM transaction t
-                LEFT JOIN category c ON t.category_id = c.category_id
-                WHERE t.user_id = %s
-                ORDER BY t.date DESC, t.transaction_id DESC
-                LIMIT 5
-            """
-            
-            result = db.execute_query(query, (self.user_id,))
-            
             # Use demo data if no real data
             if not result:
                 demo_transactions = [
@@ -484,73 +519,17 @@ class DashboardFrame(BaseFrame):
                 ]
                 result = demo_transactions
             
-            # Add Transaction List Headers
-            header_frame = tk.Frame(self.transactions_list, bg=self.colors['bg_cards'])
-            header_frame.pack(fill=tk.X, pady=(0, 10))
-            header_frame.grid_columnconfigure(1, weight=1)
-            
-            # Description Header
-            tk.Label(header_frame, text="Description / Category", font=('Segoe UI', 11, 'bold'), 
-                     bg=self.colors['bg_cards'], fg=self.colors['text_secondary']).grid(row=0, column=1, sticky='w', padx=(12, 0))
-            # Date/Amount Header
-            tk.Label(header_frame, text="Date / Amount", font=('Segoe UI', 11, 'bold'), 
-                     bg=self.colors['bg_cards'], fg=self.colors['text_secondary']).grid(row=0, column=2, sticky='e')
-            
-            # Data Rows
-            for i, (description, amount, trans_type, date, category) in enumerate(result):
-                trans_frame = tk.Frame(self.transactions_list, bg=self.colors['bg_cards'])
-                trans_frame.pack(fill=tk.X, pady=8)
-                trans_frame.grid_columnconfigure(1, weight=1)
-                
-                # Icon based on type
-                icon = "💰" if trans_type == 'Income' else "💸"
-                
-                # Amount color
-                amount_color = self.colors['accent_green'] if trans_type == 'Income' else self.colors['accent_red']
-                amount_prefix = "+" if trans_type == 'Income' else "-"
-                
-                # Icon (Column 0)
-                icon_label = tk.Label(trans_frame, text=icon, font=('Segoe UI', 14), 
-                                     bg=self.colors['bg_cards'], fg=self.colors['text_primary'])
-                icon_label.grid(row=0, column=0, rowspan=2, sticky='w', padx=(0, 12))
-                
-                # Description and category frame (Column 1 - expands)
-                desc_label = tk.Label(trans_frame, text=description, 
-                                     font=('Segoe UI', 13, 'bold'), 
-                                     bg=self.colors['bg_cards'], fg=self.colors['text_primary'])
-                desc_label.grid(row=0, column=1, sticky='w')
-                
-                if category:
-                    cat_label = tk.Label(trans_frame, text=category, 
-                                         font=('Segoe UI', 11), 
-                                         bg=self.colors['bg_cards'], fg=self.colors['text_secondary'])
-                    cat_label.grid(row=1, column=1, sticky='w')
-                
-                # Date and amount (Column 2)
-                date_label = tk.Label(trans_frame, text=date.strftime('%Y-%m-%d'), 
-                                     font=('Segoe UI', 11), 
-                                     bg=self.colors['bg_cards'], fg=self.colors['text_secondary'])
-                date_label.grid(row=0, column=2, sticky='e')
-                
-                amount_label = tk.Label(trans_frame, text=f"{amount_prefix}{format_currency(amount)}", 
-                                       font=('Segoe UI', 13, 'bold'), 
-                                       bg=self.colors['bg_cards'], fg=amount_color)
-                amount_label.grid(row=1, column=2, sticky='e')
-                
-                # Add separator line (except for last item)
-                if i < len(result) - 1:
-                    separator = tk.Frame(self.transactions_list, height=1, bg=self.colors['border'])
-                    separator.pack(fill=tk.X, pady=(12, 0))
+            self.transactions_list.show(result)
             
         except Exception as e:
-            error_label = tk.Label(self.transactions_list, 
-                                   text=f"Error loading transactions: {str(e)}",
-                                   font=('Segoe UI', 12), 
-                                   bg=self.colors['bg_cards'], fg=self.colors['accent_red'])
-            error_label.pack(pady=20)
+            self.transactions_list.show_message(f"Error loading transactions: {str(e)}",
+                                                self.colors['accent_red'])
     
 # Transactions Frame
 class TransactionsFrame(BaseFrame):
+    PAGE_SIZE = 10
+    REFRESH_KEYS = ('refresh', 'older')
+    
     def setup_frame(self):
         """Create transactions content"""
         # Configure grid weights
@@ -699,23 +678,23 @@ class TransactionsFrame(BaseFrame):
                         bg=self.colors['bg_cards'], fg=self.colors['text_primary'])
         title.pack(pady=25)
         
-        # Transactions list
-        self.transactions_list = tk.Frame(list_frame, bg=self.colors['bg_cards'])
-        self.transactions_list.pack(fill=tk.BOTH, expand=True, padx=25, pady=(0, 25))
+        # Transactions list; its row widgets are reused from page to page.
+        # Scrolling past the last loaded row fetches the next older page by
+        # keyset, so each page costs the same however far back it is
+        self.next_after = None
+        self.transactions_list = TransactionList(list_frame, self.colors, on_reach_end=self.load_older)
+        self.transactions_list.pack(fill=tk.BOTH, expand=True, padx=25, pady=(0, 20))
     
     def load_categories(self):
-        """Load categories from database"""
-        try:
-            query = "SELECT category_name FROM category ORDER BY category_name"
-            result = db.execute_query(query)
-            
-            if result:
-                categories = [row[0] for row in result]
-                self.category_combo['values'] = categories
-                if categories:
-                    self.category_combo.set(categories[0])
-        except Exception as e:
-            show_error(f"Error loading categories: {str(e)}")
+        """Load categories in the background (read from the database only once per process)"""
+        self.queries.run('categories', category_registry.names, self.show_categories,
+                         lambda e: show_error(f"Error loading categories: {str(e)}"))
+    
+    def show_categories(self, categories):
+        """Fill the category combobox with loaded categories"""
+        if categories:
+            self.category_combo['values'] = categories
+            self.category_combo.set(categories[0])
     
     def on_type_change(self):
         """Handle transaction type change"""
@@ -753,7 +732,7 @@ class TransactionsFrame(BaseFrame):
             
             # Validate amount
             try:
-                amount = float(amount_str)
+                amount = Money.parse(amount_str)
                 if amount <= 0:
                     show_error("Amount must be positive")
                     return
@@ -772,33 +751,42 @@ class TransactionsFrame(BaseFrame):
                 show_error("Please enter a valid date (YYYY-MM-DD)")
                 return
             
-            # Get category ID
-            category_query = "SELECT category_id FROM category WHERE category_name = %s"
-            category_result = db.execute_query(category_query, (category_name,))
-            
-            if not category_result:
-                show_error("Invalid category selected")
-                return
-            
-            category_id = category_result[0][0]
-            
-            # Insert transaction
-            insert_query = """
-                INSERT INTO transaction (user_id, category_id, type, amount, date, description)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            
-            if db.execute_query(insert_query, (self.user_id, category_id, transaction_type, 
-                                            amount, transaction_date, description)):
-                messagebox.showinfo("Success", "Transaction saved successfully!")
-                self.clear_form()
-                self.refresh_data()
-            else:
-                show_error("Failed to save transaction")
+            values = (transaction_type, amount, transaction_date, description)
+            self.queries.run('save', lambda: self.insert_transaction(category_name, *values),
+                             self.on_transaction_saved,
+                             lambda e: show_error(f"Error saving transaction: {str(e)}"))
                 
         except Exception as e:
             show_error(f"Error saving transaction: {str(e)}")
     
+    def insert_transaction(self, category_name, transaction_type, amount, transaction_date, description):
+        """Insert the transaction; called on a database worker thread"""
+        # Get category ID (from the in-process registry, no round trip)
+        category_id = category_registry.id_for(category_name)
+        if category_id is None:
+            return "Invalid category selected"
+        
+        # Insert transaction
+        insert_query = """
+            INSERT INTO transaction (user_id, category_id, type, amount, date, description)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        
+        if db.execute_query(insert_query, (self.user_id, category_id, transaction_type, 
+                                        amount.to_decimal(), transaction_date, description)):
+            return None
+        return "Failed to save transaction"
+    
+    def on_transaction_saved(self, error_message):
+        """Report the outcome of insert_transaction on the Tk thread"""
+        if error_message:
+            show_error(error_message)
+            return
+        
+        messagebox.showinfo("Success", "Transaction saved successfully!")
+        self.clear_form()
+        self.refresh_data()
+    
     def clear_form(self):
         """Clear the form"""
         self.amount_entry.delete(0, tk.END)
@@ -807,26 +795,24 @@ class TransactionsFrame(BaseFrame):
         self.description_text.delete("1.0", tk.END)
     
     def refresh_data(self):
-        """Load and display recent transactions"""
+        """Load the newest page of transactions in the background"""
+        self.queries.cancel('older')
+        self.queries.run('refresh', lambda: fetch_transactions_page(self.user_id, self.PAGE_SIZE),
+                         self.show_transactions)
+    
+    def load_older(self):
+        """Append the next page of older transactions"""
+        if self.next_after is None or self.queries.is_pending('older'):
+            return
+        after = self.next_after
+        self.queries.run('older', lambda: fetch_transactions_page(self.user_id, self.PAGE_SIZE, after),
+                         self.append_transactions)
+    
+    def show_transactions(self, page):
+        """Display the newest page of transactions"""
         try:
-            # Clear existing transactions
-            for widget in self.transactions_list.winfo_children():
-                widget.destroy()
-            
-            # Get recent transactions
-            query = """
-                SELECT t.description, t.amount, t.type, t.date, c.category_name
-                FROM transaction t
-                LEFT JOIN category c ON t.category_id = c.category_id
-                WHERE t.user_id = %s
-                ORDER BY t.date DESC, t.transaction_id DESC
-                LIMIT 10
-            """
-            
-            result = db.execute_query(query, (self.user_id,))
-            
             # Use demo data if no real data
-            if not result:
+            if page is None or not page.rows:
                 demo_transactions = [
                     ("Salary", 5000, "Income", datetime.now() - timedelta(days=1), "Salary"),
                     ("Grocery Shopping", 150, "Expense", datetime.now() - timedelta(days=2), "Food"),
@@ -834,75 +820,30 @@ class TransactionsFrame(BaseFrame):
                     ("Freelance Work", 800, "Income", datetime.now() - timedelta(days=4), "Freelance"),
                     ("Netflix Subscription", 15, "Expense", datetime.now() - timedelta(days=5), "Entertainment")
                 ]
-                result = demo_transactions
-            
-            # Add Transaction List Headers
-            header_frame = tk.Frame(self.transactions_list, bg=self.colors['bg_cards'])
-            header_frame.pack(fill=tk.X, pady=(0, 10))
-            header_frame.grid_columnconfigure(1, weight=1)
+                page = TransactionPage(demo_transactions, None)
             
-            # Description Header
-            tk.Label(header_frame, text="Description / Category", font=('Segoe UI', 11, 'bold'), 
-                     bg=self.colors['bg_cards'], fg=self.colors['text_secondary']).grid(row=0, column=1, sticky='w', padx=(12, 0))
-            # Date/Amount Header
-            tk.Label(header_frame, text="Date / Amount", font=('Segoe UI', 11, 'bold'), 
-                     bg=self.colors['bg_cards'], fg=self.colors['text_secondary']).grid(row=0, column=2, sticky='e')
-            
-            # Data Rows
-            for i, (description, amount, trans_type, date, category) in enumerate(result):
-                trans_frame = tk.Frame(self.transactions_list, bg=self.colors['bg_cards'])
-                trans_frame.pack(fill=tk.X, pady=8)
-                trans_frame.grid_columnconfigure(1, weight=1)
-                
-                # Icon based on type
-                icon = "💰" if trans_type == 'Income' else "💸"
-                
-                # Amount color
-                amount_color = self.colors['accent_green'] if trans_type == 'Income' else self.colors['accent_red']
-                amount_prefix = "+" if trans_type == 'Income' else "-"
-                
-                # Icon (Column 0)
-                icon_label = tk.Label(trans_frame, text=icon, font=('Segoe UI', 14), 
-                                     bg=self.colors['bg_cards'], fg=self.colors['text_primary'])
-                icon_label.grid(row=0, column=0, rowspan=2, sticky='w', padx=(0, 12))
-                
-                # Description and category frame (Column 1 - expands)
-                desc_label = tk.Label(trans_frame, text=description, 
-                                     font=('Segoe UI', 13, 'bold'), 
-                                     bg=self.colors['bg_cards'], fg=self.colors['text_primary'])
-                desc_label.grid(row=0, column=1, sticky='w')
-                
-                if category:
-                    cat_label = tk.Label(trans_frame, text=category, 
-                                         font=('Segoe UI', 11), 
-                                         bg=self.colors['bg_cards'], fg=self.colors['text_secondary'])
-                    cat_label.grid(row=1, column=1, sticky='w')
-                
-                # Date and amount (Column 2)
-                date_label = tk.Label(trans_frame, text=date.strftime('%Y-%m-%d'), 
-                                     font=('Segoe UI', 11), 
-                                     bg=self.colors['bg_cards'], fg=self.colors['text_secondary'])
-                date_label.grid(row=0, column=2, sticky='e')
-                
-                amount_label = tk.Label(trans_frame, text=f"{amount_prefix}{format_currency(amount)}", 
-                                       font=('Segoe UI', 13, 'bold'), 
-                                       bg=self.colors['bg_cards'], fg=amount_color)
-                amount_label.grid(row=1, column=2, sticky='e')
-                
-                # Add separator line (except for last item)
-                if i < len(result) - 1:
-                    separator = tk.Frame(self.transactions_list, height=1, bg=self.colors['border'])
-                    separator.pack(fill=tk.X, pady=(12, 0))
+            self.next_after = page.next_after
+            self.transactions_list.show(page.rows, more=page.has_more)
             
         except Exception as e:
-            error_label = tk.Label(self.transactions_list, 
-                                   text=f"Error loading transactions: {str(e)}",
-                                   font=('Segoe UI', 12), 
-                                   bg=self.colors['bg_cards'], fg=self.colors['accent_red'])
-            error_label.pack(pady=20)
-
+            self.transactions_list.show_message(f"Error loading transactions: {str(e)}",
+                                                self.colors['accent_red'])
+    
+    def append_transactions(self, page):
+        """Display a page of older transactions below the ones already shown"""
+        if page is None:
+            show_error("Could not load older transactions")
+            return
+        try:
+            self.next_after = page.next_after
+            self.transactions_list.extend(page.rows, more=page.has_more)
+        except Exception as e:
+            show_error(f"Error loading transactions: {str(e)}")
+    
 # Reports Frame
 class ReportsFrame(BaseFrame):
+    REFRESH_KEYS = ('refresh', 'chart')
+
     def setup_frame(self):
         """Create reports content"""
         # Configure grid weights
@@ -1031,8 +972,8 @@ class ReportsFrame(BaseFrame):
             from_date = self.from_date_var.get()
             to_date = self.to_date_var.get()
             
-            query = """
-                SELECT c.category_name, SUM(t.amount) as total_amount
+            query = f"""
+                SELECT c.category_name, {cents_sql('SUM(t.amount)')} as total_amount
                 FROM transaction t
                 JOIN category c ON t.category_id = c.category_id
                 WHERE t.user_id = %s AND t.type = 'Expense'
@@ -1049,19 +990,27 @@ class ReportsFrame(BaseFrame):
             
             query += " GROUP BY c.category_id, c.category_name ORDER BY total_amount DESC"
             
-            result = db.execute_query(query, tuple(params))
-            
-            if result:
-                categories = [row[0] for row in result]
-                amounts = [float(row[1]) for row in result]
+            params = tuple(params)
+            self.queries.run('chart',
+                             lambda: db.fetch_columns(query, params, dtypes={'total_amount': 'cents'}),
+                             self.render_expense_pie_chart,
+                             lambda e: show_error(f"Error creating pie chart: {str(e)}"))
                 
+        except Exception as e:
+            show_error(f"Error creating pie chart: {str(e)}")
+    
+    def render_expense_pie_chart(self, columns):
+        """Draw the expense pie chart from query results"""
+        try:
+            from utils.charts import ChartGenerator, columns_to_dict
+            
+            chart_data = columns_to_dict(columns, 'category_name', 'total_amount', cents=True)
+            if chart_data:
                 # Create chart generator if not exists
                 if not self.chart_generator:
-                    from utils.charts import ChartGenerator
                     self.chart_generator = ChartGenerator(self.chart_frame)
                 
                 # Create pie chart
-                chart_data = dict(zip(categories, amounts))
                 fig = self.chart_generator.create_pie_chart(chart_data, "Expense Distribution")
                 
                 if fig:
@@ -1079,8 +1028,8 @@ class ReportsFrame(BaseFrame):
             to_date = self.to_date_var.get()
             
             # Get income data
-            income_query = """
-                SELECT DATE_FORMAT(date, '%%Y-%%m-01') as month, SUM(amount) as total_amount
+            income_query = f"""
+                SELECT DATE_FORMAT(date, '%%Y-%%m-01') as month, {cents_sql('SUM(amount)')} as total_amount
                 FROM transaction 
                 WHERE user_id = %s AND type = 'Income' 
             """
@@ -1096,11 +1045,9 @@ class ReportsFrame(BaseFrame):
             
             income_query += " GROUP BY DATE_FORMAT(date, '%%Y-%%m-01') ORDER BY month"
             
-            income_result = db.execute_query(income_query, tuple(income_params))
-            
             # Get expense data
-            expense_query = """
-                SELECT DATE_FORMAT(date, '%%Y-%%m-01') as month, SUM(amount) as total_amount
+            expense_query = f"""
+                SELECT DATE_FORMAT(date, '%%Y-%%m-01') as month, {cents_sql('SUM(amount)')} as total_amount
                 FROM transaction 
                 WHERE user_id = %s AND type = 'Expense' 
             """
@@ -1116,20 +1063,32 @@ class ReportsFrame(BaseFrame):
             
             expense_query += " GROUP BY DATE_FORMAT(date, '%%Y-%%m-01') ORDER BY month"
             
-            expense_result = db.execute_query(expense_query, tuple(expense_params))
+            income_params = tuple(income_params)
+            expense_params = tuple(expense_params)
+            dtypes = {'month': 'date', 'total_amount': 'cents'}
+            self.queries.run('chart',
+                             lambda: (db.fetch_columns(income_query, income_params, dtypes),
+                                      db.fetch_columns(expense_query, expense_params, dtypes)),
+                             self.render_income_expense_chart,
+                             lambda e: show_error(f"Error creating income vs expense chart: {str(e)}"))
+                
+        except Exception as e:
+            show_error(f"Error creating income vs expense chart: {str(e)}")
+    
+    def render_income_expense_chart(self, results):
+        """Draw the income vs expense trend chart from query results"""
+        try:
+            from utils.charts import ChartGenerator, columns_to_series
             
-            if income_result or expense_result:
+            income_columns, expense_columns = results
+            income_data = columns_to_series(income_columns, 'month', 'total_amount', cents=True)
+            expense_data = columns_to_series(expense_columns, 'month', 'total_amount', cents=True)
+            
+            if income_data or expense_data:
                 # Create chart generator if not exists
                 if not self.chart_generator:
-                    from utils.charts import ChartGenerator
                     self.chart_generator = ChartGenerator(self.chart_frame)
                 
-                # Prepare data
-                income_data = [(datetime.strptime(row[0], '%Y-%m-%d'), float(row[1])) 
-                             for row in income_result] if income_result else []
-                expense_data = [(datetime.strptime(row[0], '%Y-%m-%d'), float(row[1])) 
-                              for row in expense_result] if expense_result else []
-                
                 # Create chart
                 fig = self.chart_generator.create_income_expense_chart(
                     income_data, expense_data, "Income vs Expense Trend"
@@ -1149,10 +1108,12 @@ class ReportsFrame(BaseFrame):
             from_date = self.from_date_var.get()
             to_date = self.to_date_var.get()
             
-            query = """
+            income_sum = cents_sql("SUM(CASE WHEN t.type = 'Income' THEN t.amount ELSE 0 END)")
+            expense_sum = cents_sql("SUM(CASE WHEN t.type = 'Expense' THEN t.amount ELSE 0 END)")
+            query = f"""
                 SELECT c.category_name, 
-                       SUM(CASE WHEN t.type = 'Income' THEN t.amount ELSE 0 END) as income,
-                       SUM(CASE WHEN t.type = 'Expense' THEN t.amount ELSE 0 END) as expense
+                       {income_sum} as income,
+                       {expense_sum} as expense
                 FROM category c
                 LEFT JOIN transaction t ON c.category_id = t.category_id 
                     AND t.user_id = %s
@@ -1173,19 +1134,28 @@ class ReportsFrame(BaseFrame):
                 ORDER BY (income + expense) DESC
             """
             
-            result = db.execute_query(query, tuple(params))
-            
-            if result:
+            params = tuple(params)
+            self.queries.run('chart',
+                             lambda: db.fetch_columns(query, params,
+                                                      dtypes={'income': 'cents', 'expense': 'cents'}),
+                             self.render_category_bar_chart,
+                             lambda e: show_error(f"Error creating bar chart: {str(e)}"))
+                
+        except Exception as e:
+            show_error(f"Error creating bar chart: {str(e)}")
+    
+    def render_category_bar_chart(self, columns):
+        """Draw the category comparison bar chart from query results"""
+        try:
+            if columns and len(columns['category_name']):
                 # Create chart generator if not exists
                 if not self.chart_generator:
                     from utils.charts import ChartGenerator
                     self.chart_generator = ChartGenerator(self.chart_frame)
                 
                 # Prepare data for bar chart (using total amounts)
-                categories = [row[0] for row in result]
-                amounts = [float(row[1]) + float(row[2]) for row in result]  # income + expense
-                
-                chart_data = dict(zip(categories, amounts))
+                amounts = (columns['income'] + columns['expense']) / 100
+                chart_data = dict(zip(columns['category_name'].tolist(), amounts.tolist()))
                 fig = self.chart_generator.create_bar_chart(chart_data, "Category Comparison")
                 
                 if fig:
@@ -1198,6 +1168,7 @@ class ReportsFrame(BaseFrame):
     
     def clear_charts(self):
         """Clear all charts"""
+        self.queries.cancel('chart')
         if self.chart_generator:
             self.chart_generator.clear_chart()
     
@@ -1268,7 +1239,24 @@ class SettingsFrame(BaseFrame):
         pass
 
 class DashboardWindow:
+    # Frames by name; each is built the first time it is shown
+    FRAME_CLASSES = {
+        'dashboard': DashboardFrame,
+        'transactions': TransactionsFrame,
+        'reports': ReportsFrame,
+        'settings': SettingsFrame,
+    }
+    
+    # Built in idle time once the dashboard is on screen, most likely first
+    PREWARM_FRAMES = ('transactions',)
+    PREWARM_DELAY = 500  # ms after the dashboard appears
+    
     def __init__(self, user_id, parent_window=None):
+        # Time-to-first-dashboard is measured from here to the first data
+        # the dashboard shows (see on_dashboard_data)
+        self.started = time.perf_counter()
+        self.startup_time = None
+        
         self.user_id = user_id
         self.parent_window = parent_window
         
@@ -1297,15 +1285,14 @@ class DashboardWindow:
         # Create main content area with frame container
         self.create_main_content()
         
-        # Initialize frames
+        # Frames are created on first navigation (see get_frame)
         self.frames = {}
         self.current_frame = None
         
-        # Create all frames
-        self.create_frames()
-        
         # Show dashboard frame by default
         self.show_frame('dashboard')
+        self.frames['dashboard'].on_first_data = self.on_dashboard_data
+        self.root.after_idle(self.on_first_paint)
         
         # Bind window close event
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -1510,29 +1497,42 @@ class DashboardWindow:
         self.frame_container = tk.Frame(self.content_area, bg=self.colors['bg_main'])
         self.frame_container.grid(row=0, column=0, sticky='nsew')
     
-    def create_frames(self):
-        """Create all application frames"""
-        # Create dashboard frame
-        self.frames['dashboard'] = DashboardFrame(self.frame_container, self.user_id, self.colors)
-        
-        # Create transactions frame
-        self.frames['transactions'] = TransactionsFrame(self.frame_container, self.user_id, self.colors)
-        
-        # Create reports frame
-        self.frames['reports'] = ReportsFrame(self.frame_container, self.user_id, self.colors)
-        
-        # Create settings frame
-        self.frames['settings'] = SettingsFrame(self.frame_container, self.user_id, self.colors)
+    def get_frame(self, frame_name):
+        """Get a frame by name, creating it on first use; None if unknown"""
+        frame = self.frames.get(frame_name)
+        if frame is None and frame_name in self.FRAME_CLASSES:
+            frame = self.FRAME_CLASSES[frame_name](self.frame_container, self.user_id, self.colors)
+            self.frames[frame_name] = frame
+        return frame
+    
+    def on_first_paint(self):
+        """Schedule frame prewarming once the window has been drawn"""
+        self.root.after(self.PREWARM_DELAY, self.prewarm_frames)
+    
+    def on_dashboard_data(self):
+        """Record time-to-first-dashboard when its first data is displayed"""
+        self.startup_time = self.frames['dashboard'].first_data_at - self.started
+        startup_logger.info("Dashboard data shown in %.0f ms", self.startup_time * 1000)
+    
+    def prewarm_frames(self, names=None):
+        """Build PREWARM_FRAMES one per idle callback, so clicks still get through"""
+        names = list(self.PREWARM_FRAMES if names is None else names)
+        if not names:
+            return
+        self.get_frame(names[0])
+        self.root.after_idle(lambda: self.prewarm_frames(names[1:]))
     
     def show_frame(self, frame_name):
         """Show the specified frame"""
-        # Hide current frame
+        # Hide current frame, discarding whatever it was still loading
         if self.current_frame:
+            self.current_frame.on_hide()
             self.current_frame.grid_remove()
         
         # Show new frame
-        if frame_name in self.frames:
-            self.current_frame = self.frames[frame_name]
+        frame = self.get_frame(frame_name)
+        if frame is not None:
+            self.current_frame = frame
             self.current_frame.grid(row=0, column=0, sticky='nsew')
             
             # Refresh frame data
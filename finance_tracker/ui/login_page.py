@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox
 import hashlib
 from db.connection import db
 from ui.dashboard import DashboardWindow
+from ui.async_bridge import TkQueryBridge
 from utils.helpers import validate_username, validate_password, show_error, show_success
 
 class LoginWindow:
@@ -29,6 +30,9 @@ class LoginWindow:
         # Current user ID (set after successful login)
         self.current_user_id = None
         
+        # Runs SQL on worker threads so the window stays responsive
+        self.queries = TkQueryBridge(self.root)
+        
     def center_window(self):
         """Center the window on screen"""
         self.root.update_idletasks()
@@ -129,8 +133,12 @@ class LoginWindow:
         
         # Check credentials in database
         query = "SELECT user_id FROM user WHERE username = %s AND password = %s"
-        result = db.execute_query(query, (username, hashed_password))
-        
+        self.queries.run('login', lambda: db.execute_query(query, (username, hashed_password)),
+                         self.on_login_result,
+                         lambda e: show_error(f"Login failed: {str(e)}"))
+    
+    def on_login_result(self, result):
+        """Finish login once the credential check returns"""
         if result and len(result) > 0:
             self.current_user_id = result[0][0]
             show_success("Login successful!")
@@ -165,27 +173,38 @@ class LoginWindow:
             show_error("Passwords do not match")
             return
         
+        # Hash password
+        hashed_password = self.hash_password(password)
+        
+        self.queries.run('register', lambda: self.create_user(username, hashed_password),
+                         self.on_register_result,
+                         lambda e: show_error(f"Registration failed: {str(e)}"))
+    
+    def create_user(self, username, hashed_password):
+        """Insert a new user; called on a database worker thread"""
         # Check if username already exists
         check_query = "SELECT user_id FROM user WHERE username = %s"
         existing_user = db.execute_query(check_query, (username,))
         
         if existing_user and len(existing_user) > 0:
-            show_error("Username already exists")
-            return
-        
-        # Hash password
-        hashed_password = self.hash_password(password)
+            return "Username already exists"
         
         # Insert new user
         insert_query = "INSERT INTO user (username, password) VALUES (%s, %s)"
         if db.execute_query(insert_query, (username, hashed_password)):
+            return None
+        return "Registration failed. Please try again."
+    
+    def on_register_result(self, error_message):
+        """Report the outcome of create_user on the Tk thread"""
+        if not error_message:
             show_success("Registration successful! You can now login.")
             # Clear register fields
             self.reg_username_entry.delete(0, tk.END)
             self.reg_password_entry.delete(0, tk.END)
             self.reg_confirm_entry.delete(0, tk.END)
         else:
-            show_error("Registration failed. Please try again.")
+            show_error(error_message)
     
     def open_dashboard(self):
         """Open dashboard window"""
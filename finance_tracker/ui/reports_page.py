@@ -4,9 +4,14 @@ from datetime import datetime, timedelta
 import pandas as pd
 from db.connection import db
 from utils.helpers import format_currency, show_error, show_success, format_date_display
-from utils.charts import ChartGenerator
+from utils.money import Money, cents_sql
+from utils.charts import ChartGenerator, columns_to_dict, columns_to_series
+from db.search import search_transactions
+from ui.async_bridge import TkQueryBridge
 
 class ReportsWindow:
+    SEARCH_PAGE_SIZE = 50
+    
     def __init__(self, user_id, parent_window=None):
         self.user_id = user_id
         self.parent_window = parent_window
@@ -17,6 +22,9 @@ class ReportsWindow:
         self.root.geometry("1200x800")
         self.root.resizable(True, True)
         
+        # Runs SQL on worker threads so the window stays responsive
+        self.queries = TkQueryBridge(self.root)
+        
         # Center the window
         self.center_window()
         
@@ -90,6 +98,22 @@ class ReportsWindow:
         export_btn = ttk.Button(type_frame, text="Export to CSV", command=self.export_to_csv)
         export_btn.pack(side=tk.LEFT)
         
+        # Description search
+        search_frame = ttk.Frame(filters_frame)
+        search_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT, padx=(0, 5))
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30)
+        search_entry.pack(side=tk.LEFT, padx=(0, 10))
+        search_entry.bind('<Return>', lambda e: self.search())
+        
+        ttk.Button(search_frame, text="Search", command=self.search).pack(side=tk.LEFT, padx=(0, 10))
+        self.more_results_btn = ttk.Button(search_frame, text="More Results",
+                                           command=self.search_more, state=tk.DISABLED)
+        self.more_results_btn.pack(side=tk.LEFT)
+        self.search_page = None
+        
         # Transactions table frame
         table_frame = ttk.LabelFrame(self.main_frame, text="Transactions", padding="10")
         table_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
@@ -152,8 +176,8 @@ class ReportsWindow:
             transaction_type = self.type_var.get()
             
             # Build query
-            query = """
-                SELECT t.date, t.type, c.category_name, t.amount, t.description
+            query = f"""
+                SELECT t.date, t.type, c.category_name, {cents_sql('t.amount')} as amount, t.description
                 FROM transaction t
                 JOIN category c ON t.category_id = c.category_id
                 WHERE t.user_id = %s
@@ -176,36 +200,110 @@ class ReportsWindow:
             
             query += " ORDER BY t.date DESC, t.created_at DESC"
             
-            # Execute query
-            result = db.execute_query(query, tuple(params))
-            
-            # Clear existing items
+            # Loading replaces the table, so a search still running is dropped
+            self.queries.cancel('search')
             for item in self.tree.get_children():
                 self.tree.delete(item)
+            self.search_page = None
+            self.more_results_btn.config(state=tk.DISABLED)
+            self.loaded_count = 0
             
-            # Insert new data
-            if result:
-                for row in result:
-                    date_str = format_date_display(row[0])
-                    amount_str = format_currency(row[3])
-                    description = row[4] if row[4] else ""
-                    
-                    # Color code based on type
-                    item = self.tree.insert('', 'end', values=(
-                        date_str, row[1], row[2], amount_str, description
-                    ))
-                    
-                    # Color code items
-                    if row[1] == 'Income':
-                        self.tree.set(item, 'Amount', f"+{amount_str}")
-                    else:
-                        self.tree.set(item, 'Amount', f"-{amount_str}")
-            
-            show_success(f"Loaded {len(result) if result else 0} transactions")
+            # Rows reach the table a batch at a time while the query is still running
+            params = tuple(params)
+            self.queries.stream('transactions', lambda: self.fetch_table_batches(query, params),
+                                self.append_table_rows, self.on_transactions_loaded,
+                                self.on_transactions_failed)
             
         except Exception as e:
             show_error(f"Error loading transactions: {str(e)}")
     
+    def fetch_table_batches(self, query, params, batch_size=500):
+        """Format the filtered transactions as table values a batch at a time
+        
+        Runs on a worker thread; only the batches waiting for the table are
+        held in memory, never the whole result.
+        """
+        batch = []
+        for row in db.iter_query(query, params, batch_size):
+            date_str = format_date_display(row[0])
+            amount_str = format_currency(Money(row[3]))
+            description = row[4] if row[4] else ""
+            
+            # Color code items
+            sign = "+" if row[1] == 'Income' else "-"
+            batch.append((date_str, row[1], row[2], f"{sign}{amount_str}", description))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def append_table_rows(self, rows):
+        """Add one batch of loaded transactions to the table"""
+        for values in rows:
+            self.tree.insert('', 'end', values=values)
+        self.loaded_count += len(rows)
+    
+    def on_transactions_loaded(self):
+        """Report a load that reached the end of the result"""
+        show_success(f"Loaded {self.loaded_count} transactions")
+    
+    def on_transactions_failed(self, error):
+        """Report a load that failed, possibly after some rows were shown"""
+        if self.loaded_count:
+            show_error(f"Error loading transactions after {self.loaded_count} rows; "
+                       f"the table is incomplete: {str(error)}")
+        else:
+            show_error(f"Error loading transactions: {str(error)}")
+    
+    def search(self):
+        """Show the best matches for the search box, replacing the table"""
+        text = self.search_var.get().strip()
+        if not text:
+            show_error("Please enter words to search for")
+            return
+        
+        self.queries.cancel('transactions')
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        self.search_page = None
+        self.search_more()
+    
+    def search_more(self):
+        """Fetch the next page of search results in the background
+
+        Runs under one key, so a new search supersedes one still in flight.
+        """
+        text = self.search_var.get().strip()
+        offset = self.search_page.next_offset if self.search_page else 0
+        self.more_results_btn.config(state=tk.DISABLED)
+        self.queries.run('search',
+                         lambda: search_transactions(self.user_id, text, self.SEARCH_PAGE_SIZE, offset),
+                         lambda page: self.show_search_page(page, offset),
+                         lambda e: show_error(f"Error searching transactions: {str(e)}"))
+    
+    def show_search_page(self, page, offset):
+        """Append one page of search results to the table"""
+        try:
+            if page is None:
+                show_error("Search failed")
+                return
+            
+            for date, transaction_type, category, amount, description in page.rows:
+                sign = "+" if transaction_type == 'Income' else "-"
+                self.tree.insert('', 'end', values=(
+                    format_date_display(date), transaction_type, category,
+                    f"{sign}{format_currency(amount)}", description or ""
+                ))
+            
+            self.search_page = page
+            self.more_results_btn.config(state=tk.NORMAL if page.has_more else tk.DISABLED)
+            if offset == 0 and not page.rows:
+                show_error("No transactions match your search")
+            
+        except Exception as e:
+            show_error(f"Error searching transactions: {str(e)}")
+    
     def export_to_csv(self):
         """Export transactions to CSV file"""
         try:
@@ -242,8 +340,8 @@ class ReportsWindow:
             from_date = self.from_date_var.get()
             to_date = self.to_date_var.get()
             
-            query = """
-                SELECT c.category_name, SUM(t.amount) as total_amount
+            query = f"""
+                SELECT c.category_name, {cents_sql('SUM(t.amount)')} as total_amount
                 FROM transaction t
                 JOIN category c ON t.category_id = c.category_id
                 WHERE t.user_id = %s AND t.type = 'Expense'
@@ -260,18 +358,26 @@ class ReportsWindow:
             
             query += " GROUP BY c.category_id, c.category_name ORDER BY total_amount DESC"
             
-            result = db.execute_query(query, tuple(params))
-            
-            if result:
-                categories = [row[0] for row in result]
-                amounts = [float(row[1]) for row in result]
+            params = tuple(params)
+            self.queries.run('chart',
+                             lambda: db.fetch_columns(query, params, dtypes={'total_amount': 'cents'}),
+                             self.render_expense_pie_chart,
+                             lambda e: show_error(f"Error creating pie chart: {str(e)}"))
                 
+        except Exception as e:
+            show_error(f"Error creating pie chart: {str(e)}")
+    
+    def render_expense_pie_chart(self, columns):
+        """Draw the expense pie chart from query results"""
+        try:
+            chart_data = columns_to_dict(columns, 'category_name', 'total_amount', cents=True)
+            
+            if chart_data:
                 # Create chart generator if not exists
                 if not self.chart_generator:
                     self.chart_generator = ChartGenerator(self.chart_frame)
                 
                 # Create pie chart
-                chart_data = dict(zip(categories, amounts))
                 fig = self.chart_generator.create_pie_chart(chart_data, "Expense Distribution")
                 
                 if fig:
@@ -289,8 +395,8 @@ class ReportsWindow:
             to_date = self.to_date_var.get()
             
             # Get income data
-            income_query = """
-                SELECT DATE_FORMAT(date, '%%Y-%%m-01') as month, SUM(amount) as total_amount
+            income_query = f"""
+                SELECT DATE_FORMAT(date, '%%Y-%%m-01') as month, {cents_sql('SUM(amount)')} as total_amount
                 FROM transaction
                 WHERE user_id = %s AND type = 'Income'
             """
@@ -306,11 +412,11 @@ class ReportsWindow:
             
             income_query += " GROUP BY DATE_FORMAT(date, '%%Y-%%m-01') ORDER BY month"
             
-            income_result = db.execute_query(income_query, tuple(income_params))
+            dtypes = {'month': 'date', 'total_amount': 'cents'}
             
             # Get expense data
-            expense_query = """
-                SELECT DATE_FORMAT(date, '%%Y-%%m-01') as month, SUM(amount) as total_amount
+            expense_query = f"""
+                SELECT DATE_FORMAT(date, '%%Y-%%m-01') as month, {cents_sql('SUM(amount)')} as total_amount
                 FROM transaction
                 WHERE user_id = %s AND type = 'Expense'
             """
@@ -326,19 +432,31 @@ class ReportsWindow:
             
             expense_query += " GROUP BY DATE_FORMAT(date, '%%Y-%%m-01') ORDER BY month"
             
-            expense_result = db.execute_query(expense_query, tuple(expense_params))
+            income_params = tuple(income_params)
+            expense_params = tuple(expense_params)
+            self.queries.run('chart',
+                             lambda: (db.fetch_columns(income_query, income_params, dtypes),
+                                      db.fetch_columns(expense_query, expense_params, dtypes)),
+                             self.render_income_expense_chart,
+                             lambda e: show_error(f"Error creating income vs expense chart: {str(e)}"))
+                
+        except Exception as e:
+            show_error(f"Error creating income vs expense chart: {str(e)}")
+    
+    def render_income_expense_chart(self, result):
+        """Draw the income vs expense trend from query results"""
+        try:
+            income_columns, expense_columns = result
+            
+            # Prepare data
+            income_data = columns_to_series(income_columns, 'month', 'total_amount', cents=True)
+            expense_data = columns_to_series(expense_columns, 'month', 'total_amount', cents=True)
             
-            if income_result or expense_result:
+            if income_data or expense_data:
                 # Create chart generator if not exists
                 if not self.chart_generator:
                     self.chart_generator = ChartGenerator(self.chart_frame)
                 
-                # Prepare data
-                income_data = [(datetime.strptime(row[0], '%Y-%m-%d'), float(row[1])) 
-                             for row in income_result] if income_result else []
-                expense_data = [(datetime.strptime(row[0], '%Y-%m-%d'), float(row[1])) 
-                              for row in expense_result] if expense_result else []
-                
                 # Create chart
                 fig = self.chart_generator.create_income_expense_chart(
                     income_data, expense_data, "Income vs Expense Trend"
@@ -358,10 +476,12 @@ class ReportsWindow:
             from_date = self.from_date_var.get()
             to_date = self.to_date_var.get()
             
-            query = """
+            income_sum = cents_sql("SUM(CASE WHEN t.type = 'Income' THEN t.amount ELSE 0 END)")
+            expense_sum = cents_sql("SUM(CASE WHEN t.type = 'Expense' THEN t.amount ELSE 0 END)")
+            query = f"""
                 SELECT c.category_name, 
-                       SUM(CASE WHEN t.type = 'Income' THEN t.amount ELSE 0 END) as income,
-                       SUM(CASE WHEN t.type = 'Expense' THEN t.amount ELSE 0 END) as expense
+                       {income_sum} as income,
+                       {expense_sum} as expense
                 FROM category c
                 LEFT JOIN transaction t ON c.category_id = t.category_id 
                     AND t.user_id = %s
@@ -382,18 +502,27 @@ class ReportsWindow:
                 ORDER BY (income + expense) DESC
             """
             
-            result = db.execute_query(query, tuple(params))
-            
-            if result:
+            params = tuple(params)
+            self.queries.run('chart',
+                             lambda: db.fetch_columns(query, params,
+                                                      dtypes={'income': 'cents', 'expense': 'cents'}),
+                             self.render_category_bar_chart,
+                             lambda e: show_error(f"Error creating bar chart: {str(e)}"))
+                
+        except Exception as e:
+            show_error(f"Error creating bar chart: {str(e)}")
+    
+    def render_category_bar_chart(self, columns):
+        """Draw the category comparison chart from query results"""
+        try:
+            if columns and len(columns['category_name']):
                 # Create chart generator if not exists
                 if not self.chart_generator:
                     self.chart_generator = ChartGenerator(self.chart_frame)
                 
                 # Prepare data for bar chart (using total amounts)
-                categories = [row[0] for row in result]
-                amounts = [float(row[1]) + float(row[2]) for row in result]  # income + expense
-                
-                chart_data = dict(zip(categories, amounts))
+                amounts = (columns['income'] + columns['expense']) / 100
+                chart_data = dict(zip(columns['category_name'].tolist(), amounts.tolist()))
                 fig = self.chart_generator.create_bar_chart(chart_data, "Category Comparison")
                 
                 if fig:
@@ -406,6 +535,7 @@ class ReportsWindow:
     
     def clear_charts(self):
         """Clear all charts"""
+        self.queries.cancel('chart')
         if self.chart_generator:
             self.chart_generator.clear_chart()
     
@@ -0,0 +1,286 @@
+import tkinter as tk
+from typing import Callable, Dict, List, Optional, Sequence
+
+from utils.helpers import format_currency
+
+
+class TransactionRow(tk.Frame):
+    """One transaction line: icon, description/category and date/amount
+
+    Widgets are created once; ``set_transaction`` puts a different transaction in them.
+    """
+
+    def __init__(self, parent, colors: Dict[str, str]):
+        super().__init__(parent, bg=colors['bg_cards'])
+        self.colors = colors
+
+        # Line above every row but the first
+        self.separator = tk.Frame(self, height=1, bg=colors['border'])
+
+        self.content = tk.Frame(self, bg=colors['bg_cards'])
+        self.content.pack(fill=tk.X, pady=8)
+        self.content.grid_columnconfigure(1, weight=1)
+
+        # Icon (Column 0)
+        self.icon_label = tk.Label(self.content, font=('Segoe UI', 14),
+                                   bg=colors['bg_cards'], fg=colors['text_primary'])
+        self.icon_label.grid(row=0, column=0, rowspan=2, sticky='w', padx=(0, 12))
+
+        # Description and category (Column 1 - expands)
+        self.desc_label = tk.Label(self.content, font=('Segoe UI', 13, 'bold'),
+                                   bg=colors['bg_cards'], fg=colors['text_primary'])
+        self.desc_label.grid(row=0, column=1, sticky='w')
+
+        self.cat_label = tk.Label(self.content, font=('Segoe UI', 11),
+                                  bg=colors['bg_cards'], fg=colors['text_secondary'])
+        self.cat_label.grid(row=1, column=1, sticky='w')
+
+        # Date and amount (Column 2)
+        self.date_label = tk.Label(self.content, font=('Segoe UI', 11),
+                                   bg=colors['bg_cards'], fg=colors['text_secondary'])
+        self.date_label.grid(row=0, column=2, sticky='e')
+
+        self.amount_label = tk.Label(self.content, font=('Segoe UI', 13, 'bold'),
+                                     bg=colors['bg_cards'])
+        self.amount_label.grid(row=1, column=2, sticky='e')
+
+        self.has_separator = False
+
+    def set_transaction(self, transaction: Sequence, separator: bool):
+        """Show ``(description, amount, type, date, category)``"""
+        description, amount, trans_type, date, category = transaction
+        income = trans_type == 'Income'
+
+        self.icon_label.config(text="💰" if income else "💸")
+        self.desc_label.config(text=description)
+        if category:
+            self.cat_label.config(text=category)
+            self.cat_label.grid()
+        else:
+            self.cat_label.grid_remove()
+        self.date_label.config(text=date.strftime('%Y-%m-%d'))
+        self.amount_label.config(text=f"{'+' if income else '-'}{format_currency(amount)}",
+                                 fg=self.colors['accent_green'] if income else self.colors['accent_red'])
+
+        if separator != self.has_separator:
+            if separator:
+                self.separator.pack(fill=tk.X, pady=(12, 0), before=self.content)
+            else:
+                self.separator.pack_forget()
+            self.has_separator = separator
+
+
+class RowWindow:
+    """Which of ``count`` loaded items a pool of ``size`` rows shows
+
+    The window starts at ``offset`` and never runs past either end of the
+    data.  ``more`` says whether items older than the loaded ones exist
+    (a page that has not been fetched yet).
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.count = 0
+        self.offset = 0
+        self.more = False
+
+    @property
+    def stop(self) -> int:
+        return min(self.offset + self.size, self.count)
+
+    @property
+    def overflow(self) -> bool:
+        """Whether there is anything outside the window, loaded or not"""
+        return self.count > self.size or self.more
+
+    @property
+    def at_start(self) -> bool:
+        return self.offset == 0
+
+    @property
+    def at_end(self) -> bool:
+        """Whether the window shows the oldest loaded item"""
+        return self.stop >= self.count
+
+    def reset(self, count: int, more: bool = False):
+        """Show the first of ``count`` newly loaded items"""
+        self.count = count
+        self.more = more
+        self.offset = 0
+
+    def grow(self, added: int, more: bool = False):
+        """Load ``added`` items after the others and move the window onto them"""
+        start = self.count
+        self.count += added
+        self.more = more
+        self.offset = self.clamp(start)
+
+    def clamp(self, offset: int) -> int:
+        """``offset`` limited so the window stays within the data"""
+        last = max(self.count - self.size, 0)
+        return min(max(offset, 0), last)
+
+    def scroll(self, rows: int) -> bool:
+        """Move ``rows`` items older (negative: newer); whether the window moved"""
+        offset = self.clamp(self.offset + rows)
+        moved = offset != self.offset
+        self.offset = offset
+        return moved
+
+
+class TransactionList(tk.Frame):
+    """Transaction list that draws a window of its data with a fixed row pool
+
+    Every transaction handed to ``show`` and ``extend`` is kept, but only
+    ``max_rows`` of them are on screen at a time (see RowWindow).  Scrolling
+    (the mouse wheel, or the newer/older buttons under the rows) moves the
+    window and puts different transactions into the same TransactionRow
+    widgets, so the number of widgets never grows past ``max_rows`` however
+    many pages are loaded.  Scrolling older past the last loaded transaction
+    calls ``on_reach_end`` when the owner said more exist, so it can fetch
+    the next page and ``extend`` the list.
+    """
+
+    MAX_ROWS = 50
+    WHEEL_ROWS = 3  # Rows moved per mouse wheel step
+
+    def __init__(self, parent, colors: Dict[str, str], max_rows: int = None,
+                 on_reach_end: Optional[Callable[[], None]] = None):
+        super().__init__(parent, bg=colors['bg_cards'])
+        self.colors = colors
+        self.max_rows = max_rows or self.MAX_ROWS
+        self.on_reach_end = on_reach_end
+        self.transactions: List[Sequence] = []
+        self.window = RowWindow(self.max_rows)
+        self.rows: List[TransactionRow] = []
+        self.visible = 0
+
+        # Wheel events go to the widget under the pointer, so every widget in
+        # the list carries this tag (see _take_wheel)
+        self.wheel_tag = f"TransactionListWheel{id(self)}"
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.bind_class(self.wheel_tag, sequence, self.on_wheel)
+
+        # Column headers
+        self.header = tk.Frame(self, bg=colors['bg_cards'])
+        self.header.grid_columnconfigure(1, weight=1)
+        tk.Label(self.header, text="Description / Category", font=('Segoe UI', 11, 'bold'),
+                 bg=colors['bg_cards'], fg=colors['text_secondary']).grid(row=0, column=1, sticky='w', padx=(12, 0))
+        tk.Label(self.header, text="Date / Amount", font=('Segoe UI', 11, 'bold'),
+                 bg=colors['bg_cards'], fg=colors['text_secondary']).grid(row=0, column=2, sticky='e')
+        self.header.pack(fill=tk.X, pady=(0, 10))
+
+        self.body = tk.Frame(self, bg=colors['bg_cards'])
+        self.body.pack(fill=tk.X)
+
+        # Position and paging controls, shown when there is more than one window
+        self.footer = tk.Frame(self, bg=colors['bg_cards'])
+        button_style = dict(font=('Segoe UI', 10), bg=colors['bg_cards'], fg=colors['text_secondary'],
+                            relief='flat', cursor='hand2')
+        self.newer_button = tk.Button(self.footer, text="▲ Newer",
+                                      command=lambda: self.scroll(-self.max_rows), **button_style)
+        self.newer_button.pack(side=tk.LEFT)
+        self.older_button = tk.Button(self.footer, text="▼ Older",
+                                      command=lambda: self.scroll(self.max_rows), **button_style)
+        self.older_button.pack(side=tk.RIGHT)
+        self.position_label = tk.Label(self.footer, font=('Segoe UI', 10),
+                                       bg=colors['bg_cards'], fg=colors['text_secondary'])
+        self.position_label.pack()
+        self.showing_footer = False
+
+        # Loading and error text, shown instead of the rows
+        self.message = tk.Label(self, font=('Segoe UI', 12), bg=colors['bg_cards'])
+        self.showing_message = False
+
+        self._take_wheel(self)
+
+    def show(self, transactions: Sequence[Sequence], more: bool = False):
+        """Replace the list with ``transactions``, newest first
+
+        ``more``: older transactions exist that on_reach_end can load.
+        """
+        self.transactions = list(transactions)
+        self.window.reset(len(self.transactions), more)
+        self.render()
+
+    def extend(self, transactions: Sequence[Sequence], more: bool = False):
+        """Add ``transactions`` after the ones already loaded and bring them into view"""
+        self.transactions.extend(transactions)
+        self.window.grow(len(transactions), more)
+        self.render()
+
+    def scroll(self, rows: int):
+        """Move the window ``rows`` transactions older (negative: newer)
+
+        Scrolling older at the end of the loaded transactions asks for more.
+        """
+        if self.window.scroll(rows):
+            self.render()
+        elif rows > 0 and self.window.at_end and self.window.more and self.on_reach_end:
+            self.on_reach_end()
+
+    def on_wheel(self, event):
+        """Scroll a few rows per wheel step (Button-4/5 on X11)"""
+        if self.showing_message or not self.window.overflow:
+            return None
+        newer = event.num == 4 or getattr(event, 'delta', 0) > 0
+        self.scroll(-self.WHEEL_ROWS if newer else self.WHEEL_ROWS)
+        return "break"
+
+    def show_message(self, text: str, color: str = None):
+        """Hide the header and rows and show ``text`` instead"""
+        self.header.pack_forget()
+        self.body.pack_forget()
+        self.set_footer(False)
+        self.message.config(text=text, fg=color or self.colors['text_secondary'])
+        self.message.pack(pady=20)
+        self.showing_message = True
+
+    def render(self):
+        """Put the transactions in the current window into the row pool"""
+        if self.showing_message:
+            self.message.pack_forget()
+            self.header.pack(fill=tk.X, pady=(0, 10))
+            self.body.pack(fill=tk.X)
+            self.showing_message = False
+
+        window = self.transactions[self.window.offset:self.window.stop]
+        while len(self.rows) < len(window):
+            row = TransactionRow(self.body, self.colors)
+            self._take_wheel(row)
+            self.rows.append(row)
+
+        for index, transaction in enumerate(window):
+            row = self.rows[index]
+            row.set_transaction(transaction, separator=index > 0)
+            # Rows are only ever hidden from the end, so packing keeps their order
+            if index >= self.visible:
+                row.pack(fill=tk.X)
+
+        for row in self.rows[len(window):self.visible]:
+            row.pack_forget()
+        self.visible = len(window)
+
+        overflow = self.window.overflow
+        if overflow:
+            total = f"{len(self.transactions)}{'+' if self.window.more else ''}"
+            self.position_label.config(text=f"{self.window.offset + 1}–{self.window.stop} of {total}")
+            self.newer_button.config(state=tk.DISABLED if self.window.at_start else tk.NORMAL)
+            self.older_button.config(state=tk.DISABLED if self.window.at_end and not self.window.more
+                                     else tk.NORMAL)
+        self.set_footer(overflow)
+
+    def set_footer(self, show: bool):
+        """Show or hide the paging controls under the rows"""
+        if show != self.showing_footer:
+            if show:
+                self.footer.pack(fill=tk.X, pady=(10, 0))
+            else:
+                self.footer.pack_forget()
+            self.showing_footer = show
+
+    def _take_wheel(self, widget):
+        """Route wheel events over ``widget`` and its children to on_wheel"""
+        widget.bindtags((self.wheel_tag,) + widget.bindtags())
+        for child in widget.winfo_children():
+            self._take_wheel(child)
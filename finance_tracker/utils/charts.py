@@ -1,10 +1,12 @@
+import math
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import List, Tuple, Dict
+from typing import List, Optional, Sequence, Tuple, Dict
 import tkinter as tk
 from tkinter import ttk
 
@@ -170,9 +172,8 @@ class ChartGenerator:
         if fig is None:
             return
             
-        # Clear existing canvas
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
+        # Clear existing canvas and release the figure it showed
+        self.clear_chart()
         
         # Create new canvas
         self.canvas = FigureCanvasTkAgg(fig, self.parent_frame)
@@ -188,9 +189,172 @@ class ChartGenerator:
             self.canvas.get_tk_widget().destroy()
             self.canvas = None
         if self.figure:
+            # plt.close() only releases pyplot-managed figures; clear() drops
+            # the artists of figures built directly from Figure()
             plt.close(self.figure)
+            self.figure.clear()
             self.figure = None
 
+class LiveChart:
+    """A figure and canvas created once, then updated in place on every refresh
+
+    Subclasses change their artists' data and redraw with ``draw_idle``
+    instead of building a new Figure and FigureCanvasTkAgg per refresh.
+    Without a parent the figure renders offscreen (Agg), e.g. for benchmarks.
+    """
+
+    def __init__(self, parent: Optional[tk.Misc] = None, figsize: Tuple[float, float] = (6, 4),
+                 dpi: int = 100, facecolor: str = 'white'):
+        self.figure = Figure(figsize=figsize, dpi=dpi, facecolor=facecolor)
+        self.ax = self.figure.add_subplot(111, facecolor=facecolor)
+        if parent is not None:
+            self.canvas = FigureCanvasTkAgg(self.figure, parent)
+        else:
+            self.canvas = FigureCanvasAgg(self.figure)
+
+    @property
+    def widget(self) -> tk.Widget:
+        """The Tk widget to pack or grid (Tk charts only)"""
+        return self.canvas.get_tk_widget()
+
+    def redraw(self):
+        """Redraw once Tk is idle; repeated calls before then coalesce"""
+        self.canvas.draw_idle()
+
+    def destroy(self):
+        """Destroy the widget and release the figure's artists"""
+        if isinstance(self.canvas, FigureCanvasTkAgg):
+            self.canvas.get_tk_widget().destroy()
+        self.figure.clear()
+
+class GroupedBarChart(LiveChart):
+    """Side-by-side bars for several series over the same labels
+
+    Bars are only recreated when the number of labels changes; otherwise a
+    refresh sets their heights, the tick labels and the y range.
+    """
+
+    def __init__(self, series: Sequence[str], colors: Sequence[str], width: float = 0.35,
+                 bar_style: Dict = None, **kwargs):
+        super().__init__(**kwargs)
+        self.series = list(series)
+        self.colors = list(colors)
+        self.width = width
+        self.bar_style = bar_style or {}
+        self.bars = []  # One BarContainer per series
+        self.labels = None
+
+    def update(self, labels: Sequence[str], values: Sequence[Sequence[float]]):
+        """Show ``values[i][j]``, series i's value for ``labels[j]``"""
+        labels = list(labels)
+        relayout = labels != self.labels
+        if self.labels is None or len(labels) != len(self.labels):
+            self._build_bars(len(labels))
+
+        for bars, series_values in zip(self.bars, values):
+            for bar, value in zip(bars, series_values):
+                bar.set_height(value)
+
+        top = max((max(series_values) for series_values in values if len(series_values)), default=0)
+        self.ax.set_ylim(0, top * 1.1 if top > 0 else 1)
+        if relayout:
+            self.ax.set_xticks(range(len(labels)))
+            self.ax.set_xticklabels(labels)
+            self.labels = labels
+            self.figure.tight_layout()
+        self.redraw()
+
+    def _build_bars(self, count: int):
+        """Replace the bars with ``count`` zero-height bars per series"""
+        for bars in self.bars:
+            bars.remove()
+        offset = (len(self.series) - 1) / 2
+        self.bars = [
+            self.ax.bar([x + (i - offset) * self.width for x in range(count)], [0] * count,
+                        self.width, label=name, color=color, **self.bar_style)
+            for i, (name, color) in enumerate(zip(self.series, self.colors))
+        ]
+
+class PieChart(LiveChart):
+    """Pie chart whose wedges, labels and percentages are updated in place
+
+    Wedges are only recreated when the number of slices changes; otherwise a
+    refresh moves their angles and re-places the texts the way ``ax.pie``
+    lays them out (labels at 1.1 radii, percentages at 0.6).
+    """
+
+    LABEL_DISTANCE = 1.1
+    PCT_DISTANCE = 0.6
+
+    def __init__(self, colors: Sequence[str], startangle: float = 90,
+                 label_style: Dict = None, pct_style: Dict = None, **kwargs):
+        super().__init__(**kwargs)
+        self.colors = list(colors)
+        self.startangle = startangle
+        self.label_style = label_style or {}
+        self.pct_style = pct_style or {}
+        self.wedges, self.texts, self.autotexts = [], [], []
+
+    def update(self, labels: Sequence[str], values: Sequence[float]):
+        """Show one slice per label, sized by ``values``"""
+        if len(labels) != len(self.wedges):
+            self._build_wedges(labels, values)
+        else:
+            self._place(labels, values)
+        self.redraw()
+
+    def _build_wedges(self, labels: Sequence[str], values: Sequence[float]):
+        """Replace every wedge and text with a fresh ``ax.pie``"""
+        for artist in self.wedges + self.texts + self.autotexts:
+            artist.remove()
+        self.wedges, self.texts, self.autotexts = self.ax.pie(
+            values, labels=labels, autopct='%1.1f%%', startangle=self.startangle,
+            colors=[self.colors[i % len(self.colors)] for i in range(len(labels))],
+            labeldistance=self.LABEL_DISTANCE, pctdistance=self.PCT_DISTANCE)
+        self.wedges, self.texts, self.autotexts = (
+            list(self.wedges), list(self.texts), list(self.autotexts))
+        for text in self.texts:
+            text.set(**self.label_style)
+        for autotext in self.autotexts:
+            autotext.set(**self.pct_style)
+        self.ax.axis('equal')
+
+    def _place(self, labels: Sequence[str], values: Sequence[float]):
+        """Move the existing wedges and texts to new values"""
+        total = float(sum(values)) or 1.0
+        theta1 = self.startangle / 360
+        for wedge, text, autotext, label, value in zip(
+                self.wedges, self.texts, self.autotexts, labels, values):
+            theta2 = theta1 + value / total
+            wedge.set_theta1(360 * theta1)
+            wedge.set_theta2(360 * theta2)
+
+            middle = math.pi * (theta1 + theta2)
+            x, y = math.cos(middle), math.sin(middle)
+            text.set_text(label)
+            text.set_position((self.LABEL_DISTANCE * x, self.LABEL_DISTANCE * y))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            autotext.set_text(f"{100 * value / total:.1f}%")
+            autotext.set_position((self.PCT_DISTANCE * x, self.PCT_DISTANCE * y))
+            theta1 = theta2
+
+def columns_to_dict(columns: Dict, label: str, value: str, cents: bool = False) -> Dict[str, float]:
+    """``{label: value}`` from ``db.fetch_columns()`` output, for pie/bar charts
+
+    With ``cents=True`` the value column holds integer cents and is plotted in dollars.
+    """
+    if not columns:
+        return {}
+    values = columns[value] / 100 if cents else columns[value]
+    return dict(zip(columns[label].tolist(), values.tolist()))
+
+def columns_to_series(columns: Dict, x: str, y: str, cents: bool = False) -> List[Tuple[datetime, float]]:
+    """``(x, y)`` pairs from ``db.fetch_columns()`` output, for line charts"""
+    if not columns:
+        return []
+    values = columns[y] / 100 if cents else columns[y]
+    return list(zip(columns[x].tolist(), values.tolist()))
+
 def create_simple_pie_chart(categories: List[str], amounts: List[float], 
                            title: str = "Expense Distribution") -> Figure:
     """Create a simple pie chart with given data"""
@@ -3,16 +3,17 @@ from datetime import datetime, date
 from typing import Optional, Tuple
 import tkinter as tk
 from tkinter import messagebox
+from utils.money import Money
 
-def validate_amount(amount_str: str) -> Tuple[bool, Optional[float]]:
-    """Validate and convert amount string to float"""
+def validate_amount(amount_str: str) -> Tuple[bool, Optional[Money]]:
+    """Validate and convert amount string to Money (cents)"""
     try:
         # Remove any non-numeric characters except decimal point
         cleaned = re.sub(r'[^\d.]', '', amount_str)
         if not cleaned:
             return False, None
         
-        amount = float(cleaned)
+        amount = Money.parse(cleaned)
         if amount < 0:
             return False, None
         
@@ -36,8 +37,12 @@ def validate_date(date_str: str) -> Tuple[bool, Optional[date]]:
     except:
         return False, None
 
-def format_currency(amount: float) -> str:
-    """Format amount as currency"""
+def format_currency(amount) -> str:
+    """Format amount as currency; Money (cents) is formatted exactly"""
+    if isinstance(amount, Money):
+        sign = '-' if amount < 0 else ''
+        whole, cents = divmod(abs(int(amount)), 100)
+        return f"${sign}{whole:,}.{cents:02d}"
     return f"${amount:,.2f}"
 
 def format_date_display(date_obj: date) -> str:
@@ -79,6 +84,19 @@ def get_current_month() -> str:
     """Get current month in YYYY-MM format"""
     return datetime.now().strftime('%Y-%m')
 
+def month_range(month_str: str) -> Tuple[date, date]:
+    """First day of a YYYY-MM month and of the month after it
+
+    Filter with ``date >= start AND date < end`` rather than formatting the
+    column, so the (user_id, type, date) index can be range-scanned.
+    """
+    start = datetime.strptime(month_str, '%Y-%m').date()
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return start, end
+
 def get_month_name(month_str: str) -> str:
     """Convert YYYY-MM to Month Year format"""
     try:
@@ -0,0 +1,151 @@
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+_AMOUNT_NOISE = re.compile(r"[\s$,]")
+_ONE = Decimal(1)
+
+
+class Money(int):
+    """An amount of money held as a whole number of cents
+
+    Adding or subtracting Money (or plain int cents) gives Money, so totals
+    stay exact.  Scaling by a number and dividing by a number also give
+    Money (rounded half up), and dividing Money by Money gives a plain
+    ratio.  float() and format() work in dollars, so the cent count never
+    passes for a dollar amount; use int() for the cents themselves.
+    Drivers would bind the raw cent count, so pass ``to_decimal()`` when
+    writing to a DECIMAL column.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_decimal(cls, value) -> "Money":
+        """Cents from a Decimal, float, int or string amount of dollars"""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, float):
+            # repr() is the shortest string that round-trips, e.g. '19.99'
+            value = repr(value)
+        cents = (Decimal(value) * 100).quantize(_ONE, rounding=ROUND_HALF_UP)
+        return cls(int(cents))
+
+    @classmethod
+    def parse(cls, text: str) -> "Money":
+        """Cents from user input such as '1,234.50' or '$12'; ValueError if invalid"""
+        cleaned = _AMOUNT_NOISE.sub('', text or '')
+        try:
+            amount = Decimal(cleaned)
+        except InvalidOperation:
+            raise ValueError(f"not an amount: {text!r}")
+        if not amount.is_finite():
+            raise ValueError(f"not an amount: {text!r}")
+        return cls.from_decimal(amount)
+
+    @property
+    def dollars(self) -> float:
+        """The amount as a float, for charts and percentages"""
+        return int(self) / 100
+
+    def to_decimal(self) -> Decimal:
+        """The amount as a two-place Decimal, for binding to DECIMAL columns"""
+        return Decimal(int(self)).scaleb(-2)
+
+    def __add__(self, other):
+        if isinstance(other, int):
+            return Money(int(self) + int(other))
+        return _no_dollars('add', other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, int):
+            return Money(int(self) - int(other))
+        return _no_dollars('subtract', other)
+
+    def __rsub__(self, other):
+        if isinstance(other, int):
+            return Money(int(other) - int(self))
+        return _no_dollars('subtract', other)
+
+    def __mul__(self, other):
+        if isinstance(other, Money):
+            return NotImplemented
+        if isinstance(other, int):
+            return Money(int(self) * int(other))
+        if isinstance(other, (float, Decimal)):
+            return self._scaled(_decimal(other), 1)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Money):
+            return int(self) / int(other)
+        if isinstance(other, (int, float, Decimal)):
+            return self._scaled(1, _decimal(other))
+        return NotImplemented
+
+    def __rtruediv__(self, other):
+        raise TypeError("cannot divide by Money")
+
+    def __floordiv__(self, other):
+        if isinstance(other, Money):
+            return int(self) // int(other)
+        if isinstance(other, int):
+            return Money(int(self) // int(other))
+        return NotImplemented
+
+    def __rfloordiv__(self, other):
+        raise TypeError("cannot divide by Money")
+
+    def __neg__(self):
+        return Money(-int(self))
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Money(abs(int(self)))
+
+    def __float__(self):
+        return self.dollars
+
+    def __format__(self, format_spec):
+        # Number formats apply to the dollar amount, e.g. f"{amount:,.2f}"
+        return format(self.to_decimal(), format_spec)
+
+    def _scaled(self, numerator, denominator) -> "Money":
+        """Cents times ``numerator / denominator``, rounded half up"""
+        cents = Decimal(int(self)) * numerator / denominator
+        return Money(int(cents.quantize(_ONE, rounding=ROUND_HALF_UP)))
+
+    def __str__(self):
+        sign = '-' if self < 0 else ''
+        whole, cents = divmod(abs(int(self)), 100)
+        return f"{sign}{whole}.{cents:02d}"
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+
+def _decimal(value) -> Decimal:
+    """An exact Decimal for an int, Decimal or float (via its shortest repr)"""
+    return Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+
+
+def _no_dollars(operation: str, other):
+    """Refuse float/Decimal operands, which would be dollars mixed with cents"""
+    if isinstance(other, (float, Decimal)):
+        raise TypeError(f"cannot {operation} Money and {type(other).__name__}; "
+                        f"convert dollars with Money.from_decimal()")
+    return NotImplemented
+
+
+def cents_sql(expression: str) -> str:
+    """SQL that returns a DECIMAL money ``expression`` as integer cents
+
+    Drivers hand back integers rather than Decimal objects, so large result
+    sets go straight into int64 NumPy columns.
+    """
+    return f"CAST(ROUND({expression} * 100) AS SIGNED)"